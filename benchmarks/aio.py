@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+#
+# Name: aio.py
+#
+# Purpose: Compares encoding and writing METAR/SPECI bulletins from an asyncio event loop, directly (blocking the
+#          loop) and through gifts.aio: throughput, latency of the bulletins, all received at once, and lag of a
+#          timer running in the same event loop.
+#
+# Usage: python benchmarks/aio.py [-n repeat] [-l limit] [-z]
+#
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+
+import corpus
+
+from gifts import aio
+from gifts import METAR
+
+DATABASE = {}
+
+
+def percentile(values, p):
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100. * len(values)))]
+
+
+async def ticker(lags, period=0.005):
+    """Records how late the event loop wakes it up"""
+
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(period)
+        lags.append(loop.time() - t0 - period)
+
+
+async def blocking(encoder, messages, directory, compress, latencies):
+
+    t0 = time.perf_counter()
+    for text in messages:
+        bulletin = encoder.encode(text)
+        if len(bulletin):
+            bulletin.write(directory, compress=compress)
+        latencies.append(time.perf_counter() - t0)
+        await asyncio.sleep(0)
+
+
+async def asynchronous(encoder, messages, directory, compress, latencies):
+
+    t0 = time.perf_counter()
+
+    async def one(text):
+        await encoder.encode_and_write(text, obj=directory, compress=compress)
+        latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*[one(text) for text in messages])
+
+
+async def measure(path, encoder, messages, directory, compress):
+
+    lags = []
+    latencies = []
+    timer = asyncio.ensure_future(ticker(lags))
+    await asyncio.sleep(0.01)
+    t0 = time.perf_counter()
+    await path(encoder, messages, directory, compress, latencies)
+    elapsed = time.perf_counter() - t0
+    timer.cancel()
+
+    return (len(messages) / elapsed, 1e3 * percentile(latencies, 50), 1e3 * percentile(latencies, 99),
+            1e3 * max(lags or [0.]))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=2, help='number of passes over the reports')
+    parser.add_argument('-l', '--limit', type=int, default=8, help='bulletins in flight in gifts.aio')
+    parser.add_argument('-z', '--compress', action='store_true', help='write gzip files')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    encoder = METAR.Encoder(DATABASE)
+    messages = ['SAXX99 XXXX 010000\n%s' % tac for tac in corpus.reports('METAR')] * args.repeat
+
+    print('%-12s %9s %12s %12s %12s %14s' % ('', 'bulletins', 'throughput', 'p50 latency', 'p99 latency',
+                                             'max loop lag'))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path, frontEnd in (('blocking', blocking, encoder),
+                                     ('gifts.aio', asynchronous, aio.Encoder(encoder, args.limit))):
+
+            result = asyncio.run(measure(path, frontEnd, messages, directory, args.compress))
+            print('%-12s %9d %10.0f/s %9.1f ms %9.1f ms %11.1f ms' % ((name, len(messages)) + result))
+
+        frontEnd.close()
+
+
+if __name__ == '__main__':
+    main()
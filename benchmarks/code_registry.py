@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+#
+# Name: code_registry.py
+#
+# Purpose: Measures the construction time of the IWXXM encoders with the WMO code lists parsed from the RDF files,
+#          loaded from snapshots, as in a new process, and shared by the encoders of this process, see
+#          gifts.common.codeRegistry. The code lists are read when first requested, so each construction is followed
+#          by the reading of all the code lists of the encoder, with load_all().
+#
+# Usage: python benchmarks/code_registry.py [-n repeat]
+#
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+from gifts import metarEncoder
+from gifts import swaEncoder
+from gifts import tafEncoder
+from gifts import tcaEncoder
+from gifts import vaaEncoder
+from gifts.common import codeRegistry
+from gifts.common import xmlConfig as des
+
+ENCODERS = (('METAR', metarEncoder.Annex3), ('TAF', tafEncoder.Encoder), ('SWA', swaEncoder.Encoder),
+            ('TCA', tcaEncoder.Encoder), ('VAA', vaaEncoder.Encoder))
+
+
+def construct(encoderClass, repeat, fresh):
+
+    best = float('inf')
+    for n in range(repeat):
+        if fresh:
+            codeRegistry._registries.clear()
+
+        t0 = time.perf_counter()
+        encoderClass().codes.load_all()
+        best = min(best, time.perf_counter() - t0)
+
+    return best
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of runs, the best is kept')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    #
+    # Snapshots are written, as byte-code files are, only if allowed
+    sys.dont_write_bytecode = False
+
+    print('%-6s %12s %12s %12s' % ('', 'parsed', 'snapshots', 'shared'))
+    with tempfile.TemporaryDirectory() as snapshots:
+        for product, encoderClass in ENCODERS:
+
+            des.CodesSnapshotPath = None
+            parsed = construct(encoderClass, args.repeat, True)
+
+            des.CodesSnapshotPath = snapshots
+            construct(encoderClass, 1, True)
+            loaded = construct(encoderClass, args.repeat, True)
+            shared = construct(encoderClass, args.repeat, False)
+
+            print('%-6s %9.2f ms %9.2f ms %9.3f ms' % (product, 1e3 * parsed, 1e3 * loaded, 1e3 * shared))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+#
+# Name: corpus.py
+#
+# Purpose: Collects the METAR/SPECI and TAF reports found in the test suite and demo files for use by the
+#          benchmarks.
+#
+import glob
+import os
+import re
+
+TOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATTERNS = {'METAR': re.compile(r'^\s*(?:METAR|SPECI)\s+(?:COR\s+)?[A-Z]{4}\s[^=]+=', re.MULTILINE),
+            'TAF': re.compile(r'^\s*TAF(?:\s+(?:AMD|COR))?\s+[A-Z]{4}\s[^=]+=', re.MULTILINE)}
+
+
+def reports(product):
+    """Returns list of TAC reports of product, 'METAR' or 'TAF', found in the tests and demo directories"""
+
+    found = []
+    for fname in sorted(glob.glob(os.path.join(TOP, 'tests', '*.py')) + glob.glob(os.path.join(TOP, 'demo', '*.txt'))):
+        with open(fname) as fh:
+            found.extend(tac.strip() for tac in PATTERNS[product].findall(fh.read()))
+
+    return found
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+#
+# Name: decode_cache.py
+#
+# Purpose: Compares the throughput of Encoder.encode() with and without the cache of decoded TAC forms, on
+#          bulletins in which every METAR/SPECI and TAF report of the test suite and demo files appears several
+#          times, as retransmissions and overlapping collectives do.
+#
+# Usage: python benchmarks/decode_cache.py [-n repeat]
+#
+import argparse
+import logging
+import time
+
+import corpus
+
+from gifts import METAR
+from gifts import TAF
+
+DATABASE = {}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of times each report is received')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print('%-6s %9s %14s %14s %10s' % ('', 'bulletins', 'no cache', 'cache', 'hit rate'))
+    for product, encoderClass, ahl in (('METAR', METAR.Encoder, 'SAXX99 XXXX 010000\n'),
+                                       ('TAF', TAF.Encoder, 'FTXX99 XXXX 010000\n')):
+
+        encoder = encoderClass(DATABASE)
+        messages = [ahl + tac for tac in corpus.reports(product)] * args.repeat
+        for text in messages:
+            encoder.encode(text)
+
+        rates = []
+        for maxsize in (None, 4096):
+            decodeCache = encoder.cache_decodes(maxsize)
+            t0 = time.perf_counter()
+            for text in messages:
+                encoder.encode(text)
+            rates.append(len(messages) / (time.perf_counter() - t0))
+
+        stats = decodeCache.stats()
+        print('%-6s %9d %12.0f/s %12.0f/s %9.0f%%' % (product, len(messages), rates[0], rates[1],
+                                                      100. * stats['hits'] / (stats['hits'] + stats['misses'])))
+
+
+if __name__ == '__main__':
+    main()
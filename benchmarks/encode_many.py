@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+#
+# Name: encode_many.py
+#
+# Purpose: Compares the throughput of Encoder.encode() called in a loop with Encoder.encode_many() using worker
+#          threads and worker processes, on bulletins made of the METAR/SPECI and TAF reports found in the test
+#          suite and demo files.
+#
+# Usage: python benchmarks/encode_many.py [-n repeat] [-w workers] [-c chunksize]
+#
+import argparse
+import logging
+import os
+import time
+
+import corpus
+
+from gifts import METAR
+from gifts import TAF
+
+DATABASE = {}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='number of passes over the reports')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='number of workers')
+    parser.add_argument('-c', '--chunksize', type=int, default=8, help='messages handed to a worker at once')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print('%d workers, chunks of %d messages' % (args.workers, args.chunksize))
+    print('%-6s %9s %14s %14s %14s' % ('', 'bulletins', 'serial', 'threads', 'processes'))
+    for product, encoderClass, ahl in (('METAR', METAR.Encoder, 'SAXX99 XXXX 010000\n'),
+                                       ('TAF', TAF.Encoder, 'FTXX99 XXXX 010000\n')):
+
+        encoder = encoderClass(DATABASE)
+        messages = [ahl + tac for tac in corpus.reports(product)] * args.repeat
+
+        rates = []
+        t0 = time.perf_counter()
+        for text in messages:
+            encoder.encode(text)
+        rates.append(len(messages) / (time.perf_counter() - t0))
+
+        for executor in ('thread', 'process'):
+            t0 = time.perf_counter()
+            for bulletin in encoder.encode_many(messages, workers=args.workers, executor=executor,
+                                                chunksize=args.chunksize):
+                pass
+            rates.append(len(messages) / (time.perf_counter() - t0))
+
+        print('%-6s %9d %12.0f/s %12.0f/s %12.0f/s' % (product, len(messages), *rates))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Name: feed.py
+#
+# Purpose: Compares finding the bulletins of a file in WMO file format 00 by reading, decoding and splitting the
+#          whole file in Python with FeedReader.bulletins(), which scans the memory-mapped file in place.
+#
+# Usage: python benchmarks/feed.py [-n bulletins]
+#
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import corpus
+
+from gifts.common import feed
+
+
+def pythonSplit(path):
+    """Reads and decodes the whole file, then splits it on ETX"""
+
+    with open(path, 'rb') as fh:
+        text = fh.read().decode('latin-1')
+
+    for message in text.split('\x03'):
+        start = message.find('\x01')
+        if start >= 0:
+            yield message[start + 1:].strip().replace('\r', '')
+
+
+def measure(function, path):
+
+    t0 = time.perf_counter()
+    count = sum(1 for bulletin in function(path))
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    sum(1 for bulletin in function(path))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak / 1048576.
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--bulletins', type=int, default=50000, help='number of bulletins in the file')
+    args = parser.parse_args()
+
+    reports = corpus.reports('METAR')
+    messages = []
+    for n in range(args.bulletins):
+        text = 'SAXX99 XXXX 010000\r\r\n%s' % reports[n % len(reports)].replace('\n', '\r\r\n')
+        message = b'\x01\r\r\n%03d\r\r\n%s\r\r\n\x03' % (n % 1000, text.encode())
+        messages.append(b'%08d00%s' % (len(message), message))
+
+    reader = feed.FeedReader({})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'feed.bin')
+        with open(path, 'wb') as fh:
+            fh.write(b''.join(messages))
+
+        print('%.1f MiB file' % (os.path.getsize(path) / 1048576.))
+        print('%-22s %9s %10s %14s' % ('', 'bulletins', 'time', 'peak memory'))
+        for name, function in (('read, decode, split', pythonSplit), ('FeedReader.bulletins', reader.bulletins)):
+            print('%-22s %9d %8.3f s %10.1f MiB' % ((name,) + measure(function, path)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#
+# Name: geolocations.py
+#
+# Purpose: Compares the geoLocations backends on a synthetic database of aerodromes: time to load, memory held
+#          after loading and after looking up a working set of aerodromes, and lookups per second, for the pickled
+#          dictionary, DictGeoLocations and SQLiteGeoLocations.
+#
+# Usage: python benchmarks/geolocations.py [-a aerodromes] [-w working set] [-n lookups]
+#
+import argparse
+import os
+import pickle
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+
+from gifts.common import geoLocations
+
+
+def synthetic(count):
+    """Returns dictionary of count aerodromes with random names and positions"""
+
+    rng = random.Random(count)
+    database = {}
+    while len(database) < count:
+        ident = ''.join(rng.choice(string.ascii_uppercase) for n in range(4))
+        name = ''.join(rng.choice(string.ascii_uppercase + ' ') for n in range(rng.randint(8, 40))).strip()
+        position = '%.5f %.5f %d' % (rng.uniform(-90, 90), rng.uniform(-180, 180), rng.randint(0, 4000))
+        database[ident] = '%s|%s||%s' % (name, ident[1:], position)
+    return database
+
+
+def measure(load, idents, lookups):
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    backend = load()
+    elapsed = time.perf_counter() - t0
+    loaded = tracemalloc.get_traced_memory()[0]
+    for ident in idents:
+        geoLocations.lookup(backend, ident)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for ident in lookups:
+        geoLocations.lookup(backend, ident)
+    rate = len(lookups) / (time.perf_counter() - t0)
+
+    return 1e3 * elapsed, loaded / 1048576., used / 1048576., rate
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-a', '--aerodromes', type=int, default=50000, help='number of aerodromes')
+    parser.add_argument('-w', '--working', type=int, default=2000, help='number of aerodromes reporting')
+    parser.add_argument('-n', '--lookups', type=int, default=200000, help='number of lookups timed')
+    args = parser.parse_args()
+
+    database = synthetic(args.aerodromes)
+    rng = random.Random(0)
+    idents = rng.sample(sorted(database), args.working)
+    lookups = [rng.choice(idents) for n in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, 'aerodromes.db')
+        with open(pickled, 'wb') as fh:
+            pickle.dump(database, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        sqlite = os.path.join(directory, 'aerodromes.sqlite')
+        geoLocations.createSQLiteDB(sqlite, database)
+
+        def loadDict():
+            with open(pickled, 'rb') as fh:
+                return pickle.load(fh)
+
+        print('%d aerodromes, %d reporting' % (args.aerodromes, args.working))
+        print('%-20s %10s %14s %14s %14s' % ('', 'load', 'after load', 'after lookups', 'lookups'))
+        for name, load in (('pickled dictionary', loadDict),
+                           ('DictGeoLocations', lambda: geoLocations.loadPickle(pickled)),
+                           ('SQLiteGeoLocations', lambda: geoLocations.SQLiteGeoLocations(sqlite, args.working))):
+
+            print('%-20s %7.1f ms %10.1f MiB %10.1f MiB %12.0f/s' % ((name,) + measure(load, idents, lookups)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+#
+# Name: gml_ids.py
+#
+# Purpose: Compares the strategies generating the UUIDs of the gml:id attributes, see gifts.common.gmlIDs: time per
+#          UUID, UUIDs per document, and documents built per second from the METAR/SPECI and TAF reports found in the
+#          test suite and demo files.
+#
+# Usage: python benchmarks/gml_ids.py [-n repeat]
+#
+import argparse
+import logging
+import time
+import timeit
+
+import corpus
+
+from gifts import METAR
+from gifts import TAF
+from gifts.common import gmlIDs
+
+DATABASE = {}
+
+
+def build(encoder, decoded, repeat):
+
+    best = float('inf')
+    for n in range(repeat):
+        t0 = time.perf_counter()
+        for decodedTAC, tac in decoded:
+            encoder.encoder(decodedTAC, tac)
+        best = min(best, time.perf_counter() - t0)
+
+    return len(decoded) / best
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of runs, the best is kept')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    strategies = list(gmlIDs.STRATEGIES)
+    print('%-8s %12s' % ('', 'per UUID'))
+    for strategy in strategies:
+        gmlIDs.use(strategy)
+        cost = min(timeit.repeat(gmlIDs.newID, number=100000, repeat=args.repeat)) / 100000
+        print('%-8s %9.0f ns' % (strategy, 1e9 * cost))
+
+    print('\n%-6s %10s %s' % ('', 'UUIDs/doc', ' '.join('%13s' % strategy for strategy in strategies)))
+    for product, encoderClass in (('METAR', METAR.Encoder), ('TAF', TAF.Encoder)):
+
+        encoder = encoderClass(DATABASE)
+        decoded = [(encoder.decoder(tac), tac) for tac in corpus.reports(product)]
+
+        counted = []
+        gmlIDs.use(lambda: counted.append(None) or '00000000-0000-4000-8000-000000000000')
+        build(encoder, decoded, 1)
+
+        rates = []
+        for strategy in strategies:
+            gmlIDs.use(strategy)
+            rates.append(build(encoder, decoded, args.repeat))
+
+        print('%-6s %10.1f %s' % (product, len(counted) / len(decoded), ' '.join('%11.0f/s' % rate for rate in rates)))
+
+    gmlIDs.use('pool')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+#
+# Name: import_time.py
+#
+# Purpose: Measures, with 'python -X importtime', the time to import the gifts package and each of its products in a
+#          fresh interpreter, with the share spent importing skyfield and numpy, to catch products, or the package,
+#          importing more than they use. The time of a package is that of its costliest module, so skyfield's
+#          includes the numpy it imports.
+#
+# Usage: python benchmarks/import_time.py [-n repeat] [--limit ms]
+#
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ['gifts', 'gifts.METAR', 'gifts.TAF', 'gifts.TCA', 'gifts.VAA', 'gifts.SWA']
+HEAVY = ('skyfield', 'numpy')
+
+
+def importTime(module):
+    """Returns the cumulative import times, in microseconds, of module and of the top-level packages it loaded"""
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import %s' % module], check=True,
+                            capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        selfTime, cumulative, name = line[12:].split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of imports timed per module')
+    parser.add_argument('--limit', type=float, help='fail if importing gifts takes longer, in milliseconds')
+    args = parser.parse_args()
+
+    print('%-12s %10s %s' % ('module', 'total (ms)', ' '.join('%10s' % name for name in HEAVY)))
+    medians = {}
+    for module in MODULES:
+        runs = [importTime(module) for n in range(args.repeat)]
+        medians[module] = statistics.median(run[module] for run in runs) / 1000.
+        heavy = []
+        for name in HEAVY:
+            loaded = [max(run[key] for key in run if key.partition('.')[0] == name) for run in runs if name in run]
+            heavy.append('%10.1f' % (statistics.median(loaded) / 1000.) if loaded else '%10s' % '-')
+
+        print('%-12s %10.1f %s' % (module, medians[module], ' '.join(heavy)))
+
+    if args.limit is not None and medians['gifts'] > args.limit:
+        sys.exit('importing gifts took %.1f ms, more than %.1f ms' % (medians['gifts'], args.limit))
+
+
+if __name__ == '__main__':
+    main()
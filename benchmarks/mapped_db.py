@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# Name: mapped_db.py
+#
+# Purpose: Compares the pickled dictionary made by create_pickle_db.py with the memory-mapped database made by
+#          create_mmap_db.py, on a synthetic database of aerodromes: time to load, in a fresh process, resident
+#          and private memory of that process after looking up a working set of aerodromes, and lookup latency.
+#          Linux only.
+#
+# Usage: python benchmarks/mapped_db.py [-a aerodromes] [-w working set] [-n lookups]
+#
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from geolocations import synthetic
+
+from gifts.common import geoLocations
+
+
+def memory():
+    """Returns resident and private memory of this process in MiB"""
+
+    fields = {}
+    with open('/proc/self/smaps_rollup') as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024.
+
+    return fields['Rss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def loadPickle(path):
+
+    with open(path, 'rb') as fh:
+        return pickle.load(fh)
+
+
+def worker(kind, path, idents, lookups):
+    """Loads the database in a fresh process, looks up the aerodromes and reports"""
+
+    rss0, private0 = memory()
+    t0 = time.perf_counter()
+    backend = loadPickle(path) if kind == 'pickle' else geoLocations.MappedGeoLocations(path)
+    loaded = time.perf_counter() - t0
+
+    for ident in idents:
+        geoLocations.lookup(backend, ident)
+
+    t0 = time.perf_counter()
+    for ident in lookups:
+        geoLocations.lookup(backend, ident)
+    latency = (time.perf_counter() - t0) / len(lookups)
+
+    rss, private = memory()
+    return 1e3 * loaded, rss - rss0, private - private0, 1e6 * latency
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-a', '--aerodromes', type=int, default=50000, help='number of aerodromes')
+    parser.add_argument('-w', '--working', type=int, default=2000, help='number of aerodromes reporting')
+    parser.add_argument('-n', '--lookups', type=int, default=100000, help='number of lookups timed')
+    args = parser.parse_args()
+
+    database = synthetic(args.aerodromes)
+    rng = random.Random(0)
+    idents = rng.sample(sorted(database), args.working)
+    lookups = [rng.choice(idents) for n in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickled = os.path.join(directory, 'aerodromes.db')
+        with open(pickled, 'wb') as fh:
+            pickle.dump(database, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        mapped = os.path.join(directory, 'aerodromes.map')
+        geoLocations.createMappedDB(mapped, database)
+
+        print('%d aerodromes, %d reporting' % (args.aerodromes, args.working))
+        print('%-10s %9s %10s %12s %12s %12s' % ('', 'file', 'load', 'RSS added', 'private', 'lookup'))
+        context = multiprocessing.get_context('spawn')
+        for kind, path in (('pickle', pickled), ('mmap', mapped)):
+            with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(worker, kind, path, idents, lookups).result()
+
+            size = os.path.getsize(path) / 1048576.
+            print('%-10s %5.1f MiB %7.2f ms %8.1f MiB %8.1f MiB %9.2f us' % ((kind, size) + result))
+
+
+if __name__ == '__main__':
+    main()
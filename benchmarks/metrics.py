@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+#
+# Name: metrics.py
+#
+# Purpose: Measures the cost of the per-stage timing of gifts.common.metrics: throughput of Encoder.encode() and
+#          Bulletin.write() with measuring off and on, and the time taken by the check made at each stage while
+#          off, on the METAR/SPECI and TAF reports found in the test suite and demo files.
+#
+# Usage: python benchmarks/metrics.py [-n repeat]
+#
+import argparse
+import io
+import logging
+import time
+import timeit
+
+import corpus
+
+from gifts import METAR
+from gifts import TAF
+from gifts.common import metrics
+
+DATABASE = {}
+
+
+def run(encoder, messages):
+
+    t0 = time.perf_counter()
+    for text in messages:
+        bulletin = encoder.encode(text)
+        if len(bulletin):
+            stream = io.BytesIO()
+            stream.mode = 'wb'
+            bulletin.write(stream)
+    return len(messages) / (time.perf_counter() - t0)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='number of passes over the reports')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    check = min(timeit.repeat('stopwatch = metrics.stopwatch()\nif stopwatch is not None: pass',
+                              globals=globals(), number=100000, repeat=5)) / 100000
+    print('check while off: %.0f ns per stage' % (1e9 * check))
+
+    print('%-6s %9s %14s %14s' % ('', 'bulletins', 'off', 'on'))
+    for product, encoderClass, ahl in (('METAR', METAR.Encoder, 'SAXX99 XXXX 010000\n'),
+                                       ('TAF', TAF.Encoder, 'FTXX99 XXXX 010000\n')):
+
+        encoder = encoderClass(DATABASE)
+        messages = [ahl + tac for tac in corpus.reports(product)] * args.repeat
+        run(encoder, messages)
+
+        rates = {'off': [], 'on': []}
+        for n in range(3):
+            rates['off'].append(run(encoder, messages))
+            metrics.enable()
+            rates['on'].append(run(encoder, messages))
+            metrics.disable()
+
+        print('%-6s %9d %12.0f/s %12.0f/s' % (product, len(messages), max(rates['off']), max(rates['on'])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+#
+# Name: prefork.py
+#
+# Purpose: Compares workers that build their own METAR, TAF and SWA encoders with the workers of a PreforkPool,
+#          forked from a parent holding the encoders: time until a worker has encoded its first bulletin, and
+#          resident memory of a worker, total and private (not shared with other processes). Linux only.
+#
+# Usage: python benchmarks/prefork.py [-w workers]
+#
+import argparse
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import time
+
+import corpus
+
+from gifts import METAR
+from gifts import SWA
+from gifts import TAF
+from gifts.common import prefork
+
+DATABASE = {}
+
+
+def encoders():
+    """Returns the encoders used by the workers"""
+
+    return {'METAR': METAR.Encoder(DATABASE), 'TAF': TAF.Encoder(DATABASE), 'SWA': SWA.Encoder()}
+
+
+def memory(pid):
+    """Returns resident and private memory of process pid in MiB"""
+
+    fields = {}
+    with open('/proc/%d/smaps_rollup' % pid) as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024.
+
+    return fields['Rss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def coldWorker(text):
+    """Builds the encoders and encodes text, as a worker without a prepared parent does"""
+
+    logging.disable(logging.CRITICAL)
+    encoders()['METAR'].encode(text)
+    return os.getpid()
+
+
+def report(name, elapsed, usage):
+
+    rss = sum(u[0] for u in usage) / len(usage)
+    private = sum(u[1] for u in usage) / len(usage)
+    print('%-10s %8d %12.2f s %10.1f MiB %10.1f MiB' % (name, len(usage), elapsed, rss, private))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-w', '--workers', type=int, default=4, help='number of workers')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    text = 'SAXX99 XXXX 010000\n%s' % corpus.reports('METAR')[0]
+    print('%-10s %8s %14s %14s %14s' % ('', 'workers', 'first result', 'RSS/worker', 'private/worker'))
+    #
+    # Every worker loads everything itself
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(args.workers, mp_context=context) as executor:
+        t0 = time.perf_counter()
+        futures = [executor.submit(coldWorker, text) for n in range(args.workers)]
+        pids = set(future.result() for future in futures)
+        elapsed = time.perf_counter() - t0
+        usage = [memory(pid) for pid in pids]
+
+    report('spawn', elapsed, usage)
+    #
+    # Workers forked from a parent holding the encoders
+    with prefork.PreforkPool(encoders(), args.workers) as pool:
+        t0 = time.perf_counter()
+        futures = [pool.submit('METAR', text) for n in range(args.workers)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - t0
+        usage = [memory(process.pid) for process in multiprocessing.active_children()]
+
+    report('prefork', elapsed, usage)
+
+
+if __name__ == '__main__':
+    main()
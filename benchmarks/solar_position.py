@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+#
+# Name: solar_position.py
+#
+# Purpose: Measures what the DAYLIGHT SIDE regions of the Space Weather Advisories cost, see
+#          gifts.common.solarPosition: the time to start a SWA encoder in a fresh interpreter and to decode a first
+#          advisory without and with DAYLIGHT SIDE, and the time to find solar sub-points, computed one at a time, all
+#          at once and kept, with the 'skyfield' and 'analytic' engines.
+#
+# Usage: python benchmarks/solar_position.py [-n repeat]
+#
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from gifts.common import solarPosition
+
+ADVISORY = """FNXX01 KWNP 080100
+SWX ADVISORY
+DTG: 20200308/0100Z
+SWXC: DONLON
+ADVISORY NR: 2020/1
+SWX EFFECT: HF COM MOD
+OBS SWX: 08/0100Z %s
+FCST SWX +6 HR: 08/0700Z %s
+FCST SWX +12 HR: 08/1300Z %s
+FCST SWX +18 HR: 08/1900Z %s
+FCST SWX +24 HR: 09/0100Z %s
+RMK: NIL
+NXT ADVISORY: NO FURTHER ADVISORIES="""
+
+SNIPPET = """
+import time
+t0 = time.perf_counter()
+import gifts.SWA
+gifts.SWA.swaDecoder.des.SOLAR_ENGINE = '%s'
+encoder = gifts.SWA.Encoder()
+t1 = time.perf_counter()
+encoder.decoder('''%s''')
+print(t1 - t0, time.perf_counter() - t1)
+"""
+
+
+def startup(regions, engine):
+
+    snippet = SNIPPET % (engine, ADVISORY % ((regions,) * 5))
+    result = subprocess.run([sys.executable, '-c', snippet], check=True, capture_output=True, text=True)
+    return [float(seconds) for seconds in result.stdout.split()]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of runs, the median is kept')
+    args = parser.parse_args()
+
+    print('%-26s %13s %18s' % ('advisory', 'encoder (ms)', 'first decode (ms)'))
+    for label, regions, engine in (('latitude bands', 'HNH HSH E180-W180', 'skyfield'),
+                                   ('DAYLIGHT SIDE, skyfield', 'DAYLIGHT SIDE', 'skyfield'),
+                                   ('DAYLIGHT SIDE, analytic', 'DAYLIGHT SIDE', 'analytic')):
+        runs = [startup(regions, engine) for n in range(args.repeat)]
+        print('%-26s %13.1f %18.1f' % (label, 1000. * statistics.median(run[0] for run in runs),
+                                       1000. * statistics.median(run[1] for run in runs)))
+
+    solarPosition.ephemeris()
+    minutes = [(2020, 1 + n % 12, 1 + n % 28, n % 24, n % 60) for n in range(1000)]
+    print('\n%-10s %12s %12s %12s' % ('sub-point', 'single (us)', 'batch (us)', 'kept (us)'))
+    for engine in solarPosition.ENGINES:
+        solarPosition.subpoints(minutes[:1], engine)
+        solarPosition._subpoints.clear()
+        t0 = time.perf_counter()
+        for minute in minutes:
+            solarPosition.subpoint(*minute, engine=engine)
+        single = (time.perf_counter() - t0) / len(minutes)
+
+        t0 = time.perf_counter()
+        for minute in minutes:
+            solarPosition.subpoint(*minute, engine=engine)
+        kept = (time.perf_counter() - t0) / len(minutes)
+
+        solarPosition._subpoints.clear()
+        t0 = time.perf_counter()
+        solarPosition.subpoints(minutes, engine)
+        batch = (time.perf_counter() - t0) / len(minutes)
+
+        print('%-10s %12.1f %12.1f %12.2f' % (engine, 1e6 * single, 1e6 * batch, 1e6 * kept))
+
+
+if __name__ == '__main__':
+    main()
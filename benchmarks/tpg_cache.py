@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+#
+# Name: tpg_cache.py
+#
+# Purpose: Compares the time to import the GIFTs decoders when their grammars must be translated by TPG (cold)
+#          against the time when the generated parser code is read back from the on-disk cache (warm).
+#
+# Usage: python benchmarks/tpg_cache.py [-n repeat]
+#
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULES = ['gifts.metarDecoder', 'gifts.tafDecoder', 'gifts.vaaDecoder', 'gifts.tcaDecoder', 'gifts.swaDecoder']
+
+SNIPPET = """
+import time
+t0 = time.perf_counter()
+import %s
+print(time.perf_counter() - t0)
+"""
+
+
+def timeImport(module, cacheDir):
+
+    env = dict(os.environ, TPG_CACHE_DIR=cacheDir)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run([sys.executable, '-c', SNIPPET % module], env=env, check=True, capture_output=True,
+                            text=True)
+    return float(result.stdout.split()[-1])
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of imports timed per case')
+    args = parser.parse_args()
+
+    print('%-20s %12s %12s %8s' % ('module', 'cold (ms)', 'warm (ms)', 'speedup'))
+    for module in MODULES:
+        cold = []
+        warm = []
+        for n in range(args.repeat):
+            cacheDir = tempfile.mkdtemp()
+            try:
+                cold.append(timeImport(module, cacheDir))
+                warm.append(timeImport(module, cacheDir))
+            finally:
+                shutil.rmtree(cacheDir)
+
+        c = statistics.median(cold) * 1000.
+        w = statistics.median(warm) * 1000.
+        print('%-20s %12.1f %12.1f %7.1fx' % (module, c, w, c / w))
+
+
+if __name__ == '__main__':
+    main()
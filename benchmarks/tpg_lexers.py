@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#
+# Name: tpg_lexers.py
+#
+# Purpose: Compares the tokens decoded per second by the METAR/SPECI and TAF decoders using TPG's
+#          ContextSensitiveLexer and PreTokenizedLexer, on the reports found in the test suite. The decoded results
+#          must be the same.
+#
+# Usage: python benchmarks/tpg_lexers.py [-n repeat]
+#
+import argparse
+import logging
+import timeit
+
+import corpus
+
+from gifts import metarDecoder
+from gifts import tafDecoder
+from gifts.common import tpg
+
+LEXERS = ['ContextSensitiveLexer', 'PreTokenizedLexer']
+
+
+def variant(decoderClass, lexer):
+    """Returns subclass of decoderClass whose grammar uses the lexer"""
+
+    grammar = decoderClass.__doc__
+    for name in LEXERS:
+        grammar = grammar.replace('set lexer = %s' % name, 'set lexer = %s' % lexer)
+
+    return tpg.ParserMetaClass(decoderClass.__name__, (decoderClass,), {'__doc__': grammar,
+                                                                        '__module__': decoderClass.__module__})
+
+
+def countTokens(decoder, reports):
+    """Returns number of tokens eaten by decoder over all reports"""
+
+    count = [0]
+    context = decoder.context()
+    eat = context.lexer.eat
+
+    def counter(name):
+        token = eat(name)
+        count[0] += 1
+        return token
+
+    context.lexer.eat = counter
+    for tac in reports:
+        context._decode(tac)
+
+    return count[0]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=7, help='number of timings, the best is kept')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print('%-6s %8s %8s %22s %22s %8s' % ('', 'reports', 'tokens', 'ContextSensitiveLexer', 'PreTokenizedLexer',
+                                          'results'))
+    for product, decoderClass in (('METAR', metarDecoder.Annex3), ('TAF', tafDecoder.Decoder)):
+
+        reports = corpus.reports(product)
+        rates = []
+        results = []
+        for lexer in LEXERS:
+
+            decoder = variant(decoderClass, lexer)()
+            results.append([decoder(tac) for tac in reports])
+            for result in results[-1]:
+                result.pop('translationTime')
+
+            tokens = countTokens(decoder, reports)
+            elapsed = min(timeit.repeat(lambda: [decoder(tac) for tac in reports], number=1, repeat=args.repeat))
+            rates.append('%.0f tokens/s' % (tokens / elapsed))
+
+        same = 'same' if results[0] == results[1] else 'differ'
+        print('%-6s %8d %8d %22s %22s %8s' % (product, len(reports), tokens, rates[0], rates[1], same))
+
+
+if __name__ == '__main__':
+    main()
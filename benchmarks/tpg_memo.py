@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#
+# Name: tpg_memo.py
+#
+# Purpose: Reports regular expression calls and parse time of the METAR/SPECI and TAF decoders with and without the
+#          lexer memoization option of TPG ('set lexer_memoize'), and whether the decoded results differ.
+#
+# Usage: python benchmarks/tpg_memo.py [-n repeat]
+#
+import argparse
+import logging
+import time
+
+import corpus
+
+from gifts import metarDecoder
+from gifts import tafDecoder
+from gifts.common import tpg
+
+VARIANTS = [('none', ''),
+            ('lexer', 'set lexer_memoize = True')]
+
+
+def variant(decoderClass, options):
+    """Returns subclass of decoderClass whose grammar has the additional options"""
+
+    grammar = decoderClass.__doc__.replace('set lexer_dotall = True', 'set lexer_dotall = True\n    %s' % options)
+    return tpg.ParserMetaClass(decoderClass.__name__, (decoderClass,), {'__doc__': grammar,
+                                                                        '__module__': decoderClass.__module__})
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=10, help='number of passes over the reports')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    header = ('', 'memoize', 'regex calls', 'regex saved', 'us/report', 'results')
+    print('%-6s %-12s %12s %12s %10s %8s' % header)
+    for product, decoderClass in (('METAR', metarDecoder.Annex3), ('TAF', tafDecoder.Decoder)):
+
+        reports = corpus.reports(product)
+        reference = None
+        for name, options in VARIANTS:
+
+            decoder = variant(decoderClass, options)()
+            counters = dict.fromkeys(['regex_calls', 'regex_saved'], 0)
+            results = []
+            for tac in reports:
+                context = decoder.context()
+                result = context._decode(tac)
+                result.pop('translationTime')
+                results.append(result)
+                for key, value in context.stats().items():
+                    counters[key] += value
+
+            t0 = time.perf_counter()
+            for n in range(args.repeat):
+                for tac in reports:
+                    decoder(tac)
+            elapsed = (time.perf_counter() - t0) / (args.repeat * len(reports))
+
+            if reference is None:
+                reference = results
+
+            same = 'same' if results == reference else 'differ'
+            print('%-6s %-12s %12d %12d %10.1f %8s' % (product, name, counters['regex_calls'],
+                                                       counters['regex_saved'], elapsed * 1e6, same))
+
+
+if __name__ == '__main__':
+    main()
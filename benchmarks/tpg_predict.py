@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+#
+# Name: tpg_predict.py
+#
+# Purpose: Compares the parse time of the METAR/SPECI and TAF decoders generated with and without TPG's predict
+#          option, on the reports found in the test suite and on damaged copies of them that the decoders reject.
+#          The decoded results, including error messages, must be the same.
+#
+# Usage: python benchmarks/tpg_predict.py [-n repeat]
+#
+import argparse
+import logging
+import random
+import timeit
+
+import corpus
+
+from gifts import metarDecoder
+from gifts import tafDecoder
+from gifts.common import tpg
+
+
+def variant(decoderClass, predict):
+    """Returns subclass of decoderClass whose grammar has the predict option set as requested"""
+
+    grammar = decoderClass.__doc__.replace('set predict = True', 'set predict = %s' % predict)
+    return tpg.ParserMetaClass(decoderClass.__name__, (decoderClass,), {'__doc__': grammar,
+                                                                        '__module__': decoderClass.__module__})
+
+
+def damaged(reports, seed=1):
+    """Returns copies of reports with a group removed, repeated or swapped with its predecessor"""
+
+    rng = random.Random(seed)
+    copies = []
+    for tac in reports:
+        groups = tac.rstrip('=').split()
+        i = rng.randrange(2, len(groups))
+        action = rng.randrange(3)
+        if action == 0:
+            del groups[i]
+        elif action == 1:
+            groups.insert(i, rng.choice(groups))
+        else:
+            groups[i - 1:i + 1] = groups[i], groups[i - 1]
+
+        copies.append('%s=' % ' '.join(groups))
+
+    return copies
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=7, help='number of timings, the best is kept')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print('%-6s %-8s %8s %14s %14s %8s' % ('', 'reports', 'number', 'us/report', 'us/report', 'results'))
+    print('%-6s %-8s %8s %14s %14s %8s' % ('', '', '', 'predict=False', 'predict=True', ''))
+    for product, decoderClass in (('METAR', metarDecoder.Annex3), ('TAF', tafDecoder.Decoder)):
+
+        good = corpus.reports(product)
+        for name, reports in (('valid', good), ('damaged', damaged(good))):
+
+            timings = []
+            results = []
+            for predict in (False, True):
+
+                decoder = variant(decoderClass, predict)()
+                results.append([decoder(tac) for tac in reports])
+                for result in results[-1]:
+                    result.pop('translationTime')
+
+                elapsed = min(timeit.repeat(lambda: [decoder(tac) for tac in reports], number=1, repeat=args.repeat))
+                timings.append(elapsed / len(reports) * 1e6)
+
+            same = 'same' if results[0] == results[1] else 'differ'
+            print('%-6s %-8s %8d %14.1f %14.1f %8s' % (product, name, len(reports), timings[0], timings[1], same))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+#
+# Name: xml_backends.py
+#
+# Purpose: Compares the XML backends of the IWXXM encoders, xml.etree.ElementTree ('tree'), gifts.common.xmlStream
+#          ('stream') and lxml ('lxml'), if installed: time to build the documents of the METAR/SPECI and TAF reports
+#          found in the test suite and demo files, to serialize them, throughput of encoding and writing their
+#          bulletins, and time to encode and write a collective of all the reports.
+#
+# Usage: python benchmarks/xml_backends.py [-n repeat]
+#
+import argparse
+import io
+import logging
+import time
+
+import corpus
+
+from gifts import METAR
+from gifts import TAF
+from gifts.common import Common
+from gifts.common import xmlStream
+
+DATABASE = {}
+
+
+def timeit(function, args, repeat):
+
+    best = float('inf')
+    for n in range(repeat):
+        t0 = time.perf_counter()
+        results = [function(*arg) for arg in args]
+        best = min(best, time.perf_counter() - t0)
+
+    return best / len(args), results
+
+
+def write(encoder, text):
+
+    bulletin = encoder.encode(text)
+    if len(bulletin):
+        stream = io.BytesIO()
+        stream.mode = 'wb'
+        bulletin.write(stream)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of runs, the best is kept')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    backends = ['tree', 'stream']
+    if Common._BACKENDS['lxml'] is not Common.ET:
+        backends.append('lxml')
+
+    print('%-6s %-7s %12s %12s %16s %12s' % ('', 'backend', 'build', 'serialize', 'encode & write', 'collective'))
+    for product, encoderClass, ahl in (('METAR', METAR.Encoder, 'SAXX99 XXXX 010000\n'),
+                                       ('TAF', TAF.Encoder, 'FTXX99 XXXX 010000\n')):
+
+        encoder = encoderClass(DATABASE)
+        reports = corpus.reports(product)
+        decoded = [(encoder.decoder(tac), tac) for tac in reports]
+        messages = [(encoder, ahl + tac) for tac in reports]
+        collective = [(encoder, ahl + '\n'.join(reports))]
+
+        for backend in backends:
+            encoder.encoder.xmlBackend = backend
+            build, documents = timeit(encoder.encoder, decoded, args.repeat)
+            documents = [(document, 'UTF-8') for document in documents if document is not None]
+            serialize, xml = timeit(xmlStream.backend(documents[0][0]).tostring, documents, args.repeat)
+            whole = timeit(write, messages, args.repeat)[0]
+            large = timeit(write, collective, args.repeat)[0]
+            print('%-6s %-7s %9.0f us %9.0f us %11.0f/s %9.1f ms' % (
+                product, backend, 1e6 * build, 1e6 * serialize, 1. / whole, 1e3 * large))
+
+
+if __name__ == '__main__':
+    main()
@@ -29,7 +29,8 @@ class Encoder(E.Encoder):
        equivalent IWXXM form
 
        geoLocationsDB = object containing a get() method to return metadata information based on ICAO Id. Response
-                        shall be of the form 'name|IATA_ID|alternate_designator|latitude longitude elevation' (required)
+                        shall be of the form 'name|IATA_ID|alternate_designator|latitude longitude elevation', or
+                        gifts.common.geoLocations.GeoLocations object (required)
 
        methods:
          .encode(text, [receiptTime='%Y%m%dT%H:%M:%SZ'])
@@ -3,6 +3,8 @@ import re
 from . import swaDecoder
 from . import swaEncoder
 from .common import Encoder as E
+from .common import solarPosition
+from .common import xmlConfig as des
 #
 # Purpose: Accepts Traditional Alphanumeric Code form of the Space Weather Advisory and generates equivalent IWXXM form.
 #
@@ -32,7 +34,9 @@ class Encoder(E.Encoder):
             text = character string containing entire TAC message (required)
             receiptTime = date/time stamp the TAC message was received at TRANSLATOR centre (optional, see xmlConfig.py)
 
-         returns Bulletin object."""
+         returns Bulletin object.
+
+         .preload() reads the code lists and the ephemeris now, e.g. before worker processes are forked"""
 
     def __init__(self):
 
@@ -44,3 +48,11 @@ class Encoder(E.Encoder):
 
         self.decoder = swaDecoder.Decoder()
         self.encoder = swaEncoder.Encoder()
+
+    def preload(self):
+        """Reads now the code lists and, with the 'skyfield' solar engine, the ephemeris, which the encoder otherwise
+           reads when first needed, see xmlConfig.SOLAR_ENGINE"""
+
+        super(Encoder, self).preload()
+        if des.SOLAR_ENGINE == 'skyfield':
+            solarPosition.ephemeris()
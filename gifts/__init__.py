@@ -1,7 +1,24 @@
 # flake8: noqa F401
-from . import METAR
-from . import SWA
-from . import TAF
-from . import TCA
-from . import VAA 
+#
+# The products are imported when first used, e.g. gifts.METAR.Encoder, so that importing gifts does not compile
+# the grammars of all the decoders nor load skyfield, needed by SWA only.
+import importlib
+
 from .common import bulletin
+
+PRODUCTS = ('METAR', 'SWA', 'TAF', 'TCA', 'VAA')
+
+__all__ = ['bulletin'] + list(PRODUCTS)
+
+
+def __getattr__(name):
+
+    if name in PRODUCTS:
+        return importlib.import_module('.%s' % name, __name__)
+
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(PRODUCTS))
@@ -0,0 +1,104 @@
+#
+# Name: aio.py
+# Purpose: To call the GIFTs encoders and write their bulletins from asyncio programs without blocking the event loop.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import asyncio
+import concurrent.futures
+import functools
+
+
+class Encoder(object):
+    """Asynchronous front end of a GIFTs encoder
+
+       encoder = Encoder object, e.g. gifts.METAR.Encoder(geoLocationsDB) (required)
+       limit = maximum number of bulletins being encoded or written at once (optional)
+       executor = concurrent.futures.ThreadPoolExecutor object running the encoder and the writes (optional, by
+                  default a pool of its own with limit threads)
+
+       The threads share the encoder, which builds every document in a context of its own. The coroutines wait,
+       without blocking the event loop, while more than limit bulletins are in flight.
+
+       methods:
+         await .encode(text, [receiptTime]) returns Bulletin object
+         await .write(bulletin, [obj, header, compress]) returns fullpath to the XML bulletin, if applicable
+         await .encode_and_write(text, [receiptTime, obj, header, compress]) returns Bulletin object and fullpath
+         .close() shuts down the executor of its own"""
+
+    def __init__(self, encoder, limit=8, executor=None):
+
+        self.encoder = encoder
+        self.limit = limit
+        self._semaphore = None
+        self._ownExecutor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(limit, thread_name_prefix='gifts')
+        self._executor = executor
+
+    def _slot(self):
+        #
+        # Created at first use, so that it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    def _run(self, function, *args, **kwargs):
+
+        return asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def encode(self, text, receiptTime=None):
+        """Encodes a TAC message in the executor
+
+           text = character string containing entire TAC message (required)
+           receiptTime = date/time stamp the TAC message was received (optional, see xmlConfig.py)
+
+           returns Bulletin object."""
+
+        async with self._slot():
+            return await self._run(self.encoder.encode, text, receiptTime)
+
+    async def write(self, bulletin, obj=None, header=False, compress=False):
+        """Builds the <MeteorologicalBulletin> document and writes it, compressed or not, in the executor
+
+           Arguments are those of Bulletin.write().
+
+           returns fullpath to the XML bulletin, if applicable."""
+
+        async with self._slot():
+            return await self._run(bulletin.write, obj, header=header, compress=compress)
+
+    async def encode_and_write(self, text, receiptTime=None, obj=None, header=False, compress=False):
+        """Encodes a TAC message and writes the bulletin, if not empty, holding a single place among the bulletins in
+           flight
+
+           returns Bulletin object and fullpath to the XML bulletin, if applicable."""
+
+        async with self._slot():
+            bulletin = await self._run(self.encoder.encode, text, receiptTime)
+            fullpath = None
+            if len(bulletin):
+                fullpath = await self._run(bulletin.write, obj, header=header, compress=compress)
+
+            return bulletin, fullpath
+
+    def close(self):
+        """Shuts down the executor if it was created by this object"""
+
+        if self._ownExecutor:
+            self._executor.shutdown()
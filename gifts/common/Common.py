@@ -1,7 +1,9 @@
 import re
 import xml.etree.ElementTree as ET
 
+from . import tpg
 from . import xmlConfig as des
+from . import xmlStream
 from . import xmlUtilities as deu
 
 #
@@ -23,7 +25,50 @@ from . import xmlUtilities as deu
 # Contact Info: Mark.Oberfield@gmail.com
 #
 
-class Base(object):
+_BACKENDS = {'tree': ET, 'stream': xmlStream}
+#
+# lxml is optional: without it, its backend is xml.etree.ElementTree
+try:
+    from . import xmlLxml
+    _BACKENDS['lxml'] = xmlLxml
+except ImportError:
+    _BACKENDS['lxml'] = ET
+
+
+class ReentrantDecoder(object):
+    """Mixin for decoders whose reports are parsed in a copy of the decoder, see tpg.Parser.context(), so that one
+       decoder can be shared. The decoder defines _decode(tac)."""
+
+    def __call__(self, tac):
+        'Decodes the report in a context of its own'
+        return self.context()._decode(tac)
+
+
+class Reentrant(object):
+    """Mixin for encoders whose documents are built in a copy of the encoder, so that one encoder can be shared. The
+       encoder defines _encode(decodedTAC, tac)."""
+    #
+    # XML backend, 'tree', 'stream' or 'lxml', None for xmlConfig.XML_BACKEND, and its module
+    xmlBackend = None
+    ET = ET
+
+    def context(self):
+        """Returns a copy of the encoder for building one document.
+
+        The copy shares the code tables and the other attributes set by __init__. The attributes set while
+        encoding are set on the copy. Methods of the encoder stored in its attributes are bound to the copy. The
+        copy builds the document with the XML backend chosen now."""
+
+        context = tpg.shallow_copy(self)
+        context.ET = _BACKENDS[self.xmlBackend or des.XML_BACKEND]
+        return context
+
+    def __call__(self, decodedTAC, tac):
+        'Encodes the report in a context of its own'
+        return self.context()._encode(decodedTAC, tac)
+
+
+class Base(Reentrant):
 
     def __init__(self):
 
@@ -39,32 +84,32 @@ class Base(object):
 
     def aerodrome(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:aerodrome')
+        indent = self.ET.SubElement(parent, 'iwxxm:aerodrome')
         if token is None:
             return
 
-        indent1 = ET.SubElement(indent, 'aixm:AirportHeliport')
+        indent1 = self.ET.SubElement(indent, 'aixm:AirportHeliport')
         indent1.set('gml:id', deu.getUUID())
 
-        indent2 = ET.SubElement(indent1, 'aixm:timeSlice')
-        indent3 = ET.SubElement(indent2, 'aixm:AirportHeliportTimeSlice')
+        indent2 = self.ET.SubElement(indent1, 'aixm:timeSlice')
+        indent3 = self.ET.SubElement(indent2, 'aixm:AirportHeliportTimeSlice')
         indent3.set('gml:id', deu.getUUID())
 
-        indent4 = ET.SubElement(indent3, 'gml:validTime')
-        indent4 = ET.SubElement(indent3, 'aixm:interpretation')
+        indent4 = self.ET.SubElement(indent3, 'gml:validTime')
+        indent4 = self.ET.SubElement(indent3, 'aixm:interpretation')
         indent4.text = 'SNAPSHOT'
 
         try:
             designator = token['alternate']
             if self._re_Alternate_ID.match(designator) is not None:
-                indent4 = ET.SubElement(indent3, 'aixm:designator')
+                indent4 = self.ET.SubElement(indent3, 'aixm:designator')
                 indent4.text = designator
 
         except KeyError:
             pass
 
         try:
-            indent4 = ET.Element('aixm:name')
+            indent4 = self.ET.Element('aixm:name')
             indent4.text = token['name']
             if len(indent4.text):
                 indent3.append(indent4)
@@ -75,23 +120,23 @@ class Base(object):
         # ICAO identifier shall only match [A-Z]{4}
         designator = token['str']
         if self._re_ICAO_ID.match(designator) is not None:
-            indent4 = ET.SubElement(indent3, 'aixm:locationIndicatorICAO')
+            indent4 = self.ET.SubElement(indent3, 'aixm:locationIndicatorICAO')
             indent4.text = designator
         #
         # If IATA identifier is provided
         try:
             designator = token['iataID']
             if self._re_IATA_ID.match(designator) is not None:
-                indent4 = ET.SubElement(indent3, 'aixm:designatorIATA')
+                indent4 = self.ET.SubElement(indent3, 'aixm:designatorIATA')
                 indent4.text = designator
 
         except KeyError:
             pass
 
         try:
-            indent4 = ET.Element('aixm:ARP')
-            indent5 = ET.SubElement(indent4, 'aixm:ElevatedPoint')
-            indent6 = ET.SubElement(indent5, 'gml:pos')
+            indent4 = self.ET.Element('aixm:ARP')
+            indent5 = self.ET.SubElement(indent4, 'aixm:ElevatedPoint')
+            indent6 = self.ET.SubElement(indent5, 'gml:pos')
             dim_int = int(des.srsDimension)
             indent6.text = ' '.join(token['position'].split()[:dim_int])
             indent5.set('srsDimension', des.srsDimension)
@@ -102,12 +147,12 @@ class Base(object):
             # If vertical datum information is known, then use it.
             if des.useElevation:
                 try:
-                    indent6 = ET.Element('aixm:elevation')
+                    indent6 = self.ET.Element('aixm:elevation')
                     indent6.text = token['position'].split()[dim_int]
                     indent6.set('uom', des.elevationUOM)
                     indent5.append(indent6)
 
-                    indent6 = ET.SubElement(indent5, 'aixm:verticalDatum')
+                    indent6 = self.ET.SubElement(indent5, 'aixm:verticalDatum')
                     indent6.text = des.verticalDatum
 
                 except IndexError:
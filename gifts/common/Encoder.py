@@ -1,8 +1,17 @@
+import collections
+import concurrent.futures
+import itertools
 import logging
 import os
+import time
 
 from . import bulletin
+from . import cache
+from . import duplicates
+from . import geoLocations
+from . import metrics
 from . import xmlConfig as des
+from . import xmlStream
 #
 # Copyright (C) 2025 Mark Oberfield
 #
@@ -21,6 +30,49 @@ from . import xmlConfig as des
 #
 # Contact Info: Mark.Oberfield@gmail.com
 #
+#
+# Encoder of the worker processes of encode_many()
+_workerEncoder = None
+
+
+def _initWorker(encoderClass, args, xmlBackend=None):
+
+    global _workerEncoder
+    _workerEncoder = encoderClass(*args)
+    if xmlBackend is not None:
+        _workerEncoder.encoder.xmlBackend = xmlBackend
+
+
+def _encodeChunk(chunk, encoder=None):
+
+    if encoder is None:
+        encoder = _workerEncoder
+    return [encoder.encode(text, receiptTime) for text, receiptTime in chunk]
+
+
+def _clone(decodedTAC):
+    """Copies the dictionaries, lists and tuples of a decoded TAC form, much faster than copy.deepcopy()"""
+
+    if type(decodedTAC) is dict:
+        return {key: _clone(value) for key, value in decodedTAC.items()}
+    if type(decodedTAC) is list:
+        return [_clone(value) for value in decodedTAC]
+    if type(decodedTAC) is tuple:
+        return tuple(_clone(value) for value in decodedTAC)
+
+    return decodedTAC
+
+
+def _collect(pending, ordered):
+    """Removes at least one future from pending and returns the bulletins of the futures removed"""
+
+    if ordered:
+        return pending.popleft().result()
+
+    done, notDone = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+    pending.clear()
+    pending.extend(notDone)
+    return [result for future in done for result in future.result()]
 
 
 class Encoder(object):
@@ -29,11 +81,58 @@ class Encoder(object):
         """Superclass for invoking MDL decoders and encoders for a code form."""
 
         self.geoLocationsDB = None
+        self.decodeCache = None
+        self.duplicateWindow = None
         self._Logger = logging.getLogger(__name__)
+        self._product = self.__class__.__module__.rsplit('.', 1)[-1]
         #
         # Always work in GMT
         os.environ['TZ'] = 'GMT0'
 
+    def cache_decodes(self, maxsize=1024, ttl=3600.):
+        """Keeps the decoded TAC forms, so that duplicates, e.g. retransmissions or reports found in several
+           collectives, are not parsed again.
+
+           maxsize = maximum number of decoded TAC forms kept, None to stop caching (optional)
+           ttl = seconds a decoded TAC form is kept, None for no limit (optional)
+
+           The key is the TAC form, with its white space normalized, and the current day: xmlUtilities.fix_date()
+           chooses the month and year of the decoded times from the current time, taking times more than 3 days
+           ahead to be in the previous month and times more than 25 days ago to be in the next. A TAC form whose
+           times are that far from the current time may decode to another month later the same day, within ttl.
+           Positions of the tokens ('index') and decoding error messages are
+           those of the first TAC form decoded. Worker processes of encode_many() do not cache.
+
+           returns LRUCache object, whose .stats() method reports hits, misses and evictions, or None."""
+
+        self.decodeCache = None if maxsize is None else cache.LRUCache(maxsize, ttl)
+        return self.decodeCache
+
+    def suppress_duplicates(self, window=600., maxsize=65536):
+        """Drops the TAC forms received again within a time window, without decoding or encoding them.
+
+           window = seconds during which a TAC form received again is dropped, None to stop dropping (optional)
+           maxsize = maximum number of TAC forms remembered (optional)
+
+           A TAC form is a duplicate when its location indicator, issue time, text, white space aside, and the BBB
+           of its bulletin are those of a TAC form received before. Encoders of several code forms may share one
+           DuplicateWindow object, set as their duplicateWindow attribute. Worker processes of encode_many() can not
+           share it, so encode_many() raises ValueError with executor='process' while a window is set.
+
+           returns DuplicateWindow object, whose .stats() method reports the TAC forms checked and suppressed, or
+           None."""
+
+        self.duplicateWindow = None if window is None else duplicates.DuplicateWindow(window, maxsize)
+        return self.duplicateWindow
+
+    def preload(self):
+        """Reads now what the encoder otherwise reads when first needed, the code lists of the WMO Code Registry, so
+           that worker processes forked afterwards share it instead of reading it each"""
+
+        codes = getattr(getattr(self, 'encoder', None), 'codes', None)
+        if codes is not None:
+            codes.load_all()
+
     def encode(self, text, receiptTime=None, **attrs):
         """Parses text to extract the WMO AHL line and one or more TAC forms.
 
@@ -42,6 +141,7 @@ class Encoder(object):
 
            returns Bulletin object."""
         #
+        stopwatch = metrics.stopwatch()
         collection = bulletin.Bulletin()
         #
         # Get the WMO AHL line and the TAC form(s)
@@ -52,58 +152,219 @@ class Encoder(object):
             collection.set_bulletinIdentifier(**attrs)
 
             translatedBulletinID = AHL.group(0).replace(' ', '')
+            if stopwatch is not None:
+                stopwatch.lap(self._product, 'ahl')
+
+            tacs = self.re_TAC.findall(text)
+            if stopwatch is not None:
+                stopwatch.lap(self._product, 'split')
 
-            for tac in self.re_TAC.findall(text):
+            for tac in tacs:
+                try:
+                    document = self._encode(tac, attrs['bbb'], translatedBulletinID, receiptTime)
+                    if document is not None:
+                        collection.append(document)
+                except SyntaxError as msg:
+                    self._Logger.warning(msg)
 
-                decodedTAC = self.decoder(tac)
-                if decodedTAC['bbb'] == '':
-                    decodedTAC['bbb'] = attrs['bbb']
+        except AttributeError:
+            pass
 
-                if des.TRANSLATOR:
-                    decodedTAC['translatedBulletinID'] = translatedBulletinID
-                    if receiptTime is not None:
-                        decodedTAC['translatedBulletinReceptionTime'] = receiptTime
-                    else:
-                        decodedTAC['translatedBulletinReceptionTime'] = decodedTAC['translationTime']
+        return collection
 
-                elif 'err_msg' in decodedTAC:
-                    if self.T1T2 == 'L':
-                        try:
-                            self._Logger.warning('Will not create IWXXM document for %s' % decodedTAC['ident']['str'])
-                        except KeyError:
-                            self._Logger.warning('Bad observation or TAF: Could not determine ICAO ID: %s' % tac)
-                    else:
-                        self._Logger.warning('Will not create IWXXM advisory because of a decoding error.')
+    def iter_encode(self, text_or_file, receiptTime=None, serialize=False):
+        """Parses text to extract the WMO AHL line and one or more TAC forms, yielding each IWXXM document as soon as
+           its TAC form is translated.
 
-                    continue
+           text_or_file = character string containing entire TAC message, or file object opened in text mode from
+                          which it is read piecemeal (required)
+           receiptTime = date/time stamp the TAC message was received (optional, see xmlConfig.py)
+           serialize = if True, yield the documents as UTF-8 encoded XML, with declaration (optional)
+
+           yields ElementTree Element objects, or bytes."""
+        #
+        if hasattr(text_or_file, 'read'):
+            pieces = iter(lambda: text_or_file.read(65536), '')
+        else:
+            pieces = [text_or_file]
+        #
+        # The AHL line is kept once complete. A TAC form is kept once followed by more text, or once the text is
+        # exhausted: the TAC forms end with '=' or, for the advisories, with the text.
+        AHL = None
+        text = ''
+        pos = 0
+        for piece in itertools.chain(pieces, [None]):
 
-                if self.geoLocationsDB is not None:
+            if piece is None:
+                end = len(text) + 1
+            else:
+                text += piece
+                end = len(text)
 
-                    try:
-                        metaData = self.geoLocationsDB.get(decodedTAC['ident']['str'], '|||0.0 0.0 0')
-                    except KeyError:
-                        self._Logger.warning('Bad observation, could not determine icaoID: %s' % tac)
-                        continue
+            if AHL is None:
+                AHL = self.re_AHL.search(text)
+                if AHL is None or (piece is not None and text.find('\n', AHL.end()) < 0):
+                    AHL = None
+                    continue
 
-                    fullname, iataID, alternateID, position = metaData.split('|')
+                bbb = AHL.group('bbb') or ''
+                translatedBulletinID = AHL.group(0).replace(' ', '')
 
-                    if len(fullname) > 0:
-                        decodedTAC['ident']['name'] = fullname
-                    if len(alternateID) > 0:
-                        decodedTAC['ident']['alternate'] = alternateID
-                    if len(iataID) > 0:
-                        decodedTAC['ident']['iataID'] = iataID
+            for result in self.re_TAC.finditer(text, pos):
+                if result.end() >= end:
+                    break
 
-                    decodedTAC['ident']['position'] = position
-                    if position == '0.0 0.0 0':
-                        self._Logger.warning('"%s" not found in geoLocationsDB. Location missing.' %
-                                             decodedTAC['ident']['str'])
+                pos = result.end()
                 try:
-                    collection.append(self.encoder(decodedTAC, tac))
+                    document = self._encode(result.group(0), bbb, translatedBulletinID, receiptTime)
                 except SyntaxError as msg:
                     self._Logger.warning(msg)
+                    continue
 
-        except AttributeError:
-            pass
+                if document is not None:
+                    if serialize:
+                        document = xmlStream.backend(document).tostring(document, encoding='UTF-8',
+                                                                        xml_declaration=True)
+                    yield document
+            #
+            # Drop the text already translated, keeping the beginning of the line for the '^' anchors
+            cut = text.rfind('\n', 0, pos) + 1
+            text = text[cut:]
+            pos -= cut
 
-        return collection
+    def _encode(self, tac, bbb, translatedBulletinID, receiptTime):
+        """Decodes and encodes one TAC form, returns the IWXXM document or None if it is not to be issued"""
+
+        if self.duplicateWindow is not None and self.duplicateWindow.seen(tac, bbb):
+            self._Logger.debug('Duplicate TAC form dropped: %s' % tac)
+            return None
+
+        stopwatch = metrics.stopwatch()
+        decodedTAC = self._decode(tac)
+        if stopwatch is not None:
+            stopwatch.lap(self._product, 'decode')
+
+        if decodedTAC['bbb'] == '':
+            decodedTAC['bbb'] = bbb
+
+        if des.TRANSLATOR:
+            decodedTAC['translatedBulletinID'] = translatedBulletinID
+            if receiptTime is not None:
+                decodedTAC['translatedBulletinReceptionTime'] = receiptTime
+            else:
+                decodedTAC['translatedBulletinReceptionTime'] = decodedTAC['translationTime']
+
+        elif 'err_msg' in decodedTAC:
+            if self.T1T2 == 'L':
+                try:
+                    self._Logger.warning('Will not create IWXXM document for %s' % decodedTAC['ident']['str'])
+                except KeyError:
+                    self._Logger.warning('Bad observation or TAF: Could not determine ICAO ID: %s' % tac)
+            else:
+                self._Logger.warning('Will not create IWXXM advisory because of a decoding error.')
+
+            return None
+
+        if self.geoLocationsDB is not None:
+
+            try:
+                fullname, iataID, alternateID, position = geoLocations.lookup(self.geoLocationsDB,
+                                                                              decodedTAC['ident']['str'])
+            except KeyError:
+                self._Logger.warning('Bad observation, could not determine icaoID: %s' % tac)
+                return None
+
+            if len(fullname) > 0:
+                decodedTAC['ident']['name'] = fullname
+            if len(alternateID) > 0:
+                decodedTAC['ident']['alternate'] = alternateID
+            if len(iataID) > 0:
+                decodedTAC['ident']['iataID'] = iataID
+
+            decodedTAC['ident']['position'] = position
+            if position == '0.0 0.0 0':
+                self._Logger.warning('"%s" not found in geoLocationsDB. Location missing.' %
+                                     decodedTAC['ident']['str'])
+
+            if stopwatch is not None:
+                stopwatch.lap(self._product, 'geolocation')
+
+        document = self.encoder(decodedTAC, tac)
+        if stopwatch is not None:
+            stopwatch.lap(self._product, 'encode')
+
+        return document
+
+    def _decode(self, tac):
+        """Decodes one TAC form, or copies the result of decoding the same TAC form today"""
+
+        if self.decodeCache is None:
+            return self.decoder(tac)
+
+        key = (' '.join(tac.split()), time.strftime('%Y%m%d'))
+        try:
+            decodedTAC = _clone(self.decodeCache[key])
+            decodedTAC['translationTime'] = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        except KeyError:
+            decodedTAC = self.decoder(tac)
+            self.decodeCache[key] = _clone(decodedTAC)
+
+        return decodedTAC
+
+    def encode_many(self, messages, workers=None, executor='process', ordered=True, chunksize=1):
+        """Encodes many TAC messages with a pool of workers.
+
+           messages = iterable of character strings containing entire TAC messages, or of (text, receiptTime)
+                      pairs (required)
+           workers = number of worker processes or threads (optional, default is the number of CPUs)
+           executor = 'process' or 'thread' (optional)
+           ordered = if True, the bulletins come in the order of the messages, otherwise as soon as they are
+                     encoded (optional)
+           chunksize = number of messages handed to a worker at once (optional)
+
+           A worker process creates its own encoder once, calling the class of this encoder with geoLocationsDB as
+           argument if it is not None, so geoLocationsDB must be picklable, and setting its XML backend. Worker
+           processes neither cache decoded TAC forms nor suppress duplicates; ValueError is raised if duplicates are
+           to be suppressed, see suppress_duplicates(). Worker threads share this encoder. Messages are read as the
+           bulletins are consumed, a few chunks per worker ahead.
+
+           yields one Bulletin object per message."""
+        #
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if executor == 'process':
+            if self.duplicateWindow is not None:
+                raise ValueError("Duplicates can not be suppressed by worker processes, use executor='thread'")
+
+            args = () if self.geoLocationsDB is None else (self.geoLocationsDB,)
+            xmlBackend = getattr(self.encoder, 'xmlBackend', None)
+            pool = concurrent.futures.ProcessPoolExecutor(workers, initializer=_initWorker,
+                                                          initargs=(self.__class__, args, xmlBackend))
+            encoder = None
+        elif executor == 'thread':
+            pool = concurrent.futures.ThreadPoolExecutor(workers)
+            encoder = self
+        else:
+            raise ValueError("executor shall be 'process' or 'thread', not %r" % executor)
+
+        pending = collections.deque()
+        chunk = []
+        try:
+            for message in messages:
+                chunk.append((message, None) if isinstance(message, str) else message)
+                if len(chunk) == chunksize:
+                    pending.append(pool.submit(_encodeChunk, chunk, encoder))
+                    chunk = []
+                    if len(pending) == 2 * workers:
+                        for result in _collect(pending, ordered):
+                            yield result
+            if chunk:
+                pending.append(pool.submit(_encodeChunk, chunk, encoder))
+
+            while pending:
+                for result in _collect(pending, ordered):
+                    yield result
+        finally:
+            pool.shutdown(cancel_futures=True)
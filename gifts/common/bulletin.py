@@ -7,8 +7,10 @@ import datetime
 import os
 import re
 import sys
-import uuid
-import xml.etree.ElementTree as ET
+
+from . import gmlIDs
+from . import metrics
+from . import xmlStream
 #
 # Copyright (C) 2025 Mark Oberfield
 #
@@ -28,6 +30,11 @@ import xml.etree.ElementTree as ET
 # Contact Info: Mark.Oberfield@gmail.com
 #
 
+#
+# Products by T1T2 of the bulletin identifiers, labelling the measurements of the metrics module
+_PRODUCTS = {'LA': 'METAR', 'LP': 'METAR', 'LC': 'TAF', 'LT': 'TAF', 'LU': 'VAA', 'LK': 'TCA', 'LN': 'SWA'}
+
+
 class XMLError(SyntaxError):
     pass
 
@@ -56,10 +63,11 @@ class Bulletin(object):
         #
         # Pad it with spaces and newlines
         self._addwhitespace()
+        backend = xmlStream.backend(self.bulletin)
         if sys.version_info[0] == 3:
-            xmlstring = ET.tostring(self.bulletin, encoding='unicode', method='xml')
+            xmlstring = backend.tostring(self.bulletin, encoding='unicode', method='xml')
         else:
-            xmlstring = ET.tostring(self.bulletin, encoding='UTF-8', method='xml')
+            xmlstring = backend.tostring(self.bulletin, encoding='UTF-8', method='xml')
 
         self.bulletin = None
         return xmlstring
@@ -122,23 +130,26 @@ class Bulletin(object):
         except AttributeError:
             raise XMLError("bulletinIdentifier needs to be set")
 
-        self.bulletin = ET.Element('MeteorologicalBulletin')
+        #
+        # Built with the XML backend of the documents
+        backend = xmlStream.backend(self._children[0])
+        self.bulletin = backend.Element('MeteorologicalBulletin')
         self.bulletin.set('xmlns', 'http://def.wmo.int/collect/2014')
         self.bulletin.set('xmlns:gml', 'http://www.opengis.net/gml/3.2')
         self.bulletin.set('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
         self.bulletin.set('xsi:schemaLocation',
                           'http://def.wmo.int/collect/2014 https://schemas.wmo.int/collect/1.2/collect.xsd')
-        self.bulletin.set('gml:id', 'uuid.%s' % uuid.uuid4())
+        self.bulletin.set('gml:id', 'uuid.%s' % gmlIDs.newID())
 
         for child in self._children:
-            metInfo = ET.SubElement(self.bulletin, 'meteorologicalInformation')
+            metInfo = backend.SubElement(self.bulletin, 'meteorologicalInformation')
             metInfo.append(child)
 
         fn = '{}_{}.xml'.format(self._bulletinId, datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%d%H%M%S'))
         if compress:
             fn = '{}.gz'.format(fn)
 
-        bulletinId = ET.SubElement(self.bulletin, 'bulletinIdentifier')
+        bulletinId = backend.SubElement(self.bulletin, 'bulletinIdentifier')
         bulletinId.text = self._internalBulletinId = fn
 
     def what_kind(self):
@@ -185,7 +196,7 @@ class Bulletin(object):
 
     def _write(self, obj, header, compress):
 
-        tree = ET.ElementTree(element=self.bulletin)
+        tree = xmlStream.backend(self.bulletin).ElementTree(element=self.bulletin)
         if header:
             ahl_line = '{}\n'.format(self._wmoAHL)
             obj.write(ahl_line.encode('UTF-8'))
@@ -194,6 +205,10 @@ class Bulletin(object):
         except TypeError:
             tree.write(obj, encoding='UTF-8', xml_declaration=True, method='xml')
 
+    def _product(self):
+
+        return _PRODUCTS.get(self._bulletinId[2:4], 'unknown')
+
     def _iswriteable(self, obj):
         try:
             return obj.writable() and obj.mode == 'wb'
@@ -227,14 +242,19 @@ class Bulletin(object):
             header = False
         #
         # Generate the Meteorological Bulletin for writing
+        stopwatch = metrics.stopwatch()
         try:
             self._internalBulletinId
         except AttributeError:
             self._export(canBeCompressed)
+            if stopwatch is not None:
+                stopwatch.lap(self._product(), 'export')
         #
         # If the object name is writable and mode is correct
         if self._iswriteable(obj):
             self._write(obj, header, canBeCompressed)
+            if stopwatch is not None:
+                stopwatch.lap(self._product(), 'write')
             return None
         #
         # Write to current directory if None, or to the directory path provided.
@@ -255,6 +275,8 @@ class Bulletin(object):
 
             self._write(_fh, header, canBeCompressed)
             _fh.close()
+            if stopwatch is not None:
+                stopwatch.lap(self._product(), 'write')
 
             return fullpath
 
@@ -0,0 +1,117 @@
+#
+# Name: cache.py
+# Purpose: A bounded, thread-safe mapping that forgets its least recently used entries and, optionally, entries
+#          older than a time to live.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import collections
+import threading
+import time
+
+
+class LRUCache(object):
+    """Least recently used cache with an optional time to live
+
+       maxsize = maximum number of entries (optional)
+       ttl = seconds after which an entry is dropped, None for no limit (optional)
+       clock = function returning the time in seconds (optional, default is time.monotonic)
+
+       Lookups of missing or expired keys raise KeyError. The counters 'hits', 'misses' and 'evictions', the
+       entries dropped to make room or because they expired, are available from .stats().
+
+       methods:
+         [key], [key] = value, len(), in
+         .get(key, [default]) returns value or default
+         .stats() returns dictionary of the counters, size and maxsize
+         .clear() drops the entries and resets the counters"""
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+
+        if maxsize < 1:
+            raise ValueError('maxsize shall be at least 1, not %r' % maxsize)
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+
+        return len(self._entries)
+
+    def __contains__(self, key):
+
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return False
+
+            return expires is None or expires > self._clock()
+
+    def __getitem__(self, key):
+
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+
+            if expires is not None and expires <= self._clock():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                raise KeyError(key)
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key, default=None):
+
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def stats(self):
+        """Returns dictionary of the hits, misses, evictions, size and maxsize of the cache"""
+
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries),
+                'maxsize': self.maxsize}
+
+    def clear(self):
+        """Drops the entries and resets the counters"""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,275 @@
+#
+# Name: codeRegistry.py
+# Purpose: To read the code lists of the WMO Code Registry, in RDF/XML format, once per process and share them among
+#          the encoders, keeping snapshots of the code lists read so that other processes do not parse the RDF files
+#          again.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# A code list is a read-only dictionary of the concepts of an RDF file, {key: (URI, label)}, with labels in one
+# language. Code lists are read when first requested, and read again when their RDF file changes.
+#
+# Snapshots are marshalled files, one per RDF file and language, written in xmlConfig.CodesSnapshotPath, if set and
+# writable, and, like byte-code files, unless sys.dont_write_bytecode is set. A snapshot is used while the
+# modification time and size of its RDF file are unchanged or, if they changed, while the contents of the file have
+# the same hash.
+#
+import collections.abc
+import hashlib
+import marshal
+import os
+import sys
+import threading
+import types
+import xml.etree.ElementTree as ET
+
+from . import xmlConfig as des
+#
+# Registries by directory of the RDF files
+_registries = {}
+_lock = threading.Lock()
+
+
+def parseCodeList(fname, preferredLanguage='en'):
+    """Returns dictionary {key: (URI, label)} of the concepts in an RDF file of the WMO Code Registry
+
+       fname = path name of the RDF file (required)
+       preferredLanguage = language of the labels; English if a concept has no label in it (optional)"""
+
+    events = 'start', 'start-ns'
+    top = None
+    nameSpaces = {'xml': 'http://www.w3.org/XML/1998/namespace'}
+    neededNS = ['skos', 'rdf', 'rdfs']
+
+    for event, elem in ET.iterparse(fname, events):
+        if event == 'start' and top is None:
+            top = elem
+        elif neededNS and event == 'start-ns':
+            if elem[0] in neededNS:
+                nameSpaces[elem[0]] = elem[1]
+                neededNS.remove(elem[0])
+    #
+    # Now that we have the required namespaces for searches
+    Concept = '{%s}Concept' % nameSpaces.get('skos')
+    about = '{%s}about' % nameSpaces.get('rdf')
+    label = '{%s}label[@{%s}lang="%s"]' % (nameSpaces.get('rdfs'), nameSpaces.get('xml'), preferredLanguage)
+    enlabel = '{%s}label[@{%s}lang="%s"]' % (nameSpaces.get('rdfs'), nameSpaces.get('xml'), 'en')
+    nolang = '{%s}label' % nameSpaces.get('rdfs')
+
+    root = ET.ElementTree(top)
+    kvp = []
+    for concept in root.iter(Concept):
+        try:
+            uri = concept.get(about)
+            key = uri[uri.rfind('/') + 1:]
+            text = ''
+            try:
+                text = concept.find(label).text
+            except AttributeError:
+                if preferredLanguage != 'en':
+                    text = concept.find(enlabel).text
+                else:
+                    text = concept.find(nolang).text
+            finally:
+                kvp.append((key, (uri, text)))
+
+        except AttributeError:
+            pass
+
+    return dict(kvp)
+
+
+class CodeRegistry(object):
+    """Code lists of the RDF files in a directory, read once per process
+
+       srcDirectory = directory of the RDF files (required)
+       snapshotDirectory = directory of the snapshots, None for none (optional)
+
+       methods:
+         .files() returns dictionary of the RDF files in srcDirectory, by file name
+         .codeList(fname, [preferredLanguage]) returns read-only dictionary {key: (URI, label)} of an RDF file
+         .stats() returns dictionary of the code lists parsed and loaded from snapshots"""
+
+    def __init__(self, srcDirectory, snapshotDirectory=None):
+
+        self.srcDirectory = srcDirectory
+        self.snapshotDirectory = snapshotDirectory
+        self._lock = threading.RLock()
+        self._listing = (None, {})
+        self._codeLists = {}
+        self.parsed = self.snapshots = 0
+
+    def files(self):
+        """Returns dictionary {file name: path name} of the files in srcDirectory, listed again when the directory
+           changes"""
+
+        mtime = os.stat(self.srcDirectory).st_mtime_ns
+        if self._listing[0] != mtime:
+            with self._lock:
+                self._listing = (mtime, {fname: os.path.join(self.srcDirectory, fname)
+                                         for fname in sorted(os.listdir(self.srcDirectory))})
+
+        return self._listing[1]
+
+    def codeList(self, fname, preferredLanguage='en'):
+        """Returns read-only dictionary {key: (URI, label)} of the concepts in an RDF file
+
+           fname = path name of the RDF file (required)
+           preferredLanguage = language of the labels (optional)"""
+
+        st = os.stat(fname)
+        key = (fname, preferredLanguage)
+        try:
+            stamp, codeList = self._codeLists[key]
+            if stamp == (st.st_mtime_ns, st.st_size):
+                return codeList
+        except KeyError:
+            pass
+
+        with self._lock:
+            codeList = self._load(fname, preferredLanguage, st)
+            self._codeLists[key] = ((st.st_mtime_ns, st.st_size), codeList)
+
+        return codeList
+
+    def _snapshot(self, fname, preferredLanguage):
+
+        name = '%s.%s.%s.marshal' % (os.path.basename(fname), preferredLanguage, sys.implementation.cache_tag)
+        return os.path.join(self.snapshotDirectory, name)
+
+    def _load(self, fname, preferredLanguage, st):
+
+        if self.snapshotDirectory is not None:
+            snapshot = self._snapshot(fname, preferredLanguage)
+            try:
+                with open(snapshot, 'rb') as fh:
+                    mtime, size, digest, codeList = marshal.load(fh)
+
+                if (mtime, size) == (st.st_mtime_ns, st.st_size) or digest == _digest(fname):
+                    self.snapshots += 1
+                    return types.MappingProxyType(codeList)
+
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        codeList = parseCodeList(fname, preferredLanguage)
+        self.parsed += 1
+        if self.snapshotDirectory is not None and not sys.dont_write_bytecode:
+            try:
+                os.makedirs(self.snapshotDirectory, exist_ok=True)
+                temporary = '%s.%d' % (snapshot, os.getpid())
+                with open(temporary, 'wb') as fh:
+                    marshal.dump((st.st_mtime_ns, st.st_size, _digest(fname), codeList), fh)
+                os.replace(temporary, snapshot)
+
+            except OSError:
+                pass
+
+        return types.MappingProxyType(codeList)
+
+    def stats(self):
+        """Returns dictionary of the code lists parsed from RDF files and loaded from snapshots"""
+
+        return {'parsed': self.parsed, 'snapshots': self.snapshots}
+
+
+class CodeLists(collections.abc.Mapping):
+    """Read-only dictionary of code lists by container identifier, each read when first requested
+
+       registry = CodeRegistry object (required)
+       files = dictionary {container identifier: path name of the RDF file} (required)
+       preferredLanguage = language of the labels (optional)
+
+       methods:
+         [containerId], len(), iter(), in
+         .load_all() reads the code lists not read yet"""
+
+    def __init__(self, registry, files, preferredLanguage='en'):
+
+        self._registry = registry
+        self._files = files
+        self._preferredLanguage = preferredLanguage
+        self._codeLists = {}
+
+    def __getitem__(self, containerId):
+
+        try:
+            return self._codeLists[containerId]
+        except KeyError:
+            codeList = self._registry.codeList(self._files[containerId], self._preferredLanguage)
+            self._codeLists[containerId] = codeList
+            return codeList
+
+    def __iter__(self):
+
+        return iter(self._files)
+
+    def load_all(self):
+        """Reads now the code lists not read yet, e.g. before worker processes are forked, so that they share them
+           instead of reading them each"""
+
+        for containerId in self._files:
+            self[containerId]
+
+        return self
+
+    def __len__(self):
+
+        return len(self._files)
+
+
+def _digest(fname):
+
+    with open(fname, 'rb') as fh:
+        return hashlib.blake2b(fh.read(), digest_size=16).digest()
+
+
+def registry(srcDirectory):
+    """Returns the CodeRegistry object of a directory, shared in this process
+
+       srcDirectory = directory of the RDF files (required)"""
+
+    key = os.path.abspath(srcDirectory)
+    try:
+        return _registries[key]
+    except KeyError:
+        pass
+
+    with _lock:
+        if key not in _registries:
+            _registries[key] = CodeRegistry(key, getattr(des, 'CodesSnapshotPath', None))
+
+        return _registries[key]
+
+
+def codeLists(srcDirectory, neededCodes, preferredLanguage='en'):
+    """Returns CodeLists object of the code lists needed, found in srcDirectory
+
+       srcDirectory = directory of the RDF files (required)
+       neededCodes = list of container identifiers; 'nil' is appended if missing (required)
+       preferredLanguage = language of the labels (optional)
+
+       A code list is found in the RDF file whose name contains its container identifier."""
+    #
+    # Nil Reasons are always needed/required
+    if 'nil' not in neededCodes:
+        neededCodes.append('nil')
+
+    files = registry(srcDirectory).files()
+    found = {needed: path for fname, path in files.items() for needed in neededCodes if needed in fname}
+    return CodeLists(registry(srcDirectory), found, preferredLanguage)
@@ -0,0 +1,125 @@
+#
+# Name: duplicates.py
+# Purpose: To recognize TAC forms already received within a time window, e.g. the same bulletin arriving over
+#          redundant lines, so that they are not decoded and encoded again.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import collections
+import hashlib
+import re
+import threading
+import time
+#
+# Location indicator and issue time of METAR/SPECI and TAF
+_re_identTime = re.compile(r'\b(?P<ident>[A-Z][A-Z0-9]{3}) (?P<itime>\d{6}Z)\b')
+
+
+def fingerprint(tac, bbb=''):
+    """Returns the fingerprint of a TAC form
+
+       tac = character string of the TAC form (required)
+       bbb = BBB of the WMO AHL line of the bulletin, so that amendments and corrections differ (optional)
+
+       The fingerprint is a digest of the location indicator, the issue time, the TAC form with its white space
+       normalized, and bbb. The advisories have no location indicator and issue time found this way; their text
+       alone tells them apart."""
+
+    text = ' '.join(tac.split())
+    result = _re_identTime.search(text)
+    if result is None:
+        ident = itime = ''
+    else:
+        ident, itime = result.groups()
+
+    return hashlib.blake2b('\n'.join((ident, itime, text, bbb)).encode(), digest_size=16).digest()
+
+
+class DuplicateWindow(object):
+    """Remembers the fingerprints of the TAC forms received during the last window seconds
+
+       window = seconds during which a TAC form received again is a duplicate (optional)
+       maxsize = maximum number of fingerprints remembered; the oldest are forgotten first (optional)
+       clock = function returning the time in seconds (optional, default is time.monotonic)
+
+       The fingerprints are kept in order of reception, so that those older than the window are dropped from the
+       front. Memory is bounded by maxsize fingerprints of 16 bytes.
+
+       methods:
+         .seen(tac, [bbb]) returns True for a duplicate, otherwise remembers the TAC form and returns False
+         .stats() returns dictionary of the counters, size and maxsize
+         .clear() forgets the TAC forms and resets the counters"""
+
+    def __init__(self, window=600., maxsize=65536, clock=time.monotonic):
+
+        if maxsize < 1:
+            raise ValueError('maxsize shall be at least 1, not %r' % maxsize)
+
+        self.window = window
+        self.maxsize = maxsize
+        self._clock = clock
+        self._received = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.checked = self.suppressed = self.expired = self.evictions = 0
+
+    def __len__(self):
+
+        return len(self._received)
+
+    def seen(self, tac, bbb=''):
+        """Checks whether a TAC form was received during the window
+
+           tac = character string of the TAC form (required)
+           bbb = BBB of the WMO AHL line of the bulletin (optional)
+
+           returns True if the TAC form is a duplicate."""
+
+        key = fingerprint(tac, bbb)
+        with self._lock:
+            now = self._clock()
+            oldest = now - self.window
+            received = self._received
+            while received and next(iter(received.values())) <= oldest:
+                received.popitem(last=False)
+                self.expired += 1
+
+            self.checked += 1
+            if key in received:
+                self.suppressed += 1
+                return True
+
+            received[key] = now
+            if len(received) > self.maxsize:
+                received.popitem(last=False)
+                self.evictions += 1
+
+            return False
+
+    def stats(self):
+        """Returns dictionary of the TAC forms checked and suppressed, of the fingerprints expired and evicted, and of
+           the size and maxsize of the window"""
+
+        return {'checked': self.checked, 'suppressed': self.suppressed, 'expired': self.expired,
+                'evictions': self.evictions, 'size': len(self._received), 'maxsize': self.maxsize}
+
+    def clear(self):
+        """Forgets the TAC forms and resets the counters"""
+
+        with self._lock:
+            self._received.clear()
+            self.checked = self.suppressed = self.expired = self.evictions = 0
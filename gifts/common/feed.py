@@ -0,0 +1,163 @@
+#
+# Name: feed.py
+# Purpose: To read files holding many WMO bulletins, framed by SOH/ETX or by the message length of the WMO file
+#          formats 00 and 01, and hand each bulletin to the encoder of its product.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import io
+import logging
+import mmap
+import os
+import re
+
+SOH = b'\x01'
+ETX = b'\x03'
+#
+# Names of the encoders by T1T2 of the WMO AHL line
+PRODUCTS = {'SA': 'METAR', 'SP': 'METAR', 'FC': 'TAF', 'FT': 'TAF', 'FV': 'VAA', 'FK': 'TCA', 'FN': 'SWA'}
+#
+# Message length and format identifier preceding each message of the WMO file formats 00 (with SOH/ETX) and 01
+_re_length = re.compile(rb'(\d{8})(0[01])')
+_re_heading = re.compile(rb'[A-Z]{4}\d\d +[A-Z]{4} +\d{6}')
+
+_Logger = logging.getLogger(__name__)
+
+
+def frames(buffer):
+    """Finds the bulletins in buffer without copying it
+
+       buffer = bytes-like object, e.g. mmap.mmap, holding bulletins framed by SOH and ETX characters, or preceded
+                by their length as in the WMO file formats 00 and 01. Without any framing, buffer holds a single
+                bulletin (required)
+
+       yields start and stop offsets of each bulletin in buffer."""
+
+    size = len(buffer)
+    pos = 0
+    if not _re_length.match(buffer) and buffer.find(SOH) < 0:
+        if size:
+            yield 0, size
+        return
+
+    while pos < size:
+
+        prefix = _re_length.match(buffer, pos)
+        if prefix is not None:
+            start = prefix.end()
+            stop = start + int(prefix.group(1))
+            if stop > size:
+                _Logger.warning('Bulletin at offset %d is truncated' % start)
+                stop = size
+
+            yield start, stop
+            pos = stop
+            continue
+
+        start = buffer.find(SOH, pos)
+        if start < 0:
+            break
+        #
+        # A bulletin lacking ETX stops at the next SOH, or at the end of the buffer
+        stop = buffer.find(ETX, start)
+        if stop < 0:
+            stop = size
+        else:
+            stop += 1
+
+        following = buffer.find(SOH, start + 1, stop)
+        if following >= 0:
+            stop = following
+
+        yield start, stop
+        pos = stop
+
+
+class FeedReader(object):
+    """Reads files of WMO bulletins and routes each bulletin, by T1T2 of its WMO AHL line, to an encoder
+
+       encoders = dictionary mapping names to Encoder objects, e.g. {'METAR': gifts.METAR.Encoder(geoLocationsDB),
+                  'TAF': gifts.TAF.Encoder(geoLocationsDB), 'SWA': gifts.SWA.Encoder()}. The names are the values
+                  of PRODUCTS (required)
+
+       The file is memory-mapped and the bulletin boundaries are found in place; only the text of each bulletin,
+       from its WMO AHL line to its end, is copied and decoded. In-memory streams, e.g. io.BytesIO, are read whole.
+
+       methods:
+         .bulletins(file) yields T1T2 and text of each bulletin
+         .encode(file, [receiptTime]) yields Bulletin object of each bulletin having an encoder"""
+
+    def __init__(self, encoders):
+
+        self.encoders = dict(encoders)
+        self._Logger = logging.getLogger(__name__)
+
+    def bulletins(self, file):
+        """Finds the bulletins in a file
+
+           file = path name, or file object opened in binary mode (required)
+
+           yields T1T2 and character string of each bulletin, without framing characters and carriage returns."""
+
+        if not hasattr(file, 'fileno'):
+            with open(file, 'rb') as fh:
+                yield from self.bulletins(fh)
+            return
+
+        try:
+            fileno = file.fileno()
+        except (io.UnsupportedOperation, OSError):
+            #
+            # In-memory streams, e.g. io.BytesIO, have no file to map
+            yield from self._bulletins(file.read())
+            return
+
+        if os.fstat(fileno).st_size == 0:
+            return
+
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+            yield from self._bulletins(buffer)
+
+    def _bulletins(self, buffer):
+
+        for start, stop in frames(buffer):
+
+            heading = _re_heading.search(buffer, start, stop)
+            if heading is None:
+                self._Logger.warning('No WMO AHL line in bulletin at offset %d' % start)
+                continue
+
+            text = buffer[heading.start():stop].decode('latin-1')
+            yield text[:2], text.rstrip('\x03\r\n').replace('\r', '')
+
+    def encode(self, file, receiptTime=None):
+        """Encodes the bulletins in a file
+
+           file = path name, or file object opened in binary mode (required)
+           receiptTime = date/time stamp the TAC messages were received (optional, see xmlConfig.py)
+
+           yields Bulletin object of each bulletin having an encoder."""
+
+        for t1t2, text in self.bulletins(file):
+            try:
+                encoder = self.encoders[PRODUCTS[t1t2]]
+            except KeyError:
+                self._Logger.debug('No encoder for %s bulletins' % t1t2)
+                continue
+
+            yield encoder.encode(text, receiptTime)
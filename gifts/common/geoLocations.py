@@ -0,0 +1,392 @@
+#
+# Name: geoLocations.py
+# Purpose: Backends of the geoLocations database, which maps ICAO identifiers of aerodromes to their names,
+#          IATA and alternate identifiers and positions, returning records already split into their fields.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import bisect
+import collections
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import sys
+import threading
+
+from . import cache
+
+Record = collections.namedtuple('Record', 'name iataID alternateID position')
+Record.__doc__ = """Metadata of an aerodrome: full name, IATA identifier, alternate identifier and position, the
+                    string 'latitude longitude elevation'. Unknown fields are empty strings."""
+#
+# Record of aerodromes not found
+MISSING = Record('', '', '', '0.0 0.0 0')
+
+_SELECT = 'SELECT name, iataID, alternateID, position FROM aerodromes WHERE ident = ?'
+#
+# Memory-mapped database: header with the number of aerodromes, their sorted ICAO identifiers as 32-bit numbers, the
+# offsets of their strings 'name|IATA_ID|alternate_designator|latitude longitude elevation', plus the end of the
+# last one, then the UTF-8 encoded strings. Numbers are little-endian unsigned 32-bit integers.
+_MAGIC = b'GIFTSGEO'
+_HEADER = struct.Struct('<8sI4x')
+_UINT32 = struct.Struct('<I')
+
+
+def toRecord(metaData):
+    """Returns Record of a string of the form 'name|IATA_ID|alternate_designator|latitude longitude elevation'"""
+
+    return Record(*metaData.split('|'))
+
+
+def lookup(geoLocationsDB, ident):
+    """Looks up an aerodrome in a geoLocations database
+
+       geoLocationsDB = GeoLocations object, or any object with a get() method returning strings of the form
+                        'name|IATA_ID|alternate_designator|latitude longitude elevation', e.g. a dictionary
+                        (required)
+       ident = ICAO identifier of the aerodrome (required)
+
+       returns Record object, MISSING if the aerodrome is not found."""
+
+    if isinstance(geoLocationsDB, GeoLocations):
+        return geoLocationsDB.lookup(ident)
+
+    return toRecord(geoLocationsDB.get(ident, '|||0.0 0.0 0'))
+
+
+class GeoLocations(object):
+    """Superclass of the geoLocations backends
+
+       Subclasses implement _lookup(ident), returning the Record object of the aerodrome or None. The get() method
+       keeps the backends usable where a dictionary of strings is expected.
+
+       methods:
+         .lookup(ident) returns Record object, MISSING if the aerodrome is not found
+         .get(ident, [default]) returns string 'name|IATA_ID|alternate_designator|latitude longitude elevation'"""
+
+    def lookup(self, ident):
+
+        record = self._lookup(ident)
+        if record is None:
+            return MISSING
+
+        return record
+
+    def get(self, ident, default=None):
+
+        record = self._lookup(ident)
+        if record is None:
+            return default
+
+        return '|'.join(record)
+
+    def __contains__(self, ident):
+
+        return self._lookup(ident) is not None
+
+
+class DictGeoLocations(GeoLocations):
+    """geoLocations database held in memory
+
+       mapping = dictionary of ICAO identifiers to strings of the form
+                 'name|IATA_ID|alternate_designator|latitude longitude elevation' or Record objects, e.g. the
+                 pickled dictionary made by create_pickle_db.py (required)
+
+       The strings are split once, when the object is created."""
+
+    def __init__(self, mapping):
+
+        self._records = {ident: toRecord(value) if isinstance(value, str) else Record(*value)
+                         for ident, value in mapping.items()}
+
+    def __len__(self):
+
+        return len(self._records)
+
+    def _lookup(self, ident):
+
+        return self._records.get(ident)
+
+
+class SQLiteGeoLocations(GeoLocations):
+    """geoLocations database in a SQLite file, with a cache of the aerodromes looked up recently
+
+       path = path name of the SQLite file, as made by createSQLiteDB() (required)
+       maxsize = number of aerodromes cached (optional)
+
+       The file is opened read-only, once in every thread and process using the object, so that it can be shared
+       by threads and handed to worker processes. Only the aerodromes looked up are read into memory.
+
+       methods:
+         .stats() returns dictionary of the hits, misses and evictions of the cache"""
+
+    def __init__(self, path, maxsize=4096):
+
+        self.path = path
+        self.maxsize = maxsize
+        self._setup()
+
+    def _setup(self):
+
+        self._cache = cache.LRUCache(self.maxsize)
+        self._local = threading.local()
+
+    def __getstate__(self):
+
+        return {'path': self.path, 'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self._setup()
+
+    def _connection(self):
+        #
+        # One connection per thread, opened again in forked processes
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.connection = sqlite3.connect('file:%s?mode=ro' % os.path.abspath(self.path), uri=True)
+            local.pid = os.getpid()
+
+        return local.connection
+
+    def _lookup(self, ident):
+
+        try:
+            return self._cache[ident]
+        except KeyError:
+            pass
+
+        row = self._connection().execute(_SELECT, (ident,)).fetchone()
+        record = None if row is None else Record(*row)
+        self._cache[ident] = record
+        return record
+
+    def stats(self):
+        """Returns dictionary of the hits, misses and evictions of the cache"""
+
+        return self._cache.stats()
+
+
+class LazyGeoLocations(GeoLocations):
+    """geoLocations database loaded when the first aerodrome is looked up
+
+       loader = function returning a GeoLocations object or a dictionary, e.g. loadPickle (required)
+       args = arguments of loader, e.g. the path name of the pickled dictionary (optional)
+
+       Handed to worker processes, the object carries loader and args only: every process loads the database
+       itself, if and when it needs it."""
+
+    def __init__(self, loader, *args):
+
+        self.loader = loader
+        self.args = args
+        self._setup()
+
+    def _setup(self):
+
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+
+        return {'loader': self.loader, 'args': self.args}
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self._setup()
+
+    def _load(self):
+
+        with self._lock:
+            if self._backend is None:
+                backend = self.loader(*self.args)
+                if not isinstance(backend, GeoLocations):
+                    backend = DictGeoLocations(backend)
+                self._backend = backend
+
+        return self._backend
+
+    def _lookup(self, ident):
+
+        backend = self._backend
+        if backend is None:
+            backend = self._load()
+
+        return backend._lookup(ident)
+
+
+class _Column(object):
+    """Sequence of little-endian unsigned 32-bit integers in a buffer, for hosts whose memoryview cannot read them"""
+
+    def __init__(self, buffer, start, count):
+
+        self._buffer = buffer
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+
+        return self._count
+
+    def __getitem__(self, n):
+
+        if not 0 <= n < self._count:
+            raise IndexError(n)
+        return _UINT32.unpack_from(self._buffer, self._start + 4 * n)[0]
+
+
+def _column(buffer, start, count):
+
+    if sys.byteorder == 'little':
+        return memoryview(buffer)[start:start + 4 * count].cast('I')
+
+    return _Column(buffer, start, count)
+
+
+def _key(ident):
+    """Returns the 32-bit number of an ICAO identifier, sorting as the identifiers do"""
+
+    return int.from_bytes(ident.encode('ascii'), 'big')
+
+
+class MappedGeoLocations(GeoLocations):
+    """geoLocations database in a file memory-mapped read-only, as made by createMappedDB()
+
+       path = path name of the file (required)
+
+       Opening the file takes the same time whatever its size: aerodromes are found by binary search of the
+       index, and only the pages read are loaded, once, in the page cache shared by all processes. The file is
+       mapped again in forked processes, and only the path name is pickled."""
+
+    def __init__(self, path):
+
+        self.path = path
+        self._setup()
+
+    def _setup(self):
+
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self._setup()
+
+    def __len__(self):
+
+        return len(self._map()[1])
+
+    def _map(self):
+
+        with self._lock:
+            if self._pid != os.getpid():
+                with open(self.path, 'rb') as fh:
+                    buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+                if len(buffer) < _HEADER.size or _HEADER.unpack_from(buffer)[0] != _MAGIC:
+                    buffer.close()
+                    raise ValueError('%s is not a memory-mapped geoLocations database' % self.path)
+
+                count = _HEADER.unpack_from(buffer)[1]
+                self._index = (buffer, _column(buffer, _HEADER.size, count),
+                               _column(buffer, _HEADER.size + 4 * count, count + 1))
+                self._pid = os.getpid()
+
+        return self._index
+
+    def _lookup(self, ident):
+
+        if self._pid == os.getpid():
+            buffer, keys, offsets = self._index
+        else:
+            buffer, keys, offsets = self._map()
+
+        try:
+            key = _key(ident)
+        except UnicodeEncodeError:
+            return None
+
+        n = bisect.bisect_left(keys, key)
+        if n == len(keys) or keys[n] != key:
+            return None
+
+        return toRecord(buffer[offsets[n]:offsets[n + 1]].decode('utf-8'))
+
+
+def loadPickle(path):
+    """Returns DictGeoLocations object of the pickled dictionary in file path, as made by create_pickle_db.py"""
+
+    with open(path, 'rb') as fh:
+        return DictGeoLocations(pickle.load(fh))
+
+
+def createSQLiteDB(path, mapping):
+    """Writes a geoLocations database in a SQLite file for SQLiteGeoLocations
+
+       path = path name of the SQLite file, replaced if it exists (required)
+       mapping = dictionary of ICAO identifiers to strings of the form
+                 'name|IATA_ID|alternate_designator|latitude longitude elevation' or Record objects (required)"""
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    records = DictGeoLocations(mapping)._records
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute('CREATE TABLE aerodromes (ident TEXT PRIMARY KEY, name TEXT, iataID TEXT, '
+                               'alternateID TEXT, position TEXT) WITHOUT ROWID')
+            connection.executemany('INSERT INTO aerodromes VALUES (?, ?, ?, ?, ?)',
+                                   ((ident,) + tuple(record) for ident, record in sorted(records.items())))
+    finally:
+        connection.close()
+
+
+def createMappedDB(path, mapping):
+    """Writes a geoLocations database in a file for MappedGeoLocations
+
+       path = path name of the file. The file is replaced, not rewritten, so that processes mapping the previous
+              one are not disturbed (required)
+       mapping = dictionary of ICAO identifiers, four characters, to strings of the form
+                 'name|IATA_ID|alternate_designator|latitude longitude elevation' or Record objects (required)"""
+
+    records = DictGeoLocations(mapping)._records
+    idents = sorted(ident for ident in records if len(ident) == 4 and ident.isascii())
+
+    heap = ['|'.join(records[ident]).encode('utf-8') for ident in idents]
+    offsets = [_HEADER.size + 4 * (2 * len(idents) + 1)]
+    for value in heap:
+        offsets.append(offsets[-1] + len(value))
+
+    temporary = '%s.%d' % (path, os.getpid())
+    with open(temporary, 'wb') as fh:
+        fh.write(_HEADER.pack(_MAGIC, len(idents)))
+        fh.write(struct.pack('<%dI' % len(idents), *[_key(ident) for ident in idents]))
+        fh.write(struct.pack('<%dI' % len(offsets), *offsets))
+        fh.write(b''.join(heap))
+
+    os.replace(temporary, path)
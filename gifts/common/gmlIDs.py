@@ -0,0 +1,168 @@
+#
+# Name: gmlIDs.py
+# Purpose: To generate the UUIDs of the gml:id attributes of the IWXXM documents, tens of them per document, without
+#          the cost of a call to uuid.uuid4() for each.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# Strategies, chosen with xmlConfig.GML_ID_STRATEGY or use():
+#   'uuid4'   one call to uuid.uuid4(), and so to os.urandom(), for each UUID
+#   'pool'    random UUIDs made in batches from one call to os.urandom() each
+#   'counter' UUIDs made of a random prefix, drawn once per process, and a counter
+#
+# All make version 4 UUIDs in their canonical form, 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'. The generators are
+# thread-safe and start afresh in forked processes, so that parent and child never share UUIDs.
+#
+import itertools
+import os
+import threading
+import uuid
+import weakref
+
+from . import xmlConfig as des
+#
+# Version (4) and variant (RFC 4122) bits of the 7th and 9th bytes, and the positions of the 32 hexadecimal digits
+# in the canonical form
+_VERSION = bytes(byte & 0x0f | 0x40 for byte in range(256))
+_VARIANT = bytes(byte & 0x3f | 0x80 for byte in range(256))
+_POSITIONS = [n + (n >= 8) + (n >= 12) + (n >= 16) + (n >= 20) for n in range(32)]
+#
+# Generators to start afresh in forked processes
+_generators = weakref.WeakSet()
+
+
+class UUID4IDs(object):
+    """Makes each UUID with uuid.uuid4()"""
+
+    def __call__(self):
+
+        return str(uuid.uuid4())
+
+
+class PooledIDs(object):
+    """Makes random UUIDs in batches, from one call to os.urandom() each
+
+       batch = number of UUIDs made at once (optional)"""
+
+    def __init__(self, batch=1024):
+
+        self.batch = batch
+        self._reset()
+        _generators.add(self)
+
+    def _reset(self):
+        #
+        # A new lock, as the one inherited by a forked process may be held by a thread of the parent
+        self._lock = threading.Lock()
+        self._ids = iter(())
+
+    def __call__(self):
+
+        try:
+            return next(self._ids)
+        except StopIteration:
+            return self._refill()
+
+    def _refill(self):
+        #
+        # The bits and digits of the batch are set column by column
+        with self._lock:
+            random = bytearray(os.urandom(16 * self.batch))
+            random[6::16] = random[6::16].translate(_VERSION)
+            random[8::16] = random[8::16].translate(_VARIANT)
+            digits = random.hex().encode('ascii')
+
+            canonical = bytearray(b'-' * (36 * self.batch))
+            for n, position in enumerate(_POSITIONS):
+                canonical[position::36] = digits[n::32]
+
+            canonical = canonical.decode('ascii')
+            ids = iter([canonical[n:n + 36] for n in range(0, 36 * self.batch, 36)])
+            first = next(ids)
+            self._ids = ids
+
+        return first
+
+
+class CounterIDs(object):
+    """Makes UUIDs of a random prefix, the first 80 bits of a UUID drawn once per process, and a 48-bit counter. A new
+       prefix is drawn when the counter wraps around."""
+
+    def __init__(self):
+
+        self._reset()
+        _generators.add(self)
+
+    def _reset(self):
+        #
+        # A new lock, as the one inherited by a forked process may be held by a thread of the parent
+        self._lock = threading.Lock()
+        self._draw()
+
+    def _draw(self):
+
+        self._prefix = str(uuid.uuid4())[:24]
+        self._count = itertools.count()
+
+    def __call__(self):
+
+        n = next(self._count)
+        if n > 0xffffffffffff:
+            with self._lock:
+                self._draw()
+            return self()
+
+        return '%s%012x' % (self._prefix, n)
+
+
+STRATEGIES = {'uuid4': UUID4IDs, 'pool': PooledIDs, 'counter': CounterIDs}
+#
+# Strategy and generator in use
+_strategy = _generator = None
+
+
+def use(strategy):
+    """Sets the strategy generating the UUIDs in this process
+
+       strategy = 'uuid4', 'pool' or 'counter', or a function returning UUIDs in their canonical form (required)"""
+
+    global _strategy, _generator
+    if callable(strategy):
+        _strategy, _generator = strategy, strategy
+    else:
+        _strategy, _generator = strategy, STRATEGIES[strategy]()
+        des.GML_ID_STRATEGY = strategy
+
+
+def newID():
+    """Returns a new UUID in its canonical form"""
+
+    if _strategy is not des.GML_ID_STRATEGY and not callable(_strategy):
+        use(des.GML_ID_STRATEGY)
+
+    return _generator()
+
+
+def _afterFork():
+
+    for generator in list(_generators):
+        generator._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_afterFork)
@@ -0,0 +1,182 @@
+#
+# Name: metrics.py
+# Purpose: To measure the time spent in each stage of encoding TAC messages and writing bulletins, by product, and
+#          export the counters and latency histograms as a dictionary or in the Prometheus text format.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# Stages measured:
+#   Encoder.encode(): 'ahl' (WMO AHL line), 'split' (TAC forms), then, for each TAC form, 'decode', 'geolocation'
+#                     and 'encode' (IWXXM document)
+#   Bulletin.write(): 'export' (<MeteorologicalBulletin> document) and 'write'
+#
+# Measuring is off until enable() is called. While off, the instrumented code only checks that stopwatch()
+# returns None.
+#
+import bisect
+import threading
+import time
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+#
+# Registry of the running measurements, None while off
+_registry = None
+
+
+class _Histogram(object):
+
+    __slots__ = ('counts', 'total')
+
+    def __init__(self, size):
+
+        self.counts = [0] * size
+        self.total = 0.
+
+
+class Registry(object):
+    """Counters and latency histograms of the stages, by product
+
+       buckets = upper bounds, in seconds, of the histogram buckets (optional)
+
+       methods:
+         .observe(product, stage, seconds) records the time spent in a stage
+         .snapshot() returns dictionary of the counts, sums and buckets by product and stage
+         .prometheus() returns the histograms in the Prometheus text exposition format
+         .reset() forgets the measurements"""
+
+    def __init__(self, buckets=BUCKETS):
+
+        self.buckets = tuple(sorted(buckets))
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, product, stage, seconds):
+
+        with self._lock:
+            try:
+                histogram = self._histograms[(product, stage)]
+            except KeyError:
+                histogram = self._histograms[(product, stage)] = _Histogram(len(self.buckets) + 1)
+
+            histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram.total += seconds
+
+    def snapshot(self):
+        """Returns dictionary {product: {stage: {'count': n, 'sum': seconds, 'buckets': {upper bound: n}}}}, where
+           the bucket counts are cumulative and the last upper bound is float('inf')"""
+
+        result = {}
+        with self._lock:
+            for (product, stage), histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+
+                result.setdefault(product, {})[stage] = {'count': cumulative, 'sum': histogram.total,
+                                                         'buckets': buckets}
+        return result
+
+    def prometheus(self):
+        """Returns the histogram gifts_stage_seconds in the Prometheus text exposition format"""
+
+        lines = ['# HELP gifts_stage_seconds Time spent in the stages of encoding TAC messages and writing bulletins.',
+                 '# TYPE gifts_stage_seconds histogram']
+        for product, stages in self.snapshot().items():
+            for stage, histogram in stages.items():
+                labels = 'product="%s",stage="%s"' % (product, stage)
+                for bound, count in histogram['buckets'].items():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('gifts_stage_seconds_bucket{%s,le="%s"} %d' % (labels, le, count))
+                lines.append('gifts_stage_seconds_sum{%s} %r' % (labels, histogram['sum']))
+                lines.append('gifts_stage_seconds_count{%s} %d' % (labels, histogram['count']))
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Forgets the measurements"""
+
+        with self._lock:
+            self._histograms.clear()
+
+
+class Stopwatch(object):
+    """Measures consecutive stages: each lap records the time since the previous lap, or since the start"""
+
+    __slots__ = ('_registry', '_last')
+
+    def __init__(self, registry):
+
+        self._registry = registry
+        self._last = time.perf_counter()
+
+    def lap(self, product, stage):
+
+        now = time.perf_counter()
+        self._registry.observe(product, stage, now - self._last)
+        self._last = now
+
+
+def enable(buckets=BUCKETS):
+    """Starts measuring the stages in this process, keeping the registry running already, if any
+
+       buckets = upper bounds, in seconds, of the histogram buckets of a new registry (optional)
+
+       returns Registry object."""
+
+    global _registry
+    if _registry is None:
+        _registry = Registry(buckets)
+
+    return _registry
+
+
+def disable():
+    """Stops measuring, returns the Registry object of the measurements made, or None"""
+
+    global _registry
+    registry, _registry = _registry, None
+    return registry
+
+
+def stopwatch():
+    """Returns a Stopwatch object started now, or None while measuring is off"""
+
+    if _registry is None:
+        return None
+
+    return Stopwatch(_registry)
+
+
+def snapshot():
+    """Returns dictionary of the measurements, empty while measuring is off; see Registry.snapshot()"""
+
+    if _registry is None:
+        return {}
+
+    return _registry.snapshot()
+
+
+def prometheus():
+    """Returns the measurements in the Prometheus text exposition format, empty while measuring is off"""
+
+    if _registry is None:
+        return ''
+
+    return _registry.prometheus()
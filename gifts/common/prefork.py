@@ -0,0 +1,105 @@
+#
+# Name: prefork.py
+# Purpose: To encode TAC messages in worker processes forked from a parent that has loaded the encoders, so that
+#          the workers share the code tables, parsers, ephemeris and geoLocations database copy-on-write.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+import concurrent.futures
+import gc
+import multiprocessing
+import os
+#
+# Encoders of the pools, inherited by their worker processes when forked
+_encoders = {}
+
+
+def _encode(key, name, text, receiptTime):
+
+    return _encoders[key][name].encode(text, receiptTime)
+
+
+class PreforkPool(object):
+    """Pool of worker processes forked from this process, sharing its encoders copy-on-write
+
+       encoders = dictionary mapping names to Encoder objects, e.g. {'METAR': gifts.METAR.Encoder(geoLocationsDB),
+                  'TAF': gifts.TAF.Encoder(geoLocationsDB), 'SWA': gifts.SWA.Encoder()} (required)
+       workers = number of worker processes (optional, default is the number of CPUs)
+
+       The encoders are created once, in this process, which loads the parsers and the geoLocations database. The
+       code tables and the Skyfield ephemeris, which the encoders read when first needed, are read here with their
+       preload() method. The objects alive are then moved out of reach of the garbage collector with gc.freeze(), so
+       that collections in the workers do not touch, and copy, the pages holding them. Workers are forked from this
+       state, all at once when the first message is submitted; they start without importing or loading anything.
+       Requires an operating system with fork(), i.e. not Windows.
+
+       methods:
+         .submit(name, text, [receiptTime]) returns a Future of the Bulletin object
+         .encode(name, text, [receiptTime]) returns the Bulletin object
+         .shutdown() stops the workers"""
+
+    def __init__(self, encoders, workers=None):
+
+        self._key = id(self)
+        _encoders[self._key] = dict(encoders)
+        for encoder in _encoders[self._key].values():
+            preload = getattr(encoder, 'preload', None)
+            if preload is not None:
+                preload()
+        #
+        # Collect the garbage now so that it is not shared, then freeze the survivors
+        gc.collect()
+        gc.freeze()
+        self._executor = concurrent.futures.ProcessPoolExecutor(workers or os.cpu_count(),
+                                                                mp_context=multiprocessing.get_context('fork'))
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.shutdown()
+
+    def submit(self, name, text, receiptTime=None):
+        """Hands a TAC message to a worker
+
+           name = name of the encoder, a key of the encoders dictionary (required)
+           text = character string containing entire TAC message (required)
+           receiptTime = date/time stamp the TAC message was received (optional, see xmlConfig.py)
+
+           returns concurrent.futures.Future object of the Bulletin object."""
+
+        if name not in _encoders[self._key]:
+            raise KeyError('No encoder named %r in the pool' % name)
+
+        return self._executor.submit(_encode, self._key, name, text, receiptTime)
+
+    def encode(self, name, text, receiptTime=None):
+        """Encodes a TAC message in a worker and waits for the result
+
+           returns Bulletin object."""
+
+        return self.submit(name, text, receiptTime).result()
+
+    def shutdown(self, wait=True):
+        """Stops the workers once the messages submitted are encoded"""
+
+        self._executor.shutdown(wait)
+        if _encoders.pop(self._key, None) is not None and not _encoders:
+            gc.unfreeze()
@@ -0,0 +1,197 @@
+#
+# Name: solarPosition.py
+# Purpose: To find the solar sub-point, the point on the Earth's surface with the Sun at its zenith, for the DAYLIGHT
+#          SIDE regions of the Space Weather Advisories.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# Engines, chosen with xmlConfig.SOLAR_ENGINE or the engine argument of subpoints():
+#   'skyfield' Skyfield and the NAIF/JPL/NASA SPICE kernel, de421.bsp, loaded when a sub-point is first needed, or
+#              by the preload() method of the SWA encoders, e.g. in a PreforkPool, once per process, and shared by
+#              all decoders
+#   'analytic' the solar coordinates of J. Meeus, Astronomical Formulae for Calculators (1979), ch. 18, with their
+#              perturbations by Venus, Jupiter and the Moon, and the nutation and sidereal time of J. Meeus,
+#              Astronomical Algorithms (1991), ch. 12 and 21, computed with NumPy for all the times at once
+#
+# From 1990 to 2025, the sub-points of the two engines are less than 0.005 degree apart, half the 0.01 degree
+# resolution of the advisories. The analytic engine takes UT1 to be UTC, and Terrestrial Time to be UTC + 69.184 s;
+# for later dates, Skyfield predicts UT1 - UTC, and the engines drift apart by up to 0.015 degree in longitude by
+# 2050.
+#
+# Sub-points are kept by minute, the resolution of the advisories, and engine.
+#
+import logging
+import os
+import threading
+
+from . import cache
+from . import xmlConfig as des
+
+_Logger = logging.getLogger(__name__)
+#
+# Timescale, Earth and Sun of the kernel, once loaded
+_ephemeris = None
+_lock = threading.Lock()
+#
+# Sub-points found, by (year, month, day, hour, minute, engine)
+_subpoints = cache.LRUCache(maxsize=4096)
+
+
+def ephemeris():
+    """Returns tuple (timescale, earth, sun) of Skyfield objects, loading the kernel de421.bsp in the first call"""
+
+    global _ephemeris
+    if _ephemeris is not None:
+        return _ephemeris
+
+    with _lock:
+        if _ephemeris is None:
+            try:
+                import skyfield
+                from skyfield.api import Loader
+
+                load = Loader(os.path.join(skyfield.__path__[0], 'bsp_files'), verbose=False)
+                timescale = load.timescale()
+                #
+                # Open NAIF/JPL/NASA SPICE Kernel
+                planets = load('de421.bsp')
+                _ephemeris = timescale, planets['earth'], planets['sun']
+
+            except Exception:
+                _Logger.exception('Unable to load/initialize Skyfield ephemeris file.')
+                raise
+
+    return _ephemeris
+
+
+def _skyfield(years, months, days, hours, minutes):
+
+    from skyfield.toposlib import wgs84
+
+    timescale, earth, sun = ephemeris()
+    position = wgs84.geographic_position_of((sun - earth).at(timescale.utc(years, months, days, hours, minutes)))
+    return position.latitude.degrees, position.longitude.degrees
+
+
+def analytic(years, months, days, hours, minutes):
+    """Returns tuple (latitudes, longitudes) of NumPy arrays, in degrees, of the solar sub-points at times, UTC,
+       computed with the analytic engine
+
+       years, months, days, hours, minutes = sequences or NumPy arrays of integers, of the same length (required)"""
+
+    import numpy as np
+
+    years, months = np.asarray(years), np.asarray(months)
+    #
+    # Julian Day, UT, from the Gregorian calendar date
+    a = (14 - months) // 12
+    y = years + 4800 - a
+    m = months + 12 * a - 3
+    jd = (np.asarray(days) + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045.5 +
+          (np.asarray(hours) * 60 + np.asarray(minutes)) / 1440.)
+    #
+    # Julian centuries of Terrestrial Time since 1900 January 0.5 and since J2000.0
+    T0 = (jd + 69.184 / 86400. - 2415020.) / 36525.
+    T = T0 - 1.
+    #
+    # Geometric longitude of the Sun, mean equinox of date
+    L = 279.69668 + 36000.76892 * T0 + 0.0003025 * T0 * T0
+    M = np.radians(358.47583 + 35999.04975 * T0 - 0.000150 * T0 * T0 - 0.0000033 * T0 * T0 * T0)
+    C = ((1.919460 - 0.004789 * T0 - 0.000014 * T0 * T0) * np.sin(M) + (0.020094 - 0.000100 * T0) * np.sin(2. * M) +
+         0.000293 * np.sin(3. * M))
+    perturbations = (0.00134 * np.cos(np.radians(153.23 + 22518.7541 * T0)) +
+                     0.00154 * np.cos(np.radians(216.57 + 45037.5082 * T0)) +
+                     0.00200 * np.cos(np.radians(312.69 + 32964.3577 * T0)) +
+                     0.00179 * np.sin(np.radians(350.74 + 445267.1142 * T0 - 0.00144 * T0 * T0)) +
+                     0.00178 * np.sin(np.radians(231.19 + 20.20 * T0)))
+    #
+    # Nutation in longitude and obliquity
+    omega = np.radians(125.04452 - 1934.136261 * T)
+    sun = np.radians(2. * (280.4665 + 36000.7698 * T))
+    moon = np.radians(2. * (218.3165 + 481267.8813 * T))
+    nutation = (-17.20 * np.sin(omega) - 1.32 * np.sin(sun) - 0.23 * np.sin(moon) + 0.21 * np.sin(2. * omega)) / 3600.
+    obliquity = np.radians(23.439291111 - (46.8150 * T + 0.00059 * T * T - 0.001813 * T * T * T) / 3600. +
+                           (9.20 * np.cos(omega) + 0.57 * np.cos(sun) + 0.10 * np.cos(moon) -
+                            0.09 * np.cos(2. * omega)) / 3600.)
+    #
+    # Declination and right ascension, true equator and equinox of date
+    eclipticLongitude = np.radians(L + C + perturbations + nutation)
+    declination = np.degrees(np.arcsin(np.sin(obliquity) * np.sin(eclipticLongitude)))
+    rightAscension = np.degrees(np.arctan2(np.cos(obliquity) * np.sin(eclipticLongitude), np.cos(eclipticLongitude)))
+    #
+    # Apparent sidereal time at Greenwich
+    elapsed = jd - 2451545.
+    centuries = elapsed / 36525.
+    siderealTime = (280.46061837 + 360.98564736629 * elapsed + 0.000387933 * centuries * centuries -
+                    centuries * centuries * centuries / 38710000. + nutation * np.cos(obliquity))
+
+    return declination, (rightAscension - siderealTime + 180.) % 360. - 180.
+
+
+_ENGINES = {'skyfield': _skyfield, 'analytic': analytic}
+ENGINES = tuple(_ENGINES)
+
+
+def subpoints(times, engine=None):
+    """Returns list of tuples (latitude, longitude), in degrees, of the solar sub-points at times, UTC. The sub-points
+       not kept already are found in one call to the engine.
+
+       times = sequence of tuples (year, month, day, hour, minute) (required)
+       engine = 'skyfield' or 'analytic' (optional, see xmlConfig.py)"""
+
+    engine = engine or des.SOLAR_ENGINE
+    keys = [tuple(time) + (engine,) for time in times]
+    found = {}
+    for key in keys:
+        try:
+            found[key] = _subpoints[key]
+        except KeyError:
+            pass
+
+    missing = sorted(set(keys).difference(found))
+    if missing:
+        latitudes, longitudes = _ENGINES[engine](*zip(*[key[:5] for key in missing]))
+        for key, latitude, longitude in zip(missing, latitudes, longitudes):
+            _subpoints[key] = found[key] = (float(latitude), float(longitude))
+
+    return [found[key] for key in keys]
+
+
+def subpoint(year, month, day, hour, minute, engine=None):
+    """Returns tuple (latitude, longitude), in degrees, of the solar sub-point at a time, UTC
+
+       year, month, day, hour, minute = time of the sub-point (required)
+       engine = 'skyfield' or 'analytic' (optional, see xmlConfig.py)"""
+
+    engine = engine or des.SOLAR_ENGINE
+    key = (year, month, day, hour, minute, engine)
+    try:
+        return _subpoints[key]
+    except KeyError:
+        pass
+
+    latitudes, longitudes = _ENGINES[engine]([year], [month], [day], [hour], [minute])
+    _subpoints[key] = result = (float(latitudes[0]), float(longitudes[0]))
+    return result
+
+
+def stats():
+    """Returns dictionary of the counters of the sub-points cache, see LRUCache.stats(), and whether the kernel is
+       loaded"""
+
+    return dict(_subpoints.stats(), loaded=_ephemeris is not None)
@@ -51,7 +51,13 @@ __author__ = 'Christophe Delord'
 __email__ = 'cdelord.fr'
 __url__ = 'http://cdelord.fr/tpg/'
 
+import bisect
+import hashlib
+import importlib
+import marshal
+import os
 import re
+import types
 
 try:
     sre_parse = re._parser
@@ -187,6 +193,47 @@ class LexerOptions:
         """
         return expr
 
+    @property
+    def line(self):
+        """ line of the current position, computed from the newline table of the input string
+        """
+        return self.lines.line_column(self.pos)[0]
+
+    @property
+    def column(self):
+        """ column of the current position, computed from the newline table of the input string
+        """
+        return self.lines.line_column(self.pos)[1]
+
+
+class Lines:
+    """ Lines(input)
+
+    Lines computes the line and column of positions in an input string on demand.
+    The offsets of the newlines are searched for the first time they are needed.
+
+    Attributes:
+        input    : input string
+        newlines : sorted list of the positions of the newlines in input, or None until needed
+    """
+
+    __slots__ = ('input', 'newlines')
+
+    def __init__(self, input):
+        self.input = input
+        self.newlines = None
+
+    def line_column(self, pos):
+        """ return the line and column (starting at 1) of a position in the input string
+        """
+        newlines = self.newlines
+        if newlines is None:
+            newlines = self.newlines = [nl.start() for nl in newline_re.finditer(self.input)]
+        if not newlines:
+            return 1, pos + 1
+        n = bisect.bisect_left(newlines, pos)
+        return n + 1, pos - (n and newlines[n - 1] + 1) + 1
+
 
 class NamedGroupLexer(LexerOptions):
     r""" NamedGroupLexer(word_bounded, compile_options)
@@ -267,6 +314,7 @@ class NamedGroupLexer(LexerOptions):
             input : input string to be parsed
         """
         self.input = input
+        self.lines = Lines(input)
         self.max_pos = 0
         self.last_token = None
         self.build()
@@ -283,11 +331,9 @@ class NamedGroupLexer(LexerOptions):
         """
         if token is None:
             self.pos = 0
-            self.line, self.column = 1, 1
             self.cur_token = None
         else:
             self.pos = token.stop
-            self.line, self.column = token.end_line, token.end_column
             self.cur_token = token
 
     def next_token(self):
@@ -301,7 +347,7 @@ class NamedGroupLexer(LexerOptions):
             prev_stop = self.cur_token.stop
         while True:
             if self.pos >= len(self.input):
-                self.cur_token = EOFToken(self.line, self.column, self.pos, prev_stop)
+                self.cur_token = EOFToken(self.pos, prev_stop, self.lines)
                 return self.cur_token
             tok = self.token_re.match(self.input, self.pos)
             if tok:
@@ -314,15 +360,8 @@ class NamedGroupLexer(LexerOptions):
                     raise LexicalError((self.line, self.column), "Lexical error in %s" % text)
                 start, stop = tok.span()
                 self.pos = stop
-                tok_line, tok_column = self.line, self.column
-                if '\n' in text:
-                    self.line += text.count('\n')
-                    self.column = len(text) - text.rfind('\n')
-                else:
-                    self.column += len(text)
                 if real_token:
-                    self.cur_token = Token(name, text, value, tok_line, tok_column,
-                                           self.line, self.column, start, stop, prev_stop)
+                    self.cur_token = Token(name, text, value, start, stop, prev_stop, self.lines)
                     if self.pos > self.max_pos:
                         self.max_pos = self.pos
                         self.last_token = self.cur_token
@@ -423,6 +462,7 @@ class Lexer(NamedGroupLexer):
             input : input string to be parsed
         """
         self.input = input
+        self.lines = Lines(input)
         self.max_pos = 0
         self.last_token = None
         self.back(None)
@@ -439,7 +479,7 @@ class Lexer(NamedGroupLexer):
             prev_stop = self.cur_token.stop
         while True:
             if self.pos >= len(self.input):
-                self.cur_token = EOFToken(self.line, self.column, self.pos, prev_stop)
+                self.cur_token = EOFToken(self.pos, prev_stop, self.lines)
                 return self.cur_token
             tok = None
             text = ""
@@ -460,15 +500,8 @@ class Lexer(NamedGroupLexer):
                     raise LexicalError((self.line, self.column), "Lexical error in %s" % text)
                 start, stop = tok.span()
                 self.pos = stop
-                tok_line, tok_column = self.line, self.column
-                if '\n' in text:
-                    self.line += text.count('\n')
-                    self.column = len(text) - text.rfind('\n')
-                else:
-                    self.column += len(text)
                 if real_token:
-                    self.cur_token = Token(name, text, value, tok_line, tok_column,
-                                           self.line, self.column, start, stop, prev_stop)
+                    self.cur_token = Token(name, text, value, start, stop, prev_stop, self.lines)
                     if self.pos > self.max_pos:
                         self.max_pos = self.pos
                         self.last_token = self.cur_token
@@ -519,6 +552,7 @@ class CacheNamedGroupLexer(NamedGroupLexer):
         """
         self.cache = []
         self.input = input
+        self.lines = Lines(input)
         self.max_pos = 0
         self.last_token = None
         self.build()
@@ -545,7 +579,6 @@ class CacheNamedGroupLexer(NamedGroupLexer):
             index = self.cur_token.index + 1
         token = self.cache[index]
         self.pos = token.stop
-        self.line, self.column = token.line, token.column
         self.cur_token = token
         if self.pos > self.max_pos:
             self.max_pos = self.pos
@@ -591,6 +624,7 @@ class CacheLexer(Lexer):
         """
         self.cache = []
         self.input = input
+        self.lines = Lines(input)
         self.max_pos = 0
         self.last_token = None
         self.back(None)
@@ -616,7 +650,6 @@ class CacheLexer(Lexer):
             index = self.cur_token.index + 1
         token = self.cache[index]
         self.pos = token.stop
-        self.line, self.column = token.line, token.column
         self.cur_token = token
         if self.pos > self.max_pos:
             self.max_pos = self.pos
@@ -625,11 +658,13 @@ class CacheLexer(Lexer):
 
 
 class ContextSensitiveLexer(LexerOptions):
-    r""" ContextSensitiveLexer(word_bounded, compile_options)
+    r""" ContextSensitiveLexer(word_bounded, compile_options, memoize=False)
 
     ContextSensitiveLexer is a TPG lexer:
         - context sensitive means that each regular expression is matched when required by the parser.
           Different tokens can be found at the same position if the parser uses different grammar rules.
+        - if memoize is True, the outcome of matching a token or skipping separators at a position
+          is remembered so backtracking does not match the same regular expressions again.
 
     Attributes:
         tokens     : dictionnary name -> (regexp, value)
@@ -640,6 +675,8 @@ class ContextSensitiveLexer(LexerOptions):
                         name is a token name
                         regexp is the regular expression of the token
                         value is a function that computes the value of a token from its text
+        predictors : list of regexp telling which alternatives of a choice point may start at a position
+        memoize    : True to remember the outcome of token matches and separator skips
     Once the lexer is started more attributes are defined:
         input      : input string being parsed
         max_pos    : maximum position reached in the input string
@@ -648,12 +685,22 @@ class ContextSensitiveLexer(LexerOptions):
         line       : line of the current token
         column     : column of the current token
         cur_token  : current token
+        matches    : dictionnary (name, position) -> (start, stop) or None when the token does not match
+        skips      : dictionnary position -> (position after the separators, regex_calls)
+        regex_calls: number of regular expressions matched against the input
+        regex_saved: number of regular expression matches answered from matches and skips
     """
 
-    def __init__(self, wb, compile_options):
+    # Group names and back references can not be combined in a predictor
+    named_group_re = re.compile(r"(?<!\\)\(\?P<\w+>")
+    back_reference_re = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+    def __init__(self, wb, compile_options, memoize=False):
         LexerOptions.__init__(self, wb, compile_options)
         self.tokens = {}                # name -> (regexp, value)
         self.separators = []            # [(name, regexp, value)]
+        self.predictors = []            # [regexp]
+        self.memoize = memoize
 
     def def_token(self, name, expr, value=_id):
         """ add a new token to the lexer
@@ -692,6 +739,46 @@ class ContextSensitiveLexer(LexerOptions):
         else:
             raise SemanticError("Duplicate token definition (%s)" % name)
 
+    def def_predictor(self, alternatives):
+        """ add a new predictor to the lexer
+
+        A predictor tells in a single regular expression match which
+        alternatives of a choice point may start at the current position.
+
+        Parameters:
+            alternatives : list of token name lists, one per alternative, or
+                           None for an alternative that may start anywhere.
+                           An alternative is named aN where N is its index.
+                           A single alternative is not named.
+        """
+        exprs = []
+        for names in alternatives:
+            patterns = [self.tokens[name][0].pattern for name in dict.fromkeys(names or ())]
+            if names is None or any(self.back_reference_re.search(pattern) for pattern in patterns):
+                exprs.append("")
+            else:
+                patterns = ["(?:%s)" % self.named_group_re.sub("(?:", pattern) for pattern in patterns]
+                exprs.append("(?=%s)" % "|".join(patterns))
+        if len(exprs) > 1:
+            exprs = ["(?:%s(?P<a%d>)|)" % (expr, n) for n, expr in enumerate(exprs)]
+        try:
+            predictor = self.re_compile("".join(exprs))
+        except re.error:
+            # Then every alternative may start anywhere
+            predictor = self.re_compile("".join(["(?P<a%d>)" % n for n in range(len(exprs))]) if len(exprs) > 1 else "")
+        self.predictors.append(predictor)
+
+    def predict(self, index):
+        """ match a predictor at the current position
+
+        Parameters:
+            index : index of the predictor in the order of definition
+
+        Returns the match object, or None if the single alternative of the predictor can not start here.
+        """
+        self.regex_calls += 1
+        return self.predictors[index].match(self.input, self.pos)
+
     def start(self, input):
         """ start a lexical analysis
 
@@ -699,8 +786,13 @@ class ContextSensitiveLexer(LexerOptions):
             input : input string to be parsed
         """
         self.input = input
+        self.lines = Lines(input)
         self.max_pos = 0
         self.last_token = None
+        self.matches = {}
+        self.skips = {}
+        self.regex_calls = 0
+        self.regex_saved = 0
         self.back(None)
 
     def eof(self):
@@ -713,11 +805,9 @@ class ContextSensitiveLexer(LexerOptions):
         """
         if token is None:
             self.pos = 0
-            self.line, self.column = 1, 1
-            self.cur_token = SOFToken()
+            self.cur_token = SOFToken(self.lines)
         else:
             self.pos = token.stop
-            self.line, self.column = token.end_line, token.end_column
             self.cur_token = token
         self.eat_separators()
         self.cur_token.next_start = self.pos
@@ -725,47 +815,67 @@ class ContextSensitiveLexer(LexerOptions):
     def eat_separators(self):
         """ skip separators in the input string from the current position
         """
+        if self.memoize:
+            start = self.pos
+            try:
+                self.pos, calls = self.skips[start]
+                self.regex_saved += calls
+            except KeyError:
+                calls = self.regex_calls
+                self._eat_separators()
+                self.skips[start] = self.pos, self.regex_calls - calls
+        else:
+            self._eat_separators()
+
+    def _eat_separators(self):
         done = False
         while not done:
             done = True
             for name, regexp, value in self.separators:
                 sep = regexp.match(self.input, self.pos)
+                self.regex_calls += 1
                 if sep:
                     start, stop = sep.span()
-                    text = self.input[start:stop]
-                    value = value(text)
+                    value(self.input[start:stop])
                     self.pos = stop
-                    if '\n' in text:
-                        self.line += text.count('\n')
-                        self.column = len(text) - text.rfind('\n')
-                    else:
-                        self.column += len(text)
                     done = False
 
+    def match(self, name):
+        """ return the (start, stop) span of the token name at the current position or None
+        """
+        regexp = self.tokens[name][0]
+        if self.memoize:
+            key = name, self.pos
+            try:
+                span = self.matches[key]
+                self.regex_saved += 1
+            except KeyError:
+                tok = regexp.match(self.input, self.pos)
+                self.regex_calls += 1
+                span = self.matches[key] = tok and tok.span()
+        else:
+            tok = regexp.match(self.input, self.pos)
+            self.regex_calls += 1
+            span = tok and tok.span()
+        return span
+
     def eat(self, name):
         """ return the next token value if it matches the expected token name
         """
-        regexp, value = self.tokens[name]
-        tok = regexp.match(self.input, self.pos)
-        if tok is None:
+        span = self.match(name)
+        if span is None:
             raise WrongToken
         else:
+            value = self.tokens[name][1]
             if self.cur_token is None:
                 prev_stop = 0
             else:
                 prev_stop = self.cur_token.stop
-            start, stop = tok.span()
+            start, stop = span
             text = self.input[start:stop]
             value = value(text)
             self.pos = stop
-            tok_line, tok_column = self.line, self.column
-            if '\n' in text:
-                self.line += text.count('\n')
-                self.column = len(text) - text.rfind('\n')
-            else:
-                self.column += len(text)
-            self.cur_token = Token(name, text, value, tok_line, tok_column,
-                                   self.line, self.column, start, stop, prev_stop)
+            self.cur_token = Token(name, text, value, start, stop, prev_stop, self.lines)
             if self.pos > self.max_pos:
                 self.max_pos = self.pos
                 self.last_token = self.cur_token
@@ -790,8 +900,82 @@ class ContextSensitiveLexer(LexerOptions):
         return self.input[start:stop]
 
 
+class PreTokenizedLexer(ContextSensitiveLexer):
+    r""" PreTokenizedLexer(word_bounded, compile_options, memoize=False)
+
+    PreTokenizedLexer is a ContextSensitiveLexer for input strings made of groups separated by blanks:
+        - the input string is split into groups once when the lexer starts.
+        - each group is classified by a single regular expression, the alternation of all the tokens,
+          giving the first token that matches at the start of the group. A token may span several groups.
+        - eating the token the group was classified as, and skipping the blanks that follow a group, are
+          table lookups. Other tokens, or tokens not starting a group, are matched as by ContextSensitiveLexer,
+          so the parser still finds different tokens at the same position if it uses different grammar rules.
+    The separators shall match blanks only.
+
+    Attributes (in addition to those of ContextSensitiveLexer):
+        classifier : regexp classifying the groups
+        classes    : list of the token names of the alternatives of classifier
+    Once the lexer is started more attributes are defined:
+        groups     : dictionnary position -> (name, (start, stop)) of the token found at the start of a group
+        blanks     : dictionnary position -> start of the next group after the blanks at the position
+    """
+
+    group_re = re.compile(r"\S+")
+
+    def __init__(self, wb, compile_options, memoize=False):
+        ContextSensitiveLexer.__init__(self, wb, compile_options, memoize)
+        self.classifier = None
+
+    def def_classifier(self):
+        """ build the regular expression classifying the groups from the token definitions
+
+        Tokens with back references are left out and only matched as by ContextSensitiveLexer.
+        """
+        exprs = []
+        self.classes = []
+        for name, (regexp, value) in self.tokens.items():
+            if not self.back_reference_re.search(regexp.pattern):
+                exprs.append("(?P<t%d>%s)" % (len(self.classes), self.named_group_re.sub("(?:", regexp.pattern)))
+                self.classes.append(name)
+        self.classifier = self.re_compile("|".join(exprs) or "(?!)")
+
+    def start(self, input):
+        """ start a lexical analysis
+
+        Parameters:
+            input : input string to be parsed
+        """
+        if self.classifier is None:
+            self.def_classifier()
+        spans = [group.span() for group in self.group_re.finditer(input)]
+        self.groups = {}
+        for start, stop in spans:
+            tok = self.classifier.match(input, start)
+            if tok is not None:
+                self.groups[start] = self.classes[int(tok.lastgroup[1:])], tok.span()
+        self.blanks = dict(zip([0] + [stop for start, stop in spans], [start for start, stop in spans] + [len(input)]))
+        ContextSensitiveLexer.start(self, input)
+        self.regex_calls = len(spans)
+
+    def eat_separators(self):
+        """ skip blanks in the input string from the current position
+        """
+        try:
+            self.pos = self.blanks[self.pos]
+        except KeyError:
+            ContextSensitiveLexer.eat_separators(self)
+
+    def match(self, name):
+        """ return the (start, stop) span of the token name at the current position or None
+        """
+        group = self.groups.get(self.pos)
+        if group is not None and group[0] == name:
+            return group[1]
+        return ContextSensitiveLexer.match(self, name)
+
+
 class Token:
-    """ Token(name, text, value, line, column, end_line, end_column, start, stop, prev_stop)
+    """ Token(name, text, value, start, stop, prev_stop, lines)
 
     Token object used by lexers
 
@@ -806,16 +990,36 @@ class Token:
         start      : position of the start in the input string of the token
         stop       : position of the end in the input string of the token
         prev_stop  : position of the end of the previous token
+        lines      : Lines object of the input string computing line and column numbers on demand
+        next_start : position of the next token (ContextSensitiveLexer only)
+        index      : index of the token in the token list (CacheNamedGroupLexer and CacheLexer only)
     """
 
-    def __init__(self, name, text, value, line, column, end_line, end_column, start, stop, prev_stop):
+    __slots__ = ('name', 'text', 'value', 'start', 'stop', 'prev_stop', 'lines', 'next_start', 'index')
+
+    def __init__(self, name, text, value, start, stop, prev_stop, lines):
         self.name = name
         self.text = text
         self.value = value
-        self.line, self.column = line, column
-        self.end_line, self.end_column = end_line, end_column
         self.start, self.stop = start, stop
         self.prev_stop = prev_stop
+        self.lines = lines
+
+    @property
+    def line(self):
+        return self.lines.line_column(self.start)[0]
+
+    @property
+    def column(self):
+        return self.lines.line_column(self.start)[1]
+
+    @property
+    def end_line(self):
+        return self.lines.line_column(self.stop)[0]
+
+    @property
+    def end_column(self):
+        return self.lines.line_column(self.stop)[1]
 
     def match(self, name):
         """ return True is the token name is the name of the expected token
@@ -830,7 +1034,7 @@ class Token:
 
 
 class EOFToken(Token):
-    """ EOFToken(line, column, pos, prev_stop)
+    """ EOFToken(pos, prev_stop, lines)
 
     Token for the end of file (end of the input string).
     EOFToken is a Token object.
@@ -846,14 +1050,17 @@ class EOFToken(Token):
         start      : position of the start in the input string of the token
         stop       : position of the end in the input string of the token
         prev_stop  : position of the end of the previous token
+        lines      : Lines object of the input string computing line and column numbers on demand
     """
 
-    def __init__(self, line, column, pos, prev_stop):
-        Token.__init__(self, "EOF", "EOF", None, line, column, line, column, pos, pos, prev_stop)
+    __slots__ = ()
+
+    def __init__(self, pos, prev_stop, lines):
+        Token.__init__(self, "EOF", "EOF", None, pos, pos, prev_stop, lines)
 
 
 class SOFToken(Token):
-    """ SOFToken()
+    """ SOFToken(lines=None)
 
     Token for the start of file (start of the input string).
     SOFToken is a Token object.
@@ -869,10 +1076,13 @@ class SOFToken(Token):
         start      : position of the start in the input string of the token
         stop       : position of the end in the input string of the token
         prev_stop  : position of the end of the previous token
+        lines      : Lines object of the input string computing line and column numbers on demand
     """
 
-    def __init__(self):
-        Token.__init__(self, "SOF", "SOF", None, 1, 1, 1, 1, 0, 0, 0)
+    __slots__ = ()
+
+    def __init__(self, lines=None):
+        Token.__init__(self, "SOF", "SOF", None, 0, 0, 0, lines or Lines(""))
 
 
 class Py:
@@ -885,6 +1095,163 @@ class Py:
         return eval(item % self, self.globals, self.locals)
 
 
+class GrammarCache:
+    """ GrammarCache(directory=None)
+
+    GrammarCache keeps the code generated from a grammar on disk so that
+    a grammar is translated by TPGParser only when its text, the TPG version
+    or the Python version changes.
+
+    Each parser class gets one file holding its key and the marshalled
+    code objects of its rule methods. By default the file is written in the
+    __pycache__ directory next to the module defining the parser. The
+    TPG_CACHE_DIR environment variable selects another directory; an empty
+    value disables the cache. Like byte-code files, nothing is written when
+    sys.dont_write_bytecode is set or the directory is not writable.
+
+    Attributes:
+        directory : directory holding the cache files, None for the default
+    """
+
+    def __init__(self, directory=None):
+        self.directory = os.environ.get('TPG_CACHE_DIR', directory)
+
+    def key(self, grammar):
+        """ return the key identifying the code objects generated from a grammar
+        """
+        return '%s-%s' % (grammar_key(grammar), sys.implementation.cache_tag)
+
+    def path(self, name, env):
+        """ return the cache file path of the parser class name defined in the module env, or None
+        """
+        if self.directory == '':
+            return None
+        try:
+            module = env['__name__']
+            directory = self.directory or os.path.join(os.path.dirname(os.path.abspath(env['__file__'])),
+                                                       '__pycache__')
+        except (KeyError, TypeError):
+            return None
+        return os.path.join(directory, '%s.%s.%s.tpg' % (module, name, sys.implementation.cache_tag))
+
+    def load(self, path, key):
+        """ return the list of (attribute, code object) stored in path if its key matches, or None
+        """
+        try:
+            with open(path, 'rb') as fh:
+                stored_key, rules = marshal.load(fh)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if stored_key != key:
+            return None
+        return rules
+
+    def store(self, path, key, rules):
+        """ write the list of (attribute, code object) rules under key to path
+        """
+        if sys.dont_write_bytecode:
+            return
+        tmp = '%s.%d' % (path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as fh:
+                marshal.dump((key, rules), fh)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+# Digest of this module, whose code generator may change without __version__
+_generator_digest = None
+
+
+def generator_digest():
+    """ return the digest of the source of this module, or its version if the source can not be read
+    """
+    global _generator_digest
+    if _generator_digest is None:
+        try:
+            with open(__file__, 'rb') as fh:
+                _generator_digest = hashlib.sha256(fh.read()).hexdigest()
+        except OSError:
+            _generator_digest = __version__
+    return _generator_digest
+
+
+def grammar_key(grammar):
+    """ return the key identifying the source code TPG generates from a grammar
+
+    The key covers the grammar, the version of TPG and the source of its code
+    generator, so that the rules cached or compiled ahead of time by another
+    generator are translated again.
+    """
+    text = '\0'.join((__version__, generator_digest(), grammar))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _bind(attribute, code, env):
+    """ execute the code object of a rule in env and return the attribute it defines
+    """
+    local_namespace = {}
+    exec(code, env, local_namespace)
+    return local_namespace[attribute]
+
+
+def _rebind(function, env):
+    """ return a copy of function whose globals are env
+    """
+    code = types.FunctionType(function.__code__, env, function.__name__, function.__defaults__,
+                              function.__closure__)
+    code.__kwdefaults__ = function.__kwdefaults__
+    code.__doc__ = function.__doc__
+    return code
+
+
+def compiled_module_name(module):
+    """ return the name of the module holding the compiled grammars of the parsers defined in module
+    """
+    return '%s_tpg' % module
+
+
+def _compiled_rules(name, grammar, env):
+    """ return the rules of the parser class name compiled ahead of time by 'compile', or None
+
+    The compiled rules are ignored when they were not generated from grammar.
+    """
+    try:
+        compiled = importlib.import_module(compiled_module_name(env['__name__']))
+        key, functions = compiled.__grammars__[name]
+    except (KeyError, ImportError, AttributeError):
+        return None
+    if key != grammar_key(grammar):
+        return None
+    return [(attribute, _rebind(function, env)) for attribute, function in functions.items()]
+
+
+def _generated_rules(name, grammar, env):
+    """ return the rules of the parser class name generated from grammar in the module env
+
+    The rules come from the module compiled ahead of time if it is up to date,
+    then from GrammarCache. The grammar is translated by TPGParser otherwise.
+    """
+    rules = _compiled_rules(name, grammar, env)
+    if rules is not None:
+        return rules
+    cache = GrammarCache()
+    key = cache.key(grammar)
+    path = cache.path(name, env)
+    codes = path and cache.load(path, key)
+    if not codes:
+        parser = TPGParser(env)
+        codes = [(attribute, compile(source, '<string>', 'exec')) for attribute, source, code in parser(grammar)]
+        if path:
+            cache.store(path, key, codes)
+    return [(attribute, _bind(attribute, code, env)) for attribute, code in codes]
+
+
 class ParserMetaClass(type):
     """ ParserMetaClass is the metaclass of Parser objects.
 
@@ -892,6 +1259,9 @@ class ParserMetaClass(type):
     a grammar. This grammar is parsed by TPGParser and the generated code
     is added to the class.
     If the class doesn't have a doc string, nothing is generated
+
+    The grammar is not parsed when the generated code is found in a module
+    written by 'python -m gifts.common.tpg compile' or kept by GrammarCache.
     """
 
     def __init__(cls, name, bases, dict):
@@ -901,8 +1271,7 @@ class ParserMetaClass(type):
         except KeyError:
             pass
         else:
-            parser = TPGParser(sys._getframe(1).f_globals)
-            for attribute, source, code in parser(grammar):
+            for attribute, code in _generated_rules(name, grammar, sys._getframe(1).f_globals):
                 setattr(cls, attribute, code)
 
 
@@ -913,6 +1282,18 @@ else:
         __metaclass__ = ParserMetaClass
 
 
+def shallow_copy(obj):
+    """ return a shallow copy of obj whose methods bound to obj in its attributes are bound to the copy
+    """
+    clone = object.__new__(obj.__class__)
+    attributes = clone.__dict__
+    for name, value in vars(obj).items():
+        if isinstance(value, types.MethodType) and value.__self__ is obj:
+            value = types.MethodType(value.__func__, clone)
+        attributes[name] = value
+    return clone
+
+
 class Parser(_Parser):
     # Parser is the base class for parsers.
     #
@@ -965,6 +1346,34 @@ class Parser(_Parser):
         token = self.lexer.eat(name)
         return token.value
 
+    def missCSL(self, names):
+        """ called instead of eatCSL when a choice point predicts that tokens do not match
+
+        A parser generated with the predict option skips the alternatives that
+        can not start at the current position. It calls missCSL with the names
+        of the tokens it would have tried in vain, in the order eatCSL would
+        have been called. The default does nothing.
+
+        Parameters:
+            names : tuple of token names
+        """
+        pass
+
+    def context(self):
+        """ return a copy of the parser with a lexer of its own
+
+        The copy shares the attributes of the parser, including the tables
+        of the lexer, but the attributes set while parsing are set on the copy
+        and the methods bound to the parser in its attributes, like eat, are
+        bound to the copy.
+        A parser whose actions store their results in self can thus be used
+        by several threads at once provided each input is parsed by a new
+        context.
+        """
+        context = shallow_copy(self)
+        context.lexer = shallow_copy(self.lexer)
+        return context
+
     def __call__(self, input, *args, **kws):
         """ parse a string starting from the default axiom
 
@@ -1046,6 +1455,15 @@ class Parser(_Parser):
         """
         return self.lexer.extract(start, stop)
 
+    def stats(self):
+        """ return the counters of the last parse
+
+        regex_calls : number of regular expressions matched by the lexer
+        regex_saved : number of regular expression matches answered by the lexer memo tables
+        """
+        return {'regex_calls': getattr(self.lexer, 'regex_calls', 0),
+                'regex_saved': getattr(self.lexer, 'regex_saved', 0)}
+
     def check(self, cond):
         """ check a condition and backtrack when it is False
 
@@ -1142,8 +1560,7 @@ class VerboseParser(Parser):
         except WrongToken:
             if self.verbose >= 2:
                 token = Token("???", self.lexer.input[self.lexer.pos:self.lexer.pos + 10].replace('\n', ' '), "???",
-                              self.lexer.line, self.lexer.column, self.lexer.line, self.lexer.column, self.lexer.pos,
-                              self.lexer.pos, self.lexer.pos)
+                              self.lexer.pos, self.lexer.pos, self.lexer.pos, self.lexer.lines)
                 sys.stderr.write(self.token_info(token, "!=", name) + "\n")
             raise
 
@@ -1182,6 +1599,7 @@ class VerboseParser(Parser):
 
 
 blank_line_re = re.compile(r"^\s*$")
+newline_re = re.compile(r"\n")
 indent_re = re.compile(r"^\s*")
 
 
@@ -1193,6 +1611,7 @@ class tpg:
     CacheNamedGroupLexer = CacheNamedGroupLexer
     CacheLexer = CacheLexer
     ContextSensitiveLexer = ContextSensitiveLexer
+    PreTokenizedLexer = PreTokenizedLexer
     Parser = Parser
     WrongToken = WrongToken
     re = re
@@ -1783,6 +2202,7 @@ class TPGParser(tpg.Parser):
                        'CacheNamedGroupLexer': CacheNamedGroupLexer,
                        'CacheLexer': CacheLexer,
                        'ContextSensitiveLexer': ContextSensitiveLexer,
+                       'PreTokenizedLexer': PreTokenizedLexer,
                        }, 'NamedGroupLexer'),
             'word_boundary': ({'True': True, 'False': False}, 'True'),
             # 'indent':           ({'True': True, 'False': False},                        'False'),
@@ -1792,6 +2212,8 @@ class TPGParser(tpg.Parser):
             'lexer_dotall': ({'True': "DOTALL", 'False': False}, 'False'),
             'lexer_verbose': ({'True': "VERBOSE", 'False': False}, 'False'),
             'lexer_unicode': ({'True': "UNICODE", 'False': False}, 'False'),
+            'lexer_memoize': ({'True': True, 'False': False}, 'False'),
+            'predict': ({'True': True, 'False': False}, 'False'),
         }
 
         def __init__(self, parser):
@@ -1831,6 +2253,10 @@ class TPGParser(tpg.Parser):
         def empty(self):
             return False
 
+        def first(self, rules, visiting):
+            # Actions, checks and marks may have side effects: never skip them
+            return None
+
     class Code(NotEmpty):
         def __init__(self, code):
             if code.startswith('$'):
@@ -1903,12 +2329,36 @@ class TPGParser(tpg.Parser):
             for rule in self:
                 rule.links_symbols_to_tokens(tokens)
 
-        def gen_code(self):
+        def gen_code(self, predictors=None):
             for rule in self:
-                yield rule.gen_code()
+                yield rule.gen_code(predictors)
+
+    class Predictors(list):
+        """ choice points of the rules generated with the predict option
+
+        Each item lists, for every alternative of a choice point, the names of
+        the tokens the alternative tries when none of them matches (its FIRST
+        set), or None when the alternative can not be predicted.
+        """
+
+        def __init__(self, rules):
+            list.__init__(self)
+            self.rules = dict([(rule.head.name, rule) for rule in rules])
+
+        def first(self, expr):
+            """ return the FIRST set of expr if it can be skipped when none of its tokens match, else None """
+            first = expr.first(self.rules, ())
+            if first is not None and not first[1]:
+                return first[0]
+
+        def add(self, alternatives):
+            self.append(alternatives)
+            return len(self) - 1
 
     class Rule:
         class Counters(dict):
+            predictors = None
+
             def __call__(self, name):
                 n = self.get(name, 1)
                 self[name] = n + 1
@@ -1928,8 +2378,9 @@ class TPGParser(tpg.Parser):
             else:
                 self.body.links_symbols_to_tokens(tokens)
 
-        def gen_code(self):
+        def gen_code(self, predictors=None):
             counters = self.Counters()
+            counters.predictors = predictors
             return self.head.name, [
                 self.head.gen_def(),
                 tab + 'r""" ``%s -> %s ;`` """' % (self.head.gen_doc(self), self.body.gen_doc(self)),
@@ -1962,6 +2413,14 @@ class TPGParser(tpg.Parser):
         def gen_ret(self, indent):
             return self.ret and indent + "return %s" % self.ret.gen_code() or ()
 
+        def first(self, rules, visiting):
+            if self.token is not None:
+                return (self.name,), False
+            rule = rules.get(self.name)
+            if rule is None or self.args or self.name in visiting:
+                return None
+            return rule.body.first(rules, visiting + (self.name,))
+
         def gen_code(self, indent, counters, pos):
             if self.token is not None:
                 if self.ret is not None:
@@ -1994,6 +2453,9 @@ class TPGParser(tpg.Parser):
         def links_symbols_to_tokens(self, tokens):
             pass
 
+        def first(self, rules, visiting):
+            return (self.explicit_token.name,), False
+
         def gen_code(self, indent, counters, pos):
             if self.ret is not None:
                 return indent + "%s = self.eat('%s') # %s" % (self.ret.gen_code(), self.explicit_token.name, self.expr)
@@ -2052,6 +2514,17 @@ class TPGParser(tpg.Parser):
             for a in self:
                 a.links_symbols_to_tokens(tokens)
 
+        def first(self, rules, visiting):
+            names = ()
+            for a in self:
+                first = a.first(rules, visiting)
+                if first is None:
+                    return None
+                names += first[0]
+                if not first[1]:
+                    return names, False
+            return names, True
+
         def gen_code(self, indent, counters, pos):
             return self and [
                 self[0].gen_code(indent, counters, pos),
@@ -2081,7 +2554,29 @@ class TPGParser(tpg.Parser):
             self.a.links_symbols_to_tokens(tokens)
             self.b.links_symbols_to_tokens(tokens)
 
+        def first(self, rules, visiting):
+            a = self.a.first(rules, visiting)
+            if a is None or a[1]:
+                return a
+            b = self.b.first(rules, visiting)
+            if b is None:
+                return None
+            return a[0] + b[0], b[1]
+
+        def alternatives(self):
+            for x in (self.a, self.b):
+                if isinstance(x, TPGParser.Or):
+                    for y in x.alternatives():
+                        yield y
+                else:
+                    yield x
+
         def gen_code(self, indent, counters, pos):
+            if counters.predictors is not None:
+                alternatives = list(self.alternatives())
+                firsts = [counters.predictors.first(x) for x in alternatives]
+                if firsts.count(None) < len(firsts):
+                    return self.gen_predicted_code(indent, counters, pos, alternatives, firsts)
             p = pos or counters("p")
             return [
                 pos is None and indent + "%s = self.lexer.token()" % p or (),
@@ -2092,6 +2587,48 @@ class TPGParser(tpg.Parser):
                 self.b.gen_code(indent + tab, counters, p),
             ]
 
+        def gen_predicted_code(self, indent, counters, pos, alternatives, firsts):
+            # Alternatives are tried in turn until one succeeds (o is False) but
+            # those whose FIRST set does not match are skipped without exceptions
+            p = pos or counters("p")
+            m = counters("m")
+            o = counters("o")
+            code = [
+                pos is None and indent + "%s = self.lexer.token()" % p or (),
+                indent + "%s = self.lexer.predict(%d)" % (m, counters.predictors.add(firsts)),
+                indent + "%s = True" % o,
+            ]
+            last = len(alternatives) - 1
+            for n, (x, first) in enumerate(zip(alternatives, firsts)):
+                i = indent
+                if n > 0:
+                    code.append(i + "if %s:" % o)
+                    i += tab
+                if n == last:
+                    if first is not None:
+                        code.extend([
+                            i + "if %s['a%d'] is None:" % (m, n),
+                            i + tab + "self.missCSL(%r)" % (first,),
+                            i + tab + "raise tpg.WrongToken",
+                        ])
+                    code.append(x.gen_code(i, counters, p))
+                    continue
+                if first is not None:
+                    code.extend([
+                        i + "if %s['a%d'] is None:" % (m, n),
+                        i + tab + "self.missCSL(%r)" % (first,),
+                        i + "else:",
+                    ])
+                    i += tab
+                code.extend([
+                    i + "try:",
+                    x.gen_code(i + tab, counters, p),
+                    i + tab + "%s = False" % o,
+                    i + "except tpg.WrongToken:",
+                    i + tab + "self.lexer.back(%s)" % p,
+                ])
+            return code
+
         def gen_doc(self, parent):
             doc = "%s | %s" % (self.a.gen_doc(self), self.b.gen_doc(self))
             if isinstance(parent, TPGParser.And) and len(parent) > 1:
@@ -2118,16 +2655,44 @@ class TPGParser(tpg.Parser):
         def links_symbols_to_tokens(self, tokens):
             self.a.links_symbols_to_tokens(tokens)
 
+        def bounds(self):
+            if (self.min, self.max) in [(0, 1), (0, None), (1, None)]:
+                return str(self.min), str(self.max)
+            return self.min.gen_code(), self.max.gen_code()
+
+        def first(self, rules, visiting):
+            first = self.a.first(rules, visiting)
+            min, max = self.bounds()
+            if first is None or first[1] or not (max == "None" or max.isdigit() and int(max) > 0):
+                return None
+            if min == "0":
+                return first[0], True
+            if min.isdigit():
+                return first[0], False
+            return None
+
         def gen_code(self, indent, counters, pos):
+            first = counters.predictors is not None and counters.predictors.first(self.a) or None
+            if first is not None:
+                predict = "self.lexer.predict(%d) is None" % counters.predictors.add([first])
+                miss = "self.missCSL(%r)" % (first,)
             # A?
             if (self.min, self.max) == (0, 1):
                 p = pos or counters("p")
+                i = indent
+                if first is not None:
+                    i += tab
                 return [
                     pos is None and indent + "%s = self.lexer.token()" % p or (),
-                    indent + "try:",
-                    self.a.gen_code(indent + tab, counters, p),
-                    indent + "except tpg.WrongToken:",
-                    indent + tab + "self.lexer.back(%s)" % p,
+                    first is not None and [
+                        indent + "if %s:" % predict,
+                        indent + tab + miss,
+                        indent + "else:",
+                    ] or (),
+                    i + "try:",
+                    self.a.gen_code(i + tab, counters, p),
+                    i + "except tpg.WrongToken:",
+                    i + tab + "self.lexer.back(%s)" % p,
                 ]
             # A*
             elif (self.min, self.max) == (0, None):
@@ -2135,6 +2700,11 @@ class TPGParser(tpg.Parser):
                 return [
                     indent + "while True:",
                     indent + tab + "%s = self.lexer.token()" % p,
+                    first is not None and [
+                        indent + tab + "if %s:" % predict,
+                        indent + tab + tab + miss,
+                        indent + tab + tab + "break",
+                    ] or (),
                     indent + tab + "try:",
                     self.a.gen_code(indent + tab + tab, counters, p),
                     indent + tab + "except tpg.WrongToken:",
@@ -2149,6 +2719,12 @@ class TPGParser(tpg.Parser):
                     indent + "%s = 0" % n,
                     indent + "while True:",
                     indent + tab + "%s = self.lexer.token()" % p,
+                    first is not None and [
+                        indent + tab + "if %s:" % predict,
+                        indent + tab + tab + miss,
+                        indent + tab + tab + "if %s < 1: raise tpg.WrongToken" % n,
+                        indent + tab + tab + "break",
+                    ] or (),
                     indent + tab + "try:",
                     self.a.gen_code(indent + tab + tab, counters, p),
                     indent + tab + tab + "%s += 1" % n,
@@ -2161,12 +2737,17 @@ class TPGParser(tpg.Parser):
             else:
                 p = pos or counters("p")
                 n = counters("n")
-                min = self.min.gen_code()
-                max = self.max.gen_code()
+                min, max = self.bounds()
                 return [
                     indent + "%s = 0" % n,
                     indent + "while %s:" % (max == "None" and "True" or "%s < %s" % (n, max)),
                     indent + tab + "%s = self.lexer.token()" % p,
+                    first is not None and [
+                        indent + tab + "if %s:" % predict,
+                        indent + tab + tab + miss,
+                        indent + tab + tab + "if %s < %s: raise tpg.WrongToken" % (n, min),
+                        indent + tab + tab + "break",
+                    ] or (),
                     indent + tab + "try:",
                     self.a.gen_code(indent + tab + tab, counters, p),
                     indent + tab + tab + "%s += 1" % n,
@@ -2264,9 +2845,7 @@ class TPGParser(tpg.Parser):
 
     def make_code(self, attribute, *source):
         source = "".join(self.flatten_nl(*source))
-        local_namespace = {}
-        exec(source, self.env, local_namespace)
-        code = local_namespace[attribute]
+        code = _bind(attribute, source, self.env)
         return attribute, source, code
 
     def gen(self, options, tokens, rules):
@@ -2289,14 +2868,10 @@ class TPGParser(tpg.Parser):
                 token.set_explicit_token(self.DefToken("_tok_%s" % token_number, self.string_prefix, token.expr))
                 explicit_tokens[token.expr[1:-1]] = token.explicit_token
                 inline_tokens.append(token)
-        yield self.make_code("init_lexer",
-                             "def init_lexer(self):",
-                             lexer is ContextSensitiveLexer and [tab + "self.eat = self.eatCSL"] or (),
-                             tab + "lexer = tpg.%s(%s, %s)" % (lexer.__name__, word_bounded, lexer_options),
-                             [tab + tok.gen_def() for tok in inline_tokens],
-                             [tab + tok.gen_def() for tok in tokens],
-                             tab + "return lexer",
-                             )
+        if options.lexer_memoize:
+            if not issubclass(lexer, ContextSensitiveLexer):
+                self.error("lexer_memoize requires a ContextSensitiveLexer")
+            lexer_options = "%s, memoize=True" % lexer_options
         # building the parser
         tokens_from_name = {}
         for token in inline_tokens:
@@ -2304,5 +2879,89 @@ class TPGParser(tpg.Parser):
         for token in tokens:
             tokens_from_name[token.name] = token
         rules.links_symbols_to_tokens(tokens_from_name)
-        for name, code in rules.gen_code():
+        predictors = None
+        if options.predict:
+            if not issubclass(lexer, ContextSensitiveLexer):
+                self.error("predict requires a ContextSensitiveLexer")
+            predictors = self.Predictors(rules)
+        rules_code = list(rules.gen_code(predictors))
+        yield self.make_code("init_lexer",
+                             "def init_lexer(self):",
+                             issubclass(lexer, ContextSensitiveLexer) and [tab + "self.eat = self.eatCSL"] or (),
+                             tab + "lexer = tpg.%s(%s, %s)" % (lexer.__name__, word_bounded, lexer_options),
+                             [tab + tok.gen_def() for tok in inline_tokens],
+                             [tab + tok.gen_def() for tok in tokens],
+                             [tab + "lexer.def_predictor(%r)" % (alternatives,) for alternatives in predictors or ()],
+                             issubclass(lexer, PreTokenizedLexer) and [tab + "lexer.def_classifier()"] or (),
+                             tab + "return lexer",
+                             )
+        for name, code in rules_code:
             yield self.make_code(name, *code)
+
+
+def compile_module(module):
+    """ translate the grammars of the parsers defined in a module into a Python module
+
+    The generated module holds the rule methods and lexer tables of each parser
+    and is written next to the module. ParserMetaClass uses it instead of
+    parsing the grammars as long as the grammars do not change.
+
+    Parameters:
+        module : name of the module defining the parsers
+
+    Returns the path of the generated module.
+    """
+    env = vars(importlib.import_module(module))
+    tpg_module = env.get('tpg', sys.modules[__name__])
+    lines = ["# Generated by TPG %s from the grammars of %s. Do not edit." % (__version__, module),
+             "#",
+             "# Regenerate with: python -m %s compile %s" % (__name__, module),
+             "#",
+             "# flake8: noqa",
+             "import %s as tpg" % tpg_module.__name__,
+             "",
+             "__grammars__ = {}",
+             ]
+    for name, parser_class in list(env.items()):
+        if not (isinstance(parser_class, ParserMetaClass) and parser_class.__module__ == module):
+            continue
+        grammar = parser_class.__dict__.get('__doc__')
+        if not grammar:
+            continue
+        attributes = []
+        for attribute, source, code in TPGParser(env)(grammar):
+            lines.extend(["", "", source.rstrip("\n")])
+            attributes.append(attribute)
+        lines.extend(["", "",
+                      "__grammars__[%r] = (%r, {" % (name, grammar_key(grammar))] +
+                     [tab + "%r: %s," % (attribute, attribute) for attribute in attributes] +
+                     ["})"])
+    path = os.path.join(os.path.dirname(env['__file__']), '%s.py' % compiled_module_name(module).rpartition('.')[2])
+    with open(path, 'w') as fh:
+        fh.write("\n".join(lines) + "\n")
+    return path
+
+
+def main(argv=None):
+    """ command line interface of TPG
+
+        python -m gifts.common.tpg compile MODULE [MODULE ...]
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m %s' % __name__, description=__description__)
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('compile', help='translate the grammars of the parsers defined in modules into '
+                                                  'importable Python modules')
+    command.add_argument('modules', nargs='+', metavar='MODULE', help='name of a module defining parsers')
+    args = parser.parse_args(argv)
+    for module in args.modules:
+        print(compile_module(module))
+    return 0
+
+
+if __name__ == '__main__':
+    #
+    # Run as 'python -m': use the importable module so that the parsers and the compiler share the same classes
+    if __spec__ is not None:
+        sys.exit(importlib.import_module(__spec__.name).main())
+    sys.exit(main())
@@ -25,6 +25,21 @@ TranslationCentreName = ''
 TranslationCentreDesignator = ''
 #
 # -----------------------------------------------------------------------------------
+# XML backend building the IWXXM documents: 'tree' for xml.etree.ElementTree,
+# 'stream' for the lean elements of xmlStream.py, written out in a single pass, or
+# 'lxml' for lxml, if installed, otherwise xml.etree.ElementTree. The encoders'
+# xmlBackend attribute, if set, takes precedence.
+#
+XML_BACKEND = 'tree'
+#
+# -----------------------------------------------------------------------------------
+# Generation of the UUIDs of the gml:id attributes: 'uuid4' for one call to
+# uuid.uuid4() per UUID, 'pool' for random UUIDs made in batches, or 'counter' for a
+# random prefix per process and a counter. See gmlIDs.py.
+#
+GML_ID_STRATEGY = 'pool'
+#
+# -----------------------------------------------------------------------------------
 # IWXXM release name
 _iwxxm = '2025-2'
 _release = '2025-2RC1'
@@ -36,6 +51,11 @@ IWXXM_URL = 'https://schemas.wmo.int/iwxxm/%s/iwxxm.xsd' % _release
 #
 CodesFilePath = os.path.join(os.path.dirname(__file__), '../data')
 #
+# Directory of the snapshots of the code lists read from the RDF files, so that they
+# are parsed once, not once per process. None for no snapshots.
+#
+CodesSnapshotPath = os.path.join(CodesFilePath, '__pycache__')
+#
 # To support Annex 3 code forms, the following Containers from the WMO Code Registry
 # site were downloaded into the CodesFilePath directory in RDF format.
 #
@@ -167,6 +187,10 @@ TERMINATOR_RADIUS = '10018'
 # TERMINATOR_UOM, only '[mi_i]' or 'km' is used
 TERMINATOR_UOM = 'km'
 #
+# Engine finding the solar sub-point, the centre of the DAYLIGHT SIDE region: 'skyfield', with the
+# JPL ephemeris file de421.bsp, or 'analytic', which needs neither. See common/solarPosition.py
+SOLAR_ENGINE = 'skyfield'
+#
 # Set DAY or NIGHT SIDE polygon points at roughly INCR degree spacing. Do not go below one
 # degree.
 INCR = 5
@@ -0,0 +1,276 @@
+#
+# Name: xmlLxml.py
+# Purpose: An XML backend for the IWXXM encoders built on lxml, with the part of the xml.etree.ElementTree interface
+#          they use. Documents are built and serialized by lxml's C library, with their namespaces registered.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# Importing this module raises ImportError if lxml is not installed.
+#
+# The encoders name their elements and attributes with prefixes, e.g. 'iwxxm:METAR', or without prefix in the scope
+# of a default namespace, and declare the namespaces with 'xmlns' attributes. Here the prefixes are resolved, as
+# they are given, with the namespaces registered, and lxml declares the namespaces itself:
+#
+#   - the 'xmlns:prefix' attributes are dropped, as the registered namespaces are declared on the elements created
+#     without parent; the declarations unused are removed when the document is serialized.
+#   - an 'xmlns' attribute puts its element, and the elements named without prefix below it, in the namespace. It is
+#     set before the children of its element are added. The elements named without prefix outside the scope of a
+#     default namespace get their namespace when added to a parent in one.
+#
+import threading
+
+import lxml.etree as etree
+
+from . import xmlConfig as des
+
+_NAMESPACES = {'aixm': 'http://www.aixm.aero/schema/5.1.1',
+               'collect': 'http://def.wmo.int/collect/2014',
+               'gml': 'http://www.opengis.net/gml/3.2',
+               'iwxxm': des.IWXXM_URI,
+               'metce': 'http://def.wmo.int/metce/2013',
+               'xlink': 'http://www.w3.org/1999/xlink',
+               'xsi': 'http://www.w3.org/2001/XMLSchema-instance'}
+#
+# Default namespace of an element and its descendants, kept in this attribute until the document is serialized
+_XMLNS = '{urn:x-gifts:xmlns}default'
+#
+# Element names with a prefix and attribute names, resolved
+_names = {}
+_attributes = {}
+#
+# Held while the registered namespaces, and the element declaring them, change
+_lock = threading.Lock()
+
+
+def register_namespace(prefix, uri):
+    """Registers a namespace, so that names with prefix are resolved with it, and declares it on the elements created
+       without parent from now on"""
+
+    global _prototype
+    with _lock:
+        _NAMESPACES[prefix] = uri
+        _names.clear()
+        _attributes.clear()
+        _prototype = None
+
+
+def _resolve(name):
+    #
+    # Names with a prefix and names already resolved; None for names without prefix
+    if name[:1] == '{':
+        return name
+
+    prefix, colon, localName = name.partition(':')
+    if colon:
+        return '{%s}%s' % (_NAMESPACES[prefix], localName)
+
+
+def _attribute(key):
+
+    _attributes[key] = name = _resolve(key) or key
+    return name
+
+
+def _default(element):
+    #
+    # Default namespace in the scope of element, or None
+    while element is not None:
+        uri = _get(element, _XMLNS)
+        if uri is not None:
+            return uri
+        element = element.getparent()
+
+
+def _inScope(name, element):
+    #
+    # Element name resolved in the scope of element
+    try:
+        return _names[name]
+    except KeyError:
+        pass
+
+    result = _resolve(name)
+    if result is not None:
+        _names[name] = result
+        return result
+
+    uri = _default(element)
+    if uri is None:
+        return name
+
+    return '{%s}%s' % (uri, name)
+
+
+def _adopt(parent, element):
+    #
+    # Elements named without prefix outside the scope of a default namespace, now in the scope of parent
+    if _default(parent) is None:
+        return
+
+    for child in element.iter('{}*'):
+        _setTag(child, '{%s}%s' % (_default(child.getparent()), child.tag))
+
+
+_SubElement = etree.SubElement
+_get = etree.ElementBase.get
+_set = etree.ElementBase.set
+_setTag = etree.ElementBase.tag.__set__
+
+
+class NamespacedElement(etree.ElementBase):
+    """lxml element accepting the names with prefix of the encoders, e.g. 'gml:id', wherever xml.etree.ElementTree
+       does"""
+
+    @property
+    def tag(self):
+
+        return etree.ElementBase.tag.__get__(self)
+
+    @tag.setter
+    def tag(self, name):
+
+        _setTag(self, _inScope(name, self))
+
+    def set(self, key, value):
+
+        name = _attributes.get(key)
+        if name is None:
+            if key == 'xmlns':
+                _set(self, _XMLNS, value)
+                _setTag(self, '{%s}%s' % (value, etree.QName(self).localname))
+                return
+
+            if key.startswith('xmlns:'):
+                if _NAMESPACES.get(key[6:]) != value:
+                    register_namespace(key[6:], value)
+                return
+
+            name = _attribute(key)
+
+        _set(self, name, value)
+
+    def get(self, key, default=None):
+
+        return _get(self, _attributes.get(key) or _attribute(key), default)
+
+    def append(self, element):
+
+        etree.ElementBase.append(self, element)
+        _adopt(self, element)
+
+    def extend(self, elements):
+
+        for element in elements:
+            self.append(element)
+
+    def insert(self, index, element):
+
+        etree.ElementBase.insert(self, index, element)
+        _adopt(self, element)
+
+    def __reduce__(self):
+        #
+        # Documents built in worker processes are handed back serialized
+        return _fromstring, (etree.tostring(self),)
+
+    def find(self, path, namespaces=None):
+
+        return etree.ElementBase.find(self, path, namespaces or _NAMESPACES)
+
+    def findall(self, path, namespaces=None):
+
+        return etree.ElementBase.findall(self, path, namespaces or _NAMESPACES)
+
+
+_parser = etree.XMLParser()
+_parser.set_element_class_lookup(etree.ElementDefaultClassLookup(element=NamespacedElement))
+#
+# Element declaring the registered namespaces, copied to create elements without parent
+_prototype = None
+
+
+def _fromstring(text):
+
+    return etree.fromstring(text, _parser)
+
+
+def _makePrototype():
+
+    global _prototype
+    with _lock:
+        if _prototype is None:
+            _prototype = _parser.makeelement('{%s}prototype' % _NAMESPACES['iwxxm'], nsmap=_NAMESPACES)
+
+        return _prototype
+
+
+def Element(tag, attrib={}, **extra):
+    #
+    # The element in use is kept, as register_namespace() may drop it meanwhile
+    prototype = _prototype
+    if prototype is None:
+        prototype = _makePrototype()
+
+    element = prototype.__copy__()
+    _setTag(element, _inScope(tag, None))
+    if attrib or extra:
+        for key, value in dict(attrib, **extra).items():
+            element.set(key, value)
+
+    return element
+
+
+def SubElement(parent, tag, attrib={}, **extra):
+
+    element = _SubElement(parent, _inScope(tag, parent))
+    if attrib or extra:
+        for key, value in dict(attrib, **extra).items():
+            element.set(key, value)
+
+    return element
+
+
+def tostring(element, encoding='us-ascii', method='xml', xml_declaration=None, short_empty_elements=True):
+    """Returns the XML of element, as xml.etree.ElementTree.tostring() does: a string if encoding is 'unicode',
+       otherwise bytes. The document is finished: its namespace bookkeeping is removed."""
+
+    etree.strip_attributes(element, _XMLNS)
+    etree.cleanup_namespaces(element)
+    if xml_declaration is None:
+        xml_declaration = encoding.lower() not in ('utf-8', 'us-ascii', 'unicode')
+
+    if encoding == 'unicode':
+        return etree.tostring(element, encoding='unicode', method=method)
+
+    return etree.tostring(element, encoding=encoding, method=method, xml_declaration=xml_declaration)
+
+
+class ElementTree(object):
+    """Wrapper of a document, the interface of xml.etree.ElementTree.ElementTree used by the bulletins"""
+
+    def __init__(self, element=None):
+
+        self._root = element
+
+    def getroot(self):
+
+        return self._root
+
+    def write(self, file, encoding='us-ascii', xml_declaration=None, method='xml', short_empty_elements=True):
+
+        file.write(tostring(self._root, encoding, method, xml_declaration, short_empty_elements))
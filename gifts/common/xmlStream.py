@@ -0,0 +1,187 @@
+#
+# Name: xmlStream.py
+# Purpose: A lean XML backend for the IWXXM encoders, with the part of the xml.etree.ElementTree interface they use,
+#          whose documents are written out in a single pass over the elements, straight into one buffer.
+#
+# Copyright (C) 2025 Mark Oberfield
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# Contact Info: Mark.Oberfield@gmail.com
+#
+# The encoders name their elements and attributes with prefixes, e.g. 'iwxxm:METAR', and declare the namespaces
+# with 'xmlns:' attributes, so the writer has no namespaces to resolve. Its output is the same as that of
+# xml.etree.ElementTree.
+#
+import sys
+import xml.etree.ElementTree
+
+_TEXT = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_ATTRIBUTE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', '\n': '&#10;', '\r': '&#13;',
+                            '\t': '&#09;'})
+
+
+class Element(object):
+    """XML element with tag, attrib, text and tail, the interface of xml.etree.ElementTree.Element used by the
+       encoders and the bulletins"""
+
+    __slots__ = ('tag', 'attrib', 'text', 'tail', '_children')
+
+    def __init__(self, tag, attrib={}, **extra):
+
+        self.tag = tag
+        self.attrib = dict(attrib, **extra)
+        self.text = None
+        self.tail = None
+        self._children = []
+
+    def __repr__(self):
+
+        return '<Element %r at %#x>' % (self.tag, id(self))
+
+    def __len__(self):
+
+        return len(self._children)
+
+    def __iter__(self):
+
+        return iter(self._children)
+
+    def __getitem__(self, index):
+
+        return self._children[index]
+
+    def set(self, key, value):
+
+        self.attrib[key] = value
+
+    def get(self, key, default=None):
+
+        return self.attrib.get(key, default)
+
+    def items(self):
+
+        return self.attrib.items()
+
+    def keys(self):
+
+        return self.attrib.keys()
+
+    def append(self, subelement):
+
+        self._children.append(subelement)
+
+    def extend(self, elements):
+
+        self._children.extend(elements)
+
+    def insert(self, index, subelement):
+
+        self._children.insert(index, subelement)
+
+    def remove(self, subelement):
+
+        self._children.remove(subelement)
+
+    def find(self, tag):
+
+        for child in self._children:
+            if child.tag == tag:
+                return child
+
+    def findall(self, tag):
+
+        return [child for child in self._children if child.tag == tag]
+
+    def iter(self, tag=None):
+
+        if tag is None or self.tag == tag:
+            yield self
+        for child in self._children:
+            yield from child.iter(tag)
+
+
+def SubElement(parent, tag, attrib={}, **extra):
+
+    element = Element(tag, attrib, **extra)
+    parent._children.append(element)
+    return element
+
+
+def _serialize(write, element, short):
+
+    tag = element.tag
+    write('<' + tag)
+    for key, value in element.attrib.items():
+        write(' %s="%s"' % (key, value.translate(_ATTRIBUTE)))
+
+    if element.text or element._children:
+        write('>')
+        if element.text:
+            write(element.text.translate(_TEXT))
+        for child in element._children:
+            _serialize(write, child, short)
+        write('</%s>' % tag)
+    elif short:
+        write(' />')
+    else:
+        write('></%s>' % tag)
+
+    if element.tail:
+        write(element.tail.translate(_TEXT))
+
+
+def tostring(element, encoding='us-ascii', method='xml', xml_declaration=None, short_empty_elements=True):
+    """Returns the XML of element, as xml.etree.ElementTree.tostring() does: a string if encoding is 'unicode',
+       otherwise bytes"""
+
+    parts = []
+    if xml_declaration or (xml_declaration is None and encoding.lower() not in ('utf-8', 'us-ascii', 'unicode')):
+        parts.append("<?xml version='1.0' encoding='%s'?>\n" % ('utf-8' if encoding == 'unicode' else encoding))
+
+    _serialize(parts.append, element, short_empty_elements)
+    if encoding == 'unicode':
+        return ''.join(parts)
+
+    return ''.join(parts).encode(encoding, 'xmlcharrefreplace')
+
+
+class ElementTree(object):
+    """Wrapper of a document, the interface of xml.etree.ElementTree.ElementTree used by the bulletins"""
+
+    def __init__(self, element=None):
+
+        self._root = element
+
+    def getroot(self):
+
+        return self._root
+
+    def write(self, file, encoding='us-ascii', xml_declaration=None, method='xml', short_empty_elements=True):
+
+        file.write(tostring(self._root, encoding, method, xml_declaration, short_empty_elements))
+
+
+def backend(element):
+    """Returns the module of the XML backend that built element: this module, xmlLxml or xml.etree.ElementTree"""
+
+    if isinstance(element, Element):
+        return sys.modules[__name__]
+    #
+    # xmlLxml is imported only if lxml is chosen and installed
+    module = sys.modules.get('%s.xmlLxml' % __package__)
+    if module is not None and isinstance(element, module.NamespacedElement):
+        return module
+
+    return xml.etree.ElementTree
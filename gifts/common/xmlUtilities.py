@@ -21,10 +21,10 @@
 #
 import cmath
 import math
-import os
 import time
-import uuid
-import xml.etree.ElementTree as ET
+
+from . import codeRegistry
+from . import gmlIDs
 
 CardinalPtsToDegreesS = {'N': '360', 'NNE': '22.5', 'NE': '45', 'ENE': '67.5',
                          'E': '90', 'ESE': '112.5', 'SE': '135', 'SSE': '157.5',
@@ -39,60 +39,8 @@ CardinalPtsToDegreesF = {'N': 360., 'NNE': 22.5, 'NE': 45., 'ENE': 67.5,
 
 def parseCodeRegistryTables(srcDirectory, neededCodes, preferredLanguage='en'):
     #
-    # Nil Reasons are always needed/required
-    if 'nil' not in neededCodes:
-        neededCodes.append('nil')
-    #
-    # Get the list of RDF files in the srcDirectory
-    neededCodeFiles = [(needed, os.path.join(srcDirectory, rdfFile)) for rdfFile in os.listdir(srcDirectory)
-                       for needed in neededCodes if needed in rdfFile]
-    #
-    events = 'start', 'start-ns'
-    codes = {}
-    #
-    for containerId, fname in neededCodeFiles:
-
-        top = None
-        nameSpaces = {'xml': 'http://www.w3.org/XML/1998/namespace'}
-        neededNS = ['skos', 'rdf', 'rdfs']
-
-        for event, elem in ET.iterparse(fname, events):
-            if event == 'start' and top is None:
-                top = elem
-            elif neededNS and event == 'start-ns':
-                if elem[0] in neededNS:
-                    nameSpaces[elem[0]] = elem[1]
-                    neededNS.remove(elem[0])
-        #
-        # Now that we have the required namespaces for searches
-        Concept = '{%s}Concept' % nameSpaces.get('skos')
-        about = '{%s}about' % nameSpaces.get('rdf')
-        label = '{%s}label[@{%s}lang="%s"]' % (nameSpaces.get('rdfs'), nameSpaces.get('xml'), preferredLanguage)
-        enlabel = '{%s}label[@{%s}lang="%s"]' % (nameSpaces.get('rdfs'), nameSpaces.get('xml'), 'en')
-        nolang = '{%s}label' % nameSpaces.get('rdfs')
-
-        root = ET.ElementTree(top)
-        kvp = []
-        for concept in root.iter(Concept):
-            try:
-                uri = concept.get(about)
-                key = uri[uri.rfind('/') + 1:]
-                text = ''
-                try:
-                    text = concept.find(label).text
-                except AttributeError:
-                    if preferredLanguage != 'en':
-                        text = concept.find(enlabel).text
-                    else:
-                        text = concept.find(nolang).text
-                finally:
-                    kvp.append((key, (uri, text)))
-
-            except AttributeError:
-                pass
-
-        codes[containerId] = dict(kvp)
-    return codes
+    # Read-only, so that encoders can share them. The RDF files are parsed once per process, see codeRegistry.py
+    return codeRegistry.codeLists(srcDirectory, neededCodes, preferredLanguage)
 
 
 def fix_date(tms):
@@ -120,7 +68,7 @@ def is_a_number(s):
 
 
 def getUUID(prefix='uuid.'):
-    return '%s%s' % (prefix, uuid.uuid4())
+    return '%s%s' % (prefix, gmlIDs.newID())
 
 
 def computeLatLon(lat, lon, bearing, distance, radius=3440.):
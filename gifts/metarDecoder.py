@@ -27,14 +27,16 @@ import logging
 import re
 import time
 
+from .common import Common
 from .common import tpg
 from .common import xmlUtilities as deu
 
 
-class Annex3(tpg.Parser):
+class Annex3(Common.ReentrantDecoder, tpg.Parser):
     r"""
     set lexer = ContextSensitiveLexer
     set lexer_dotall = True
+    set predict = True
 
     separator spaces:    '\s+' ;
 
@@ -139,7 +141,7 @@ class Annex3(tpg.Parser):
         super(Annex3, self).__init__()
         self._Logger = logging.getLogger(__name__)
 
-    def __call__(self, tac):
+    def _decode(self, tac):
 
         self._metar = {'bbb': ' ',
                        'translationTime': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
@@ -163,7 +165,7 @@ class Annex3(tpg.Parser):
 
         try:
             self._expected = []
-            return super(Annex3, self).__call__(tac)
+            return self.parse('START', tac)
 
         except tpg.SyntacticError:
             try:
@@ -217,8 +219,9 @@ class Annex3(tpg.Parser):
     def index(self):
 
         ti = self.lexer.cur_token
-        return ('%d.%d' % (ti.line, ti.column - 1),
-                '%d.%d' % (ti.end_line, ti.end_column - 1))
+        line, column = ti.lines.line_column(ti.start)
+        end_line, end_column = ti.lines.line_column(ti.stop)
+        return ('%d.%d' % (line, column - 1), '%d.%d' % (end_line, end_column - 1))
 
     def tokenOK(self, pos=0):
         'Checks whether token ends with a blank'
@@ -238,6 +241,10 @@ class Annex3(tpg.Parser):
             self._expected.append(name)
             raise
 
+    def missCSL(self, names):
+        'Overrides super definition'
+        self._expected.extend(names)
+
     def updateDictionary(self, key, value, root):
 
         try:
@@ -23,7 +23,6 @@ import logging
 import re
 import traceback
 import sys
-import xml.etree.ElementTree as ET
 
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
@@ -62,7 +61,7 @@ class Annex3(Common.Base):
         self._RunwayDepositDepths = {'92': '100', '93': '150', '94': '200',
                                      '95': '250', '96': '300', '97': '350', '98': '400'}
 
-    def __call__(self, decodedMetar, tacString):
+    def _encode(self, decodedMetar, tacString):
 
         self.XMLDocument = None
         self.decodedTAC = decodedMetar
@@ -84,9 +83,9 @@ class Annex3(Common.Base):
         #
         # The root element created here
         try:
-            self.XMLDocument = ET.Element('iwxxm:%s' % self.decodedTAC['type']['str'])
+            self.XMLDocument = self.ET.Element('iwxxm:%s' % self.decodedTAC['type']['str'])
         except KeyError:
-            self.XMLDocument = ET.Element('iwxxm:%s' % 'METAR')
+            self.XMLDocument = self.ET.Element('iwxxm:%s' % 'METAR')
         #
         for prefix, uri in self.NameSpaces.items():
             self.XMLDocument.set('xmlns:%s' % prefix, uri)
@@ -131,21 +130,21 @@ class Annex3(Common.Base):
 
     def issueTime(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:issueTime')
+        indent = self.ET.SubElement(parent, 'iwxxm:issueTime')
         if token is None:
             return
 
         self._issueTime = token['value']
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = self._issueTime
         self._issueTimeUUID = '#%s' % indent1.get('gml:id')
 
     def observationTime(self):
 
         try:
-            indent = ET.SubElement(self.XMLDocument, 'iwxxm:observationTime')
+            indent = self.ET.SubElement(self.XMLDocument, 'iwxxm:observationTime')
             if self._issueTimeUUID is not None:
                 indent.set('xlink:href', self._issueTimeUUID)
 
@@ -154,7 +153,7 @@ class Annex3(Common.Base):
 
     def observation(self):
 
-        indent = ET.SubElement(self.XMLDocument, 'iwxxm:observation')
+        indent = self.ET.SubElement(self.XMLDocument, 'iwxxm:observation')
         if self.decodingFailure:
             return
 
@@ -167,7 +166,7 @@ class Annex3(Common.Base):
     def result(self, parent):
 
         self.runwayDirectionCache = {}
-        indent1 = ET.SubElement(parent, 'iwxxm:MeteorologicalAerodromeObservation')
+        indent1 = self.ET.SubElement(parent, 'iwxxm:MeteorologicalAerodromeObservation')
         indent1.set('gml:id', deu.getUUID())
         indent1.set('cloudAndVisibilityOK', str('cavok' in self.decodedTAC).lower())
 
@@ -203,7 +202,7 @@ class Annex3(Common.Base):
         # If no significant changes, "NOSIG", is forecast
         if 'nosig' in self.decodedTAC:
 
-            indent = ET.SubElement(self.XMLDocument, 'iwxxm:trendForecast')
+            indent = self.ET.SubElement(self.XMLDocument, 'iwxxm:trendForecast')
             indent.set('xsi:nil', 'true')
             indent.set('nilReason', self.codes[des.NIL][des.NOSIGC][0])
             return
@@ -218,8 +217,8 @@ class Annex3(Common.Base):
 
         for event in events:
 
-            indent = ET.SubElement(self.XMLDocument, 'iwxxm:trendForecast')
-            indent1 = ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeTrendForecast')
+            indent = self.ET.SubElement(self.XMLDocument, 'iwxxm:trendForecast')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeTrendForecast')
             indent1.set('gml:id', deu.getUUID())
             indent1.set('changeIndicator', self._TrendForecast[event['type']])
             indent1.set('cloudAndVisibilityOK', str('cavok' in event).lower())
@@ -228,11 +227,11 @@ class Annex3(Common.Base):
 
     def trendPhenomenonTime(self, parent, event):
 
-        indent = ET.Element('iwxxm:phenomenonTime')
-        indent1 = ET.Element('gml:TimePeriod')
+        indent = self.ET.Element('iwxxm:phenomenonTime')
+        indent1 = self.ET.Element('gml:TimePeriod')
         indent1.set('gml:id', deu.getUUID())
-        begin = ET.SubElement(indent1, 'gml:beginPosition')
-        end = ET.SubElement(indent1, 'gml:endPosition')
+        begin = self.ET.SubElement(indent1, 'gml:beginPosition')
+        end = self.ET.SubElement(indent1, 'gml:endPosition')
         indicator = ''
         #
         # The event may not have a 'ttime' key. In that case, phenomenonTime is unknown
@@ -268,7 +267,7 @@ class Annex3(Common.Base):
 
         parent.append(indent)
         if len(indicator) > 0:
-            indent = ET.SubElement(parent, 'iwxxm:timeIndicator')
+            indent = self.ET.SubElement(parent, 'iwxxm:timeIndicator')
             indent.text = indicator
 
     def trendForecast(self, parent, forecast):
@@ -279,11 +278,11 @@ class Annex3(Common.Base):
             value = deu.checkVisibility(forecast['vsby']['value'], uom)
             #
             # Visibility in trend forecast is handled as a single element type with no children
-            indent = ET.SubElement(parent, 'iwxxm:prevailingVisibility')
+            indent = self.ET.SubElement(parent, 'iwxxm:prevailingVisibility')
             if int(value) >= 10000:
                 indent.text = '10000'
                 indent.set('uom', 'm')
-                indent = ET.SubElement(parent, 'iwxxm:prevailingVisibilityOperator')
+                indent = self.ET.SubElement(parent, 'iwxxm:prevailingVisibilityOperator')
                 indent.text = 'ABOVE'
 
             else:
@@ -306,7 +305,7 @@ class Annex3(Common.Base):
 
     def temps(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:airTemperature')
+        indent = self.ET.SubElement(parent, 'iwxxm:airTemperature')
         try:
             if deu.is_a_number(token['air']):
                 indent.text = token['air']
@@ -320,7 +319,7 @@ class Annex3(Common.Base):
             indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
             indent.set('xsi:nil', 'true')
 
-        indent = ET.SubElement(parent, 'iwxxm:dewpointTemperature')
+        indent = self.ET.SubElement(parent, 'iwxxm:dewpointTemperature')
         try:
             if deu.is_a_number(token['dewpoint']):
                 indent.text = token['dewpoint']
@@ -336,7 +335,7 @@ class Annex3(Common.Base):
 
     def altimeter(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:qnh')
+        indent = self.ET.SubElement(parent, 'iwxxm:qnh')
         #
         # Always report pressure in hPa
         try:
@@ -355,36 +354,36 @@ class Annex3(Common.Base):
 
     def wind(self, parent, token, trend=False):
 
-        indent = ET.SubElement(parent, 'iwxxm:surfaceWind')
+        indent = self.ET.SubElement(parent, 'iwxxm:surfaceWind')
         if token is None or token['str'].startswith('/////'):
             indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
             indent.set('xsi:nil', 'true')
             return
 
         if trend:
-            indent1 = ET.SubElement(indent, 'iwxxm:AerodromeSurfaceWindTrendForecast')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeSurfaceWindTrendForecast')
         else:
-            indent1 = ET.SubElement(indent, 'iwxxm:AerodromeSurfaceWind')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeSurfaceWind')
             if token['str'].startswith('VRB') or 'ccw' in token:
                 indent1.set('variableWindDirection', 'true')
             else:
                 indent1.set('variableWindDirection', 'false')
 
         try:
-            indent2 = ET.Element('iwxxm:meanWindDirection')
+            indent2 = self.ET.Element('iwxxm:meanWindDirection')
             indent2.text = str(int(token['dd']))
             indent2.set('uom', 'deg')
             indent1.append(indent2)
 
         except ValueError:
             if token['dd'] != 'VRB':
-                indent2 = ET.Element('iwxxm:meanWindDirection')
+                indent2 = self.ET.Element('iwxxm:meanWindDirection')
                 indent2.set('uom', 'N/A')
                 indent2.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
                 indent2.set('xsi:nil', 'true')
                 indent1.append(indent2)
 
-        indent2 = ET.SubElement(indent1, 'iwxxm:meanWindSpeed')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:meanWindSpeed')
         try:
             indent2.text = str(int(token['ff']))
             indent2.set('uom', token['uom'])
@@ -396,19 +395,19 @@ class Annex3(Common.Base):
 
         if 'ffplus' in token:
 
-            indent2 = ET.SubElement(indent1, 'iwxxm:meanWindSpeedOperator')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:meanWindSpeedOperator')
             indent2.text = 'ABOVE'
         #
         # Gusts are optional
         try:
-            indent2 = ET.Element('iwxxm:windGustSpeed')
+            indent2 = self.ET.Element('iwxxm:windGustSpeed')
             indent2.text = token['gg']
             indent2.set('uom', token['uom'])
             indent1.append(indent2)
 
             if 'ggplus' in token:
 
-                indent2 = ET.SubElement(indent1, 'iwxxm:windGustSpeedOperator')
+                indent2 = self.ET.SubElement(indent1, 'iwxxm:windGustSpeedOperator')
                 indent2.text = 'ABOVE'
 
         except KeyError:
@@ -416,12 +415,12 @@ class Annex3(Common.Base):
         #
         # Variable directions are optional
         try:
-            indent2 = ET.Element('iwxxm:extremeClockwiseWindDirection')
+            indent2 = self.ET.Element('iwxxm:extremeClockwiseWindDirection')
             indent2.text = str(int(token['cw']))
             indent2.set('uom', 'deg')
             indent1.append(indent2)
 
-            indent2 = ET.Element('iwxxm:extremeCounterClockwiseWindDirection')
+            indent2 = self.ET.Element('iwxxm:extremeCounterClockwiseWindDirection')
             indent2.set('uom', 'deg')
             indent2.text = str(int(token['ccw']))
             indent1.append(indent2)
@@ -431,14 +430,14 @@ class Annex3(Common.Base):
 
     def vsby(self, parent, token, trend=False):
 
-        indent = ET.SubElement(parent, 'iwxxm:visibility')
+        indent = self.ET.SubElement(parent, 'iwxxm:visibility')
         if token is None or '//' in token['str']:
             indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
             indent.set('xsi:nil', 'true')
             return
 
-        indent1 = ET.SubElement(indent, 'iwxxm:AerodromeHorizontalVisibility')
-        indent2 = ET.SubElement(indent1, 'iwxxm:prevailingVisibility')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeHorizontalVisibility')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:prevailingVisibility')
         #
         # Always report visibility in meters, per Annex 3 Table A3-5
         value = deu.checkVisibility(token['value'], token['uom'])
@@ -448,13 +447,13 @@ class Annex3(Common.Base):
         if int(value) >= 10000:
 
             indent2.text = '10000'
-            indent2 = ET.SubElement(indent1, 'iwxxm:prevailingVisibilityOperator')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:prevailingVisibilityOperator')
             indent2.text = 'ABOVE'
 
         else:
             indent2.text = value
             try:
-                indent2 = ET.Element('iwxxm:prevailingVisibilityOperator')
+                indent2 = self.ET.Element('iwxxm:prevailingVisibilityOperator')
                 indent2.text = {'P': 'ABOVE', 'M': 'BELOW'}[token['oper']]
                 indent1.append(indent2)
 
@@ -462,14 +461,14 @@ class Annex3(Common.Base):
                 pass
 
         try:
-            indent2 = ET.Element('iwxxm:minimumVisibility')
+            indent2 = self.ET.Element('iwxxm:minimumVisibility')
             indent2.text = deu.checkVisibility(token['min'])
             indent2.set('uom', 'm')
             indent1.append(indent2)
 
             if token['bearing'] != '/':
 
-                indent2 = ET.Element('iwxxm:minimumVisibilityDirection')
+                indent2 = self.ET.Element('iwxxm:minimumVisibilityDirection')
                 indent2.text = token['bearing']
                 indent2.set('uom', 'deg')
                 indent1.append(indent2)
@@ -480,7 +479,7 @@ class Annex3(Common.Base):
     def rvr(self, parent, token):
 
         if token is None:
-            indent = ET.SubElement(parent, 'iwxxm:rvr')
+            indent = self.ET.SubElement(parent, 'iwxxm:rvr')
             indent.set('nilReason', self.codes[des.NIL][des.MSSG][0])
             indent.set('xsi:nil', 'true')
             return
@@ -489,19 +488,19 @@ class Annex3(Common.Base):
                                               token['tend'], token['oper'],
                                               token['uom']):
 
-            indent = ET.SubElement(parent, 'iwxxm:rvr')
-            indent1 = ET.SubElement(indent, 'iwxxm:AerodromeRunwayVisualRange')
+            indent = self.ET.SubElement(parent, 'iwxxm:rvr')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeRunwayVisualRange')
             indent1.set('pastTendency', tend)
 
-            indent2 = ET.SubElement(indent1, 'iwxxm:runway')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:runway')
             self.runwayDirection(indent2, rwy)
 
-            indent2 = ET.SubElement(indent1, 'iwxxm:meanRVR')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:meanRVR')
             try:
                 indent2.text = deu.checkRVR(mean, uom)
                 indent2.set('uom', 'm')
                 if oper is not None:
-                    indent2 = ET.SubElement(indent1, 'iwxxm:meanRVROperator')
+                    indent2 = self.ET.SubElement(indent1, 'iwxxm:meanRVROperator')
                     indent2.text = oper
 
             except ValueError:
@@ -518,13 +517,13 @@ class Annex3(Common.Base):
                 elementName = 'iwxxm:weather'
 
             if ww == '//':
-                indent = ET.SubElement(parent, elementName)
+                indent = self.ET.SubElement(parent, elementName)
                 indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
                 indent.set('xsi:nil', 'true')
                 continue
 
             if ww == 'NSW':
-                indent = ET.SubElement(parent, elementName)
+                indent = self.ET.SubElement(parent, elementName)
                 indent.set('nilReason', self.codes[des.NIL][des.NOOPRSIG][0])
                 indent.set('xsi:nil', 'true')
                 continue
@@ -532,7 +531,7 @@ class Annex3(Common.Base):
             # Search WMO Code Registry table
             try:
                 uri, title = self.codes[des.WEATHER][ww]
-                indent = ET.SubElement(parent, elementName)
+                indent = self.ET.SubElement(parent, elementName)
                 indent.set('xlink:href', uri)
                 if (des.TITLES & des.Weather):
                     indent.set('xlink:title', title)
@@ -540,7 +539,7 @@ class Annex3(Common.Base):
             # Weather phenomenon token not matched
             except KeyError:
 
-                indent = ET.SubElement(parent, elementName)
+                indent = self.ET.SubElement(parent, elementName)
                 result = self._re_unknwnPcpn.match(ww)
                 try:
                     up = '%s%sUP' % (result.group('mod'), result.group('char'))
@@ -558,7 +557,7 @@ class Annex3(Common.Base):
         if trend:
             suffix = 'Forecast'
 
-        indent = ET.SubElement(parent, 'iwxxm:cloud')
+        indent = self.ET.SubElement(parent, 'iwxxm:cloud')
         if token['str'][0] == 'NSC':
             indent.set('nilReason', self.codes[des.NIL][des.NOOPRSIG][0])
             indent.set('xsi:nil', 'true')
@@ -570,7 +569,7 @@ class Annex3(Common.Base):
             self.XMLDocument.set('automatedStation', 'true')
             return
 
-        indent1 = ET.SubElement(indent, 'iwxxm:AerodromeCloud%s' % suffix)
+        indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeCloud%s' % suffix)
         if trend:
             indent1.set('gml:id', deu.getUUID())
 
@@ -585,7 +584,7 @@ class Annex3(Common.Base):
         #
         # Vertical visibility
         if amount == 'VV':
-            indent = ET.SubElement(parent, 'iwxxm:verticalVisibility')
+            indent = self.ET.SubElement(parent, 'iwxxm:verticalVisibility')
             if deu.is_a_number(hgt):
                 indent.set('uom', '[ft_i]')
                 indent.text = str(int(hgt) * 100)
@@ -596,7 +595,7 @@ class Annex3(Common.Base):
 
             return
 
-        indent = ET.SubElement(parent, 'iwxxm:layer')
+        indent = self.ET.SubElement(parent, 'iwxxm:layer')
         if amount == '///' and hgt == '///' and typ is None:
             if self.XMLDocument.get('automatedStation') == 'false':
                 indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
@@ -606,8 +605,8 @@ class Annex3(Common.Base):
             indent.set('xsi:nil', 'true')
             return
 
-        indent1 = ET.SubElement(indent, 'iwxxm:CloudLayer')
-        indent2 = ET.SubElement(indent1, 'iwxxm:amount')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:CloudLayer')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:amount')
         try:
             uri, title = self.codes[des.CLDAMTS][amount]
             indent2.set('xlink:href', uri)
@@ -625,7 +624,7 @@ class Annex3(Common.Base):
             if amount == 'CLR':
                 indent2.set('xlink:title', amount)
         try:
-            indent2 = ET.SubElement(indent1, 'iwxxm:base')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:base')
             indent2.text = str(int(hgt) * 100)
             indent2.set('uom', '[ft_i]')
 
@@ -644,7 +643,7 @@ class Annex3(Common.Base):
         #
         # Annex 3 and WMO 306 Manual on Codes specifies only two cloud type in METAR/SPECIs, 'CB' and 'TCU'
         try:
-            indent2 = ET.Element('iwxxm:cloudType')
+            indent2 = self.ET.Element('iwxxm:cloudType')
             uri, title = self.codes[des.CVCTNCLDS][typ]
             indent2.set('xlink:href', uri)
             if (des.TITLES & des.CloudType):
@@ -662,14 +661,14 @@ class Annex3(Common.Base):
         for ww in token['str']:
 
             if ww == '//':
-                indent = ET.SubElement(parent, 'iwxxm:recentWeather')
+                indent = self.ET.SubElement(parent, 'iwxxm:recentWeather')
                 indent.set('nilReason', self.codes[des.NIL][des.NOOBSV][0])
                 indent.set('xsi:nil', 'true')
                 continue
 
             try:
                 uri, title = self.codes[des.RECENTWX][ww]
-                indent = ET.SubElement(parent, 'iwxxm:recentWeather')
+                indent = self.ET.SubElement(parent, 'iwxxm:recentWeather')
                 indent.set('xlink:href', uri)
                 if (des.TITLES & des.Weather):
                     indent.set('xlink:title', title)
@@ -682,25 +681,25 @@ class Annex3(Common.Base):
                     up = 'UP'
 
                 uri, title = self.codes[des.RECENTWX][up.strip()]
-                indent = ET.SubElement(parent, 'iwxxm:recentWeather')
+                indent = self.ET.SubElement(parent, 'iwxxm:recentWeather')
                 indent.set('xlink:href', uri)
                 indent.set('xlink:title', '%s: %s' % (title, ww))
 
     def ws(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:windShear')
-        indent1 = ET.SubElement(indent, 'iwxxm:AerodromeWindShear')
+        indent = self.ET.SubElement(parent, 'iwxxm:windShear')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeWindShear')
         if 'ALL' in token['str']:
             indent1.set('allRunways', 'true')
         else:
-            indent2 = ET.SubElement(indent1, 'iwxxm:runway')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:runway')
             self.runwayDirection(indent2, token['rwy'])
 
     def seastate(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:seaCondition')
-        indent1 = ET.SubElement(indent, 'iwxxm:AerodromeSeaCondition')
-        indent2 = ET.SubElement(indent1, 'iwxxm:seaSurfaceTemperature')
+        indent = self.ET.SubElement(parent, 'iwxxm:seaCondition')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeSeaCondition')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:seaSurfaceTemperature')
         try:
             indent2.text = str(int(token['seaSurfaceTemperature']))
             indent2.set('uom', 'Cel')
@@ -711,7 +710,7 @@ class Annex3(Common.Base):
             indent2.set('xsi:nil', 'true')
 
         try:
-            indent2 = ET.Element('iwxxm:significantWaveHeight')
+            indent2 = self.ET.Element('iwxxm:significantWaveHeight')
             indent2.text = '%.1f' % (int(token['significantWaveHeight']) * 0.1)
             indent2.set('uom', 'm')
             indent1.append(indent2)
@@ -727,7 +726,7 @@ class Annex3(Common.Base):
 
         try:
             category = token['seaState']
-            indent2 = ET.Element('iwxxm:seaState')
+            indent2 = self.ET.Element('iwxxm:seaState')
             try:
                 uri, title = self.codes[des.SEACNDS][category]
                 indent2.set('xlink:href', uri)
@@ -747,13 +746,13 @@ class Annex3(Common.Base):
 
         for token in tokens:
 
-            indent1 = ET.SubElement(parent, 'iwxxm:runwayState')
+            indent1 = self.ET.SubElement(parent, 'iwxxm:runwayState')
             if token['state'] == 'SNOCLO':
                 indent1.set('nilReason', des.NIL_SNOCLO_URL)
                 indent1.set('xsi:nil', 'true')
                 continue
 
-            indent2 = ET.SubElement(indent1, 'iwxxm:AerodromeRunwayState')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:AerodromeRunwayState')
             indent2.set('allRunways', 'false')
             #
             # Attributes set first
@@ -768,7 +767,7 @@ class Annex3(Common.Base):
             #
             # Runway direction
             if indent2.get('allRunways') == 'false':
-                indent3 = ET.SubElement(indent2, 'iwxxm:runway')
+                indent3 = self.ET.SubElement(indent2, 'iwxxm:runway')
                 if token['runway'] == '99':
                     indent3.set('nilReason', self.codes[des.NIL][des.NA][0])
                 else:
@@ -776,7 +775,7 @@ class Annex3(Common.Base):
             #
             # Runway deposits
             if token['state'][0].isdigit():
-                indent3 = ET.SubElement(indent2, 'iwxxm:depositType')
+                indent3 = self.ET.SubElement(indent2, 'iwxxm:depositType')
                 uri, title = self.codes[des.RWYDEPST][token['state'][0]]
                 indent3.set('xlink:href', uri)
                 if (des.TITLES & des.RunwayDeposit):
@@ -784,7 +783,7 @@ class Annex3(Common.Base):
             #
             # Runway contaminates
             if token['state'][1].isdigit():
-                indent3 = ET.SubElement(indent2, 'iwxxm:contamination')
+                indent3 = self.ET.SubElement(indent2, 'iwxxm:contamination')
                 try:
                     uri, title = self.codes[des.RWYCNTMS][token['state'][1]]
                 except KeyError:
@@ -795,7 +794,7 @@ class Annex3(Common.Base):
                     indent3.set('xlink:title', title)
             #
             # Depth of deposits
-            indent3 = ET.Element('iwxxm:depthOfDeposit')
+            indent3 = self.ET.Element('iwxxm:depthOfDeposit')
             depth = token['state'][2:4]
             if depth.isdigit():
                 if depth != '99':
@@ -820,7 +819,7 @@ class Annex3(Common.Base):
                 #
                 # Remove leading zeros
                 friction = str(int(friction))
-                indent3 = ET.SubElement(indent2, 'iwxxm:estimatedSurfaceFrictionOrBrakingAction')
+                indent3 = self.ET.SubElement(indent2, 'iwxxm:estimatedSurfaceFrictionOrBrakingAction')
                 uri, ignored = self.codes[des.RWYFRCTN][friction]
                 indent3.set('xlink:href', uri)
                 if (des.TITLES & des.RunwayFriction):
@@ -836,15 +835,15 @@ class Annex3(Common.Base):
             return
 
         self.runwayDirectionCache[rwy] = '#%s' % uuid
-        indent = ET.SubElement(parent, 'aixm:RunwayDirection')
+        indent = self.ET.SubElement(parent, 'aixm:RunwayDirection')
         indent.set('gml:id', uuid)
-        indent1 = ET.SubElement(indent, 'aixm:timeSlice')
-        indent2 = ET.SubElement(indent1, 'aixm:RunwayDirectionTimeSlice')
+        indent1 = self.ET.SubElement(indent, 'aixm:timeSlice')
+        indent2 = self.ET.SubElement(indent1, 'aixm:RunwayDirectionTimeSlice')
         indent2.set('gml:id', deu.getUUID())
-        indent3 = ET.SubElement(indent2, 'gml:validTime')
-        indent3 = ET.SubElement(indent2, 'aixm:interpretation')
+        indent3 = self.ET.SubElement(indent2, 'gml:validTime')
+        indent3 = self.ET.SubElement(indent2, 'aixm:interpretation')
         indent3.text = 'SNAPSHOT'
-        indent3 = ET.SubElement(indent2, 'aixm:designator')
+        indent3 = self.ET.SubElement(indent2, 'aixm:designator')
         if rwy == '//':
             indent3.set('nilReason', 'missing')
             indent3.set('xsi:nil', 'true')
@@ -25,21 +25,17 @@
 import copy
 import itertools
 import logging
-import os
 import re
 import time
 
-import skyfield
-
-from skyfield.api import Loader
-from skyfield.toposlib import wgs84
-
+from .common import solarPosition
+from .common import Common
 from .common import tpg
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
 
 
-class Decoder(tpg.Parser):
+class Decoder(Common.ReentrantDecoder, tpg.Parser):
     r"""
     set lexer = ContextSensitiveLexer
     set lexer_dotall = True
@@ -123,28 +119,15 @@ class Decoder(tpg.Parser):
         setattr(self, 'equator', self.add_region)
 
         self._Logger = logging.getLogger(__name__)
-        #
-        # Preparing Skyfield
-        try:
-            load = Loader(os.path.join(skyfield.__path__[0], 'bsp_files'), verbose=False)
-            self._ts = load.timescale()
-            #
-            # Open NAIF/JPL/NASA SPICE Kernel
-            planets = load('de421.bsp')
-            self._Gaia = planets['earth']
-            self._Helios = planets['sun']
-
-        except Exception:
-            self._Logger.exception('Unable to load/initialize Skyfield ephemeris file.')
-            raise
 
         return super(Decoder, self).__init__()
 
-    def __call__(self, tac):
+    def _decode(self, tac):
 
         self.swa = {'bbb': '',
                     'translationTime': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
                     'fcsts': {}}
+        self._daylight = []
         try:
             result = self.header.search(tac)
             swa = tac[result.end():].replace('=', '')
@@ -155,7 +138,7 @@ class Decoder(tpg.Parser):
 
         try:
             self._expected = []
-            return super(Decoder, self).__call__(swa)
+            return self.parse('START', swa)
 
         except tpg.SyntacticError:
 
@@ -279,11 +262,9 @@ class Decoder(tpg.Parser):
 
     def daylight(self):
         #
-        # Determine solar sub-point on Earth at forecast/observed time.
-        fcsttime = self._ts.utc(*self.issueTime[:5])
-        subpoint = wgs84.geographic_position_of((self._Helios - self._Gaia).at(fcsttime))
-        self._affected['daylight'] = '%s %s' % (round(subpoint.latitude.degrees, 2),
-                                                round(subpoint.longitude.degrees, 2))
+        # The solar sub-points on Earth at the forecast/observed times are found together, when the advisory is
+        # finished
+        self._daylight.append((self._affected, tuple(self.issueTime[:5])))
 
     def fltlvls(self, s):
 
@@ -316,6 +297,18 @@ class Decoder(tpg.Parser):
         except AttributeError:
             pass
 
+        if self._daylight:
+            try:
+                subpoints = solarPosition.subpoints([minute for affected, minute in self._daylight])
+                for (affected, minute), (latitude, longitude) in zip(self._daylight, subpoints):
+                    affected['daylight'] = '%s %s' % (round(latitude, 2), round(longitude, 2))
+
+            except Exception:
+                self._Logger.exception('Unable to find the solar sub-point of DAYLIGHT SIDE')
+                self.swa['err_msg'] = 'Unable to find the solar sub-point of DAYLIGHT SIDE'
+
+            self._daylight = []
+
         return self.swa
 
 
@@ -21,13 +21,13 @@
 #
 import logging
 import re
-import xml.etree.ElementTree as ET
 
+from .common import Common
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
 
 
-class Encoder:
+class Encoder(Common.Reentrant):
     def __init__(self):
         #
         self._Logger = logging.getLogger(__name__)
@@ -46,7 +46,7 @@ class Encoder:
         except AssertionError as msg:  # pragma: no cover
             self._Logger.warning(msg)
 
-    def __call__(self, decodedSWA, tac):
+    def _encode(self, decodedSWA, tac):
         #
         self.decodedTAC = decodedSWA
         self.tacString = tac
@@ -65,7 +65,7 @@ class Encoder:
 
     def preamble(self):
         #
-        self.XMLDocument = ET.Element('SpaceWeatherAdvisory')
+        self.XMLDocument = self.ET.Element('SpaceWeatherAdvisory')
         #
         for prefix, uri in list(self.NameSpaces.items()):
             if prefix == '':
@@ -123,10 +123,10 @@ class Encoder:
         if self.nilPresent:
             return
 
-        child = ET.SubElement(self.XMLDocument, 'advisoryNumber')
+        child = self.ET.SubElement(self.XMLDocument, 'advisoryNumber')
         child.text = self.decodedTAC['advisoryNumber']
         try:
-            child = ET.Element('replacedAdvisoryNumber')
+            child = self.ET.Element('replacedAdvisoryNumber')
             child.text = self.decodedTAC['replacedNumber']
             self.XMLDocument.append(child)
 
@@ -136,38 +136,38 @@ class Encoder:
         # Space Weather Hazards
         for hazard in self.decodedTAC['phenomenon']:
 
-            child = ET.SubElement(self.XMLDocument, 'phenomenon')
+            child = self.ET.SubElement(self.XMLDocument, 'phenomenon')
             child.set('xlink:href', self.codes[des.SWX_PHENOMENA]['_'.join(hazard.split())][0])
 
     def issueTime(self, parent, timeStamp):
 
-        indent = ET.SubElement(parent, 'issueTime')
+        indent = self.ET.SubElement(parent, 'issueTime')
         if timeStamp is None:
             return
 
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = timeStamp['str']
 
     def swac(self, parent, centre):
 
-        indent = ET.SubElement(parent, 'issuingSpaceWeatherCentre')
+        indent = self.ET.SubElement(parent, 'issuingSpaceWeatherCentre')
         if centre is None:
             return
 
-        indent1 = ET.SubElement(indent, 'aixm:Unit')
+        indent1 = self.ET.SubElement(indent, 'aixm:Unit')
         indent1.set('gml:id', deu.getUUID())
 
-        indent2 = ET.SubElement(indent1, 'aixm:timeSlice')
-        indent3 = ET.SubElement(indent2, 'aixm:UnitTimeSlice')
+        indent2 = self.ET.SubElement(indent1, 'aixm:timeSlice')
+        indent3 = self.ET.SubElement(indent2, 'aixm:UnitTimeSlice')
         indent3.set('gml:id', deu.getUUID())
-        indent4 = ET.SubElement(indent3, 'gml:validTime')
-        indent4 = ET.SubElement(indent3, 'aixm:interpretation')
+        indent4 = self.ET.SubElement(indent3, 'gml:validTime')
+        indent4 = self.ET.SubElement(indent3, 'aixm:interpretation')
         indent4.text = 'SNAPSHOT'
-        indent4 = ET.SubElement(indent3, 'aixm:type')
+        indent4 = self.ET.SubElement(indent3, 'aixm:type')
         indent4.text = 'OTHER:SWXC'
-        indent4 = ET.SubElement(indent3, 'aixm:designator')
+        indent4 = self.ET.SubElement(indent3, 'aixm:designator')
         indent4.text = centre
 
     def observations(self):
@@ -184,28 +184,28 @@ class Encoder:
 
     def result(self, parent, token):
 
-        indent = ET.SubElement(parent, 'analysis')
-        indent1 = ET.SubElement(indent, 'SpaceWeatherAnalysis')
+        indent = self.ET.SubElement(parent, 'analysis')
+        indent1 = self.ET.SubElement(indent, 'SpaceWeatherAnalysis')
         indent1.set('gml:id', deu.getUUID())
         indent1.set('timeIndicator', token['timeIndicator'])
         self.itime(indent1, token['phenomenonTime'])
 
         if 'noswxexp' in token:
 
-            indent2 = ET.SubElement(indent1, 'region')
+            indent2 = self.ET.SubElement(indent1, 'region')
             indent2.set('nilReason', self.codes[des.NIL][des.NOOPRSIG][0])
 
         elif 'notavail' in token:
 
-            indent2 = ET.SubElement(indent1, 'region')
+            indent2 = self.ET.SubElement(indent1, 'region')
             indent2.set('nilReason', self.codes[des.NIL][des.MSSG][0])
 
         elif 'daylight' in token:
 
-            indent2 = ET.SubElement(indent1, 'region')
-            indent3 = ET.SubElement(indent2, 'SpaceWeatherRegion')
+            indent2 = self.ET.SubElement(indent1, 'region')
+            indent3 = self.ET.SubElement(indent2, 'SpaceWeatherRegion')
             indent3.set('gml:id', deu.getUUID())
-            indent4 = ET.SubElement(indent3, 'location')
+            indent4 = self.ET.SubElement(indent3, 'location')
             try:
                 result = self._fltLvls.match(token['fltlevels'])
                 self.airspaceVolume(indent4, token, result.groupdict())
@@ -213,20 +213,20 @@ class Encoder:
             except KeyError:
                 self.airspaceVolume(indent4, token)
 
-            indent4 = ET.SubElement(indent3, 'locationIndicator')
+            indent4 = self.ET.SubElement(indent3, 'locationIndicator')
             indent4.set('xlink:href', self.codes[des.SWX_LOCATION][des.DAYLIGHTSIDE][0])
 
         for affectedRegion in token.get('boundingBoxes', []):
 
-            indent2 = ET.SubElement(indent1, 'region')
+            indent2 = self.ET.SubElement(indent1, 'region')
             regions, uuidString = affectedRegion[-2:]
 
             if uuidString[0] == '#':
                 indent2.set('xlink:href', uuidString)
                 continue
 
-            indent3 = ET.SubElement(indent2, 'SpaceWeatherRegion')
-            indent4 = ET.SubElement(indent3, 'location')
+            indent3 = self.ET.SubElement(indent2, 'SpaceWeatherRegion')
+            indent4 = self.ET.SubElement(indent3, 'location')
             indent3.set('gml:id', uuidString)
 
             try:
@@ -237,7 +237,7 @@ class Encoder:
                 self.airspaceVolume(indent4, affectedRegion)
 
             for band in regions:
-                indent4 = ET.SubElement(indent3, 'locationIndicator')
+                indent4 = self.ET.SubElement(indent3, 'locationIndicator')
                 try:
                     indent4.set('xlink:href', self.codes[des.SWX_LOCATION][band][0])
                 except KeyError:
@@ -245,10 +245,10 @@ class Encoder:
 
     def airspaceVolume(self, parent, token, fltlvls=None):
 
-        indent1 = ET.SubElement(parent, 'AirspaceVolume')
+        indent1 = self.ET.SubElement(parent, 'AirspaceVolume')
         indent1.set('xmlns', self.NameSpaces['aixm'])
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.Element('upperLimit')
+        indent2 = self.ET.Element('upperLimit')
         indent2.set('uom', 'FL')
         #
         # If flight levels were set
@@ -258,63 +258,63 @@ class Encoder:
             if indent2.text is not None:
 
                 indent1.append(indent2)
-                indent2 = ET.SubElement(indent1, 'upperLimitReference')
+                indent2 = self.ET.SubElement(indent1, 'upperLimitReference')
                 indent2.text = 'STD'
 
             if fltlvls['abv']:
 
-                indent2 = ET.SubElement(indent1, 'maximumLimit')
+                indent2 = self.ET.SubElement(indent1, 'maximumLimit')
                 indent2.set('nilReason', 'unknown')
                 indent2.set('xsi:nil', 'true')
 
             elif fltlvls['lwr'] is not None:
 
-                indent2 = ET.SubElement(indent1, 'lowerLimit')
+                indent2 = self.ET.SubElement(indent1, 'lowerLimit')
                 indent2.set('uom', 'FL')
                 indent2.text = fltlvls['lwr']
-                indent2 = ET.SubElement(indent1, 'lowerLimitReference')
+                indent2 = self.ET.SubElement(indent1, 'lowerLimitReference')
                 indent2.text = 'STD'
 
         except TypeError:
             pass
 
-        indent2 = ET.SubElement(indent1, 'horizontalProjection')
-        indent3 = ET.SubElement(indent2, 'Surface')
+        indent2 = self.ET.SubElement(indent1, 'horizontalProjection')
+        indent3 = self.ET.SubElement(indent2, 'Surface')
         indent3.set('srsDimension', des.srsDimension)
         indent3.set('srsName', des.srsName)
         indent3.set('axisLabels', des.axisLabels)
         indent3.set('gml:id', deu.getUUID())
-        indent4 = ET.SubElement(indent3, 'patches')
+        indent4 = self.ET.SubElement(indent3, 'patches')
         indent4.set('xmlns', self.NameSpaces['gml'])
-        indent5 = ET.SubElement(indent4, 'PolygonPatch')
-        indent6 = ET.SubElement(indent5, 'exterior')
+        indent5 = self.ET.SubElement(indent4, 'PolygonPatch')
+        indent6 = self.ET.SubElement(indent5, 'exterior')
 
         if 'daylight' in token:
-            indent7 = ET.SubElement(indent6, 'Ring')
-            indent8 = ET.SubElement(indent7, 'curveMember')
-            indent9 = ET.SubElement(indent8, 'Curve')
+            indent7 = self.ET.SubElement(indent6, 'Ring')
+            indent8 = self.ET.SubElement(indent7, 'curveMember')
+            indent9 = self.ET.SubElement(indent8, 'Curve')
             indent9.set('gml:id', deu.getUUID())
-            indent10 = ET.SubElement(indent9, 'segments')
-            indent11 = ET.SubElement(indent10, 'CircleByCenterPoint')
+            indent10 = self.ET.SubElement(indent9, 'segments')
+            indent11 = self.ET.SubElement(indent10, 'CircleByCenterPoint')
             indent11.set('numArc', '1')
-            indent12 = ET.SubElement(indent11, 'pos')
+            indent12 = self.ET.SubElement(indent11, 'pos')
             indent12.text = token['daylight']
-            indent12 = ET.SubElement(indent11, 'radius')
+            indent12 = self.ET.SubElement(indent11, 'radius')
             indent12.text = des.DAYLIGHTSIDE_RADIUS
             indent12.set('uom', des.DAYLIGHTSIDE_UOM)
 
         else:
-            indent7 = ET.SubElement(indent6, 'LinearRing')
-            indent8 = ET.SubElement(indent7, 'posList')
+            indent7 = self.ET.SubElement(indent6, 'LinearRing')
+            indent8 = self.ET.SubElement(indent7, 'posList')
             indent8.set('count', token[0])
             indent8.text = token[1]
 
     def itime(self, parent, dtg):
 
-        indent = ET.SubElement(parent, 'phenomenonTime')
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent = self.ET.SubElement(parent, 'phenomenonTime')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = dtg
 
     def postContent(self):
@@ -322,7 +322,7 @@ class Encoder:
         if self.nilPresent:
             return
 
-        indent = ET.SubElement(self.XMLDocument, 'remarks')
+        indent = self.ET.SubElement(self.XMLDocument, 'remarks')
         if self.decodedTAC['remarks'] == 'NIL':
             indent.set('nilReason', self.codes[des.NIL][des.NA][0])
             indent.set('xsi:nil', 'true')
@@ -330,12 +330,12 @@ class Encoder:
         else:
             indent.text = self.decodedTAC['remarks']
 
-        indent = ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
+        indent = self.ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
         try:
 
-            indent1 = ET.Element('gml:TimeInstant')
+            indent1 = self.ET.Element('gml:TimeInstant')
             indent1.set('gml:id', deu.getUUID())
-            indent2 = ET.SubElement(indent1, 'gml:timePosition')
+            indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
             indent2.text = self.decodedTAC['nextAdvisory']['str']
             if self.decodedTAC['nextAdvisory']['before']:
                 indent2.set('indeterminatePosition', 'before')
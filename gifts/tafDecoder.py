@@ -26,6 +26,7 @@ import logging
 import re
 import time
 
+from .common import Common
 from .common import tpg
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
@@ -36,10 +37,11 @@ class CAVOKError(SyntaxError):
     pass
 
 
-class Decoder(tpg.Parser):
+class Decoder(Common.ReentrantDecoder, tpg.Parser):
     r"""
     set lexer = ContextSensitiveLexer
     set lexer_dotall = True
+    set predict = True
 
     separator spaces:    '\s+' ;
     token prefix: 'TAF(\s+(AMD|COR))?' ;
@@ -106,7 +108,7 @@ class Decoder(tpg.Parser):
         super(Decoder, self).__init__()
         self._Logger = logging.getLogger(__name__)
 
-    def __call__(self, tac):
+    def _decode(self, tac):
 
         self._taf = {'bbb': '',
                      'translationTime': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
@@ -134,7 +136,7 @@ class Decoder(tpg.Parser):
 
         try:
             self._expected = []
-            return super(Decoder, self).__call__(tac)
+            return self.parse('START', tac)
 
         except tpg.SyntacticError:
 
@@ -198,6 +200,10 @@ class Decoder(tpg.Parser):
             self._expected.append(name)
             raise
 
+    def missCSL(self, names):
+        'Overrides super definition'
+        self._expected.extend(names)
+
     def finish(self, reportCavokErrors=True):
         """Called by the parser at the end of work"""
 
@@ -25,7 +25,6 @@ import logging
 import sys
 import re
 import time
-import xml.etree.ElementTree as ET
 
 from .common import Common
 from .common import xmlConfig as des
@@ -62,7 +61,7 @@ class Encoder(Common.Base):
 
         setattr(self, 'obv', self.pcp)
 
-    def __call__(self, decodedTaf, tac):
+    def _encode(self, decodedTaf, tac):
         #
         decodingError = 'err_msg' in decodedTaf
         self.decodedTAC = decodedTaf
@@ -71,7 +70,7 @@ class Encoder(Common.Base):
         self.canceled = False
         #
         # Root element
-        self.XMLDocument = ET.Element('iwxxm:TAF')
+        self.XMLDocument = self.ET.Element('iwxxm:TAF')
         #
         for prefix, uri in self.NameSpaces.items():
             if prefix == '':
@@ -120,11 +119,12 @@ class Encoder(Common.Base):
         self.aerodrome(self.XMLDocument, self.decodedTAC.get('ident', None))
 
         if self.canceled:
-            self.vtime(ET.SubElement(self.XMLDocument, 'iwxxm:cancelledReportValidPeriod'), self.decodedTAC['vtime'])
+            self.vtime(self.ET.SubElement(self.XMLDocument, 'iwxxm:cancelledReportValidPeriod'),
+                       self.decodedTAC['vtime'])
             return self.XMLDocument
 
         try:
-            self.vtime(ET.SubElement(self.XMLDocument, 'iwxxm:validPeriod'), self.decodedTAC['vtime'])
+            self.vtime(self.ET.SubElement(self.XMLDocument, 'iwxxm:validPeriod'), self.decodedTAC['vtime'])
             self.entireValidTimeID = self.validTimeID
         #
         # No valid time for NIL TAF
@@ -165,36 +165,36 @@ class Encoder(Common.Base):
 
     def itime(self, parent, token):
 
-        indent1 = ET.SubElement(parent, 'iwxxm:issueTime')
+        indent1 = self.ET.SubElement(parent, 'iwxxm:issueTime')
         if token is None:
             return
 
-        indent2 = ET.SubElement(indent1, 'gml:TimeInstant')
+        indent2 = self.ET.SubElement(indent1, 'gml:TimeInstant')
         indent2.set('gml:id', deu.getUUID())
-        indent3 = ET.SubElement(indent2, 'gml:timePosition')
+        indent3 = self.ET.SubElement(indent2, 'gml:timePosition')
         indent3.text = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(token['value']))
 
     def vtime(self, parent, token):
 
-        indent = ET.SubElement(parent, 'gml:TimePeriod')
+        indent = self.ET.SubElement(parent, 'gml:TimePeriod')
         indent.set('gml:id', deu.getUUID())
 
-        indent1 = ET.SubElement(indent, 'gml:beginPosition')
+        indent1 = self.ET.SubElement(indent, 'gml:beginPosition')
         indent1.text = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(token['from']))
-        indent1 = ET.SubElement(indent, 'gml:endPosition')
+        indent1 = self.ET.SubElement(indent, 'gml:endPosition')
         indent1.text = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(token['to']))
 
         self.validTimeID = '#%s' % indent.get('gml:id')
 
     def baseFcst(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:baseForecast')
+        indent = self.ET.SubElement(parent, 'iwxxm:baseForecast')
         if self.nilPresent:
             indent.set('nilReason', self.codes[des.NIL][des.MSSG][0])
             return
 
-        indent1 = ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeForecast')
-        indent2 = ET.SubElement(indent1, 'iwxxm:phenomenonTime')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeForecast')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:phenomenonTime')
         indent2.set('xlink:href', self.entireValidTimeID)
         #
         # Finally the "base" forecast
@@ -206,9 +206,9 @@ class Encoder(Common.Base):
             fcsts = [fcsts]
 
         for token in fcsts:
-            indent = ET.SubElement(parent, 'iwxxm:changeForecast')
-            indent1 = ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeForecast')
-            self.vtime(ET.SubElement(indent1, 'iwxxm:phenomenonTime'), token['time'])
+            indent = self.ET.SubElement(parent, 'iwxxm:changeForecast')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:MeteorologicalAerodromeForecast')
+            self.vtime(self.ET.SubElement(indent1, 'iwxxm:phenomenonTime'), token['time'])
             self.result(indent1, token)
 
     def result(self, parent, token, baseFcst=False):
@@ -248,33 +248,33 @@ class Encoder(Common.Base):
 
     def wind(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:surfaceWind')
-        indent1 = ET.Element('iwxxm:AerodromeSurfaceWindForecast')
+        indent = self.ET.SubElement(parent, 'iwxxm:surfaceWind')
+        indent1 = self.ET.Element('iwxxm:AerodromeSurfaceWindForecast')
         if token['str'].startswith('VRB'):
             indent1.set('variableWindDirection', 'true')
         else:
             indent1.set('variableWindDirection', 'false')
-            indent2 = ET.SubElement(indent1, 'iwxxm:meanWindDirection')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:meanWindDirection')
             indent2.text = token['dd']
             indent2.set('uom', 'deg')
 
-        indent2 = ET.SubElement(indent1, 'iwxxm:meanWindSpeed')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:meanWindSpeed')
         indent2.text = token['ff']
         indent2.set('uom', token['uom'])
 
         if 'ffplus' in token:
 
-            indent2 = ET.SubElement(indent1, 'iwxxm:meanWindSpeedOperator')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:meanWindSpeedOperator')
             indent2.text = 'ABOVE'
 
         try:
-            indent2 = ET.Element('iwxxm:windGustSpeed')
+            indent2 = self.ET.Element('iwxxm:windGustSpeed')
             indent2.text = token['gg']
             indent2.set('uom', token['uom'])
             indent1.append(indent2)
             if 'ggplus' in token:
 
-                indent2 = ET.SubElement(indent1, 'iwxxm:windGustSpeedOperator')
+                indent2 = self.ET.SubElement(indent1, 'iwxxm:windGustSpeedOperator')
                 indent2.text = 'ABOVE'
 
         except (KeyError, ValueError):
@@ -285,11 +285,11 @@ class Encoder(Common.Base):
 
     def vsby(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:prevailingVisibility')
+        indent = self.ET.SubElement(parent, 'iwxxm:prevailingVisibility')
         indent.set('uom', token['uom'])
         indent.text = token['value']
         if token['value'] == '10000':
-            indent = ET.SubElement(parent, 'iwxxm:prevailingVisibilityOperator')
+            indent = self.ET.SubElement(parent, 'iwxxm:prevailingVisibilityOperator')
             indent.text = 'ABOVE'
 
     def pcp(self, parent, token):
@@ -297,7 +297,7 @@ class Encoder(Common.Base):
             #
             # Search BUFR table
             try:
-                indent = ET.SubElement(parent, 'iwxxm:weather')
+                indent = self.ET.SubElement(parent, 'iwxxm:weather')
                 uri, title = self.codes[des.WEATHER][ww]
                 indent.set('xlink:href', uri)
                 if (des.TITLES & des.Weather):
@@ -312,13 +312,13 @@ class Encoder(Common.Base):
 
     def sky(self, parent, token):
 
-        indent = ET.SubElement(parent, 'iwxxm:cloud')
+        indent = self.ET.SubElement(parent, 'iwxxm:cloud')
         for numberLyr, layer in enumerate(token['str'].split()):
             if layer[:2] == 'VV':
 
-                indent1 = ET.SubElement(indent, 'iwxxm:AerodromeCloudForecast')
+                indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeCloudForecast')
                 indent1.set('gml:id', deu.getUUID())
-                indent2 = ET.SubElement(indent1, 'iwxxm:verticalVisibility')
+                indent2 = self.ET.SubElement(indent1, 'iwxxm:verticalVisibility')
 
                 try:
                     height = int(layer[2:]) * 100
@@ -335,38 +335,38 @@ class Encoder(Common.Base):
 
             else:
                 if numberLyr == 0:
-                    indent1 = ET.SubElement(indent, 'iwxxm:AerodromeCloudForecast')
+                    indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeCloudForecast')
                     indent1.set('gml:id', deu.getUUID())
 
                 self.doCloudLayer(indent1, layer)
 
     def doCloudLayer(self, parent, layer):
 
-        indent = ET.SubElement(parent, 'iwxxm:layer')
-        indent1 = ET.SubElement(indent, 'iwxxm:CloudLayer')
+        indent = self.ET.SubElement(parent, 'iwxxm:layer')
+        indent1 = self.ET.SubElement(indent, 'iwxxm:CloudLayer')
         desc = self._re_cloudLyr.match(layer)
 
         amount = desc.group('AMT')
-        indent2 = ET.SubElement(indent1, 'iwxxm:amount')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:amount')
         uri, title = self.codes[des.CLDAMTS][amount]
         indent2.set('xlink:href', uri)
         if (des.TITLES & des.CloudAmt):
             indent2.set('xlink:title', title)
 
-        indent2 = ET.SubElement(indent1, 'iwxxm:base')
+        indent2 = self.ET.SubElement(indent1, 'iwxxm:base')
         indent2.set('uom', '[ft_i]')
         height = int(desc.group('HGT')) * 100
         indent2.text = str(height)
 
         if layer.endswith('CB'):
-            indent2 = ET.SubElement(indent1, 'iwxxm:cloudType')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:cloudType')
             uri, title = self.codes[des.CVCTNCLDS]['CB']
             indent2.set('xlink:href', uri)
             if (des.TITLES & des.CloudType):
                 indent2.set('xlink:title', title)
 
         if layer.endswith('TCU'):
-            indent2 = ET.SubElement(indent1, 'iwxxm:cloudType')
+            indent2 = self.ET.SubElement(indent1, 'iwxxm:cloudType')
             uri, title = self.codes[des.CVCTNCLDS]['TCU']
             indent2.set('xlink:href', uri)
             if (des.TITLES & des.CloudType):
@@ -376,20 +376,20 @@ class Encoder(Common.Base):
 
         for maxTemp, minTemp in zip(token['max'], token['min']):
 
-            indent = ET.SubElement(parent, 'iwxxm:temperature')
-            indent1 = ET.SubElement(indent, 'iwxxm:AerodromeAirTemperatureForecast')
+            indent = self.ET.SubElement(parent, 'iwxxm:temperature')
+            indent1 = self.ET.SubElement(indent, 'iwxxm:AerodromeAirTemperatureForecast')
 
             elementName = 'iwxxm:maximumAirTemperature'
             for xTemp in [maxTemp, minTemp]:
 
-                value = ET.SubElement(indent1, elementName)
+                value = self.ET.SubElement(indent1, elementName)
                 value.text = str(xTemp['value'])
                 value.set('uom', 'Cel')
 
-                timeStamp = ET.SubElement(indent1, '%sTime' % elementName)
-                timeStamp1 = ET.SubElement(timeStamp, 'gml:TimeInstant')
+                timeStamp = self.ET.SubElement(indent1, '%sTime' % elementName)
+                timeStamp1 = self.ET.SubElement(timeStamp, 'gml:TimeInstant')
                 timeStamp1.set('gml:id', deu.getUUID())
-                timeStamp2 = ET.SubElement(timeStamp1, 'gml:timePosition')
+                timeStamp2 = self.ET.SubElement(timeStamp1, 'gml:timePosition')
                 timeStamp2.text = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(xTemp['at']))
 
                 elementName = 'iwxxm:minimumAirTemperature'
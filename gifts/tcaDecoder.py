@@ -26,11 +26,12 @@ import logging
 import time
 import re
 
+from .common import Common
 from .common import tpg
 from .common import xmlUtilities as deu
 
 
-class Decoder(tpg.Parser):
+class Decoder(Common.ReentrantDecoder, tpg.Parser):
     r"""
     set lexer = ContextSensitiveLexer
     set lexer_dotall = True
@@ -103,7 +104,7 @@ class Decoder(tpg.Parser):
         self._Logger = logging.getLogger(__name__)
         return super(Decoder, self).__init__()
 
-    def __call__(self, tac):
+    def _decode(self, tac):
 
         self.tca = {'bbb': '',
                     'translationTime': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
@@ -126,7 +127,7 @@ class Decoder(tpg.Parser):
 
         try:
             self._expected = []
-            return super(Decoder, self).__call__(tca)
+            return self.parse('START', tca)
 
         except tpg.SyntacticError:
             if not self._is_a_test():
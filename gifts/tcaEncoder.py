@@ -20,13 +20,13 @@
 # Contact Info: Mark.Oberfield@gmail.com
 #
 import logging
-import xml.etree.ElementTree as ET
 
+from .common import Common
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
 
 
-class Encoder:
+class Encoder(Common.Reentrant):
     def __init__(self):
 
         self._Logger = logging.getLogger(__name__)
@@ -43,7 +43,7 @@ class Encoder:
         except AssertionError as msg:  # pragma: no cover
             self._Logger.warning(msg)
 
-    def __call__(self, decodedTCA, tac):
+    def _encode(self, decodedTCA, tac):
 
         self.decodedTAC = decodedTCA
         self.tacString = tac
@@ -61,7 +61,7 @@ class Encoder:
 
     def preamble(self):
 
-        self.XMLDocument = ET.Element('TropicalCycloneAdvisory')
+        self.XMLDocument = self.ET.Element('TropicalCycloneAdvisory')
         #
         for prefix, uri in list(self.NameSpaces.items()):
             if prefix == '':
@@ -119,45 +119,45 @@ class Encoder:
         if self.nilPresent:
             return
 
-        child = ET.SubElement(self.XMLDocument, 'tropicalCycloneName')
-        indent1 = ET.SubElement(child, 'TropicalCyclone')
+        child = self.ET.SubElement(self.XMLDocument, 'tropicalCycloneName')
+        indent1 = self.ET.SubElement(child, 'TropicalCyclone')
         indent1.set('xmlns', 'http://def.wmo.int/metce/2013')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'name')
+        indent2 = self.ET.SubElement(indent1, 'name')
         indent2.text = self.decodedTAC['cycloneName']
         #
-        child = ET.SubElement(self.XMLDocument, 'advisoryNumber')
+        child = self.ET.SubElement(self.XMLDocument, 'advisoryNumber')
         child.text = self.decodedTAC['advisoryNumber']
 
     def issueTime(self, parent, timeStamp):
 
-        indent = ET.SubElement(parent, 'issueTime')
+        indent = self.ET.SubElement(parent, 'issueTime')
         if timeStamp is None:
             return
 
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = timeStamp['str']
 
     def tcac(self, parent, centre):
 
-        indent = ET.SubElement(parent, 'issuingTropicalCycloneAdvisoryCentre')
+        indent = self.ET.SubElement(parent, 'issuingTropicalCycloneAdvisoryCentre')
         if centre is None:
             return
 
-        indent1 = ET.SubElement(indent, 'aixm:Unit')
+        indent1 = self.ET.SubElement(indent, 'aixm:Unit')
         indent1.set('gml:id', deu.getUUID())
 
-        indent2 = ET.SubElement(indent1, 'aixm:timeSlice')
-        indent3 = ET.SubElement(indent2, 'aixm:UnitTimeSlice')
+        indent2 = self.ET.SubElement(indent1, 'aixm:timeSlice')
+        indent3 = self.ET.SubElement(indent2, 'aixm:UnitTimeSlice')
         indent3.set('gml:id', deu.getUUID())
-        indent4 = ET.SubElement(indent3, 'gml:validTime')
-        indent4 = ET.SubElement(indent3, 'aixm:interpretation')
+        indent4 = self.ET.SubElement(indent3, 'gml:validTime')
+        indent4 = self.ET.SubElement(indent3, 'aixm:interpretation')
         indent4.text = 'SNAPSHOT'
-        indent4 = ET.SubElement(indent3, 'aixm:type')
+        indent4 = self.ET.SubElement(indent3, 'aixm:type')
         indent4.text = 'OTHER:TCAC'
-        indent4 = ET.SubElement(indent3, 'aixm:designator')
+        indent4 = self.ET.SubElement(indent3, 'aixm:designator')
         indent4.text = centre
 
     def observations(self):
@@ -175,17 +175,17 @@ class Encoder:
     def result(self, parent, token, fhr):
 
         if fhr == '0':
-            self.doObservedConditions(ET.SubElement(parent, 'observation'), token)
+            self.doObservedConditions(self.ET.SubElement(parent, 'observation'), token)
         else:
 
-            indent = ET.SubElement(parent, 'forecast')
-            indent1 = ET.SubElement(indent, 'TropicalCycloneForecastConditions')
+            indent = self.ET.SubElement(parent, 'forecast')
+            indent1 = self.ET.SubElement(indent, 'TropicalCycloneForecastConditions')
             indent1.set('gml:id', deu.getUUID())
             self.itime(indent1, token['dtg'])
             self.cyclonePosition(indent1, token)
 
             try:
-                indent2 = ET.SubElement(indent1, 'maximumSurfaceWindSpeed')
+                indent2 = self.ET.SubElement(indent1, 'maximumSurfaceWindSpeed')
                 indent2.text = token['windSpeed']['value']
                 indent2.set('uom', token['windSpeed']['uom'])
 
@@ -196,21 +196,21 @@ class Encoder:
 
     def itime(self, parent, dtg):
 
-        indent = ET.SubElement(parent, 'phenomenonTime')
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent = self.ET.SubElement(parent, 'phenomenonTime')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = dtg
 
     def cyclonePosition(self, parent, token):
 
-        indent = ET.SubElement(parent, 'tropicalCyclonePosition')
-        indent1 = ET.Element('gml:Point')
+        indent = self.ET.SubElement(parent, 'tropicalCyclonePosition')
+        indent1 = self.ET.Element('gml:Point')
         indent1.set('gml:id', deu.getUUID())
         indent1.set('axisLabels', des.axisLabels)
         indent1.set('srsName', des.srsName)
         indent1.set('srsDimension', des.srsDimension)
-        indent2 = ET.SubElement(indent1, 'gml:pos')
+        indent2 = self.ET.SubElement(indent1, 'gml:pos')
         try:
             indent2.text = token['position']
             indent.append(indent1)
@@ -221,44 +221,44 @@ class Encoder:
 
     def doObservedConditions(self, parent, token):
 
-        indent = ET.SubElement(parent, 'TropicalCycloneObservedConditions')
+        indent = self.ET.SubElement(parent, 'TropicalCycloneObservedConditions')
         indent.set('gml:id', deu.getUUID())
 
         self.itime(indent, token['dtg'])
         self.cyclonePosition(indent, token)
         for cb in self.decodedTAC['cbclouds']:
-            indent1 = ET.SubElement(indent, 'cumulonimbusCloudLocation')
+            indent1 = self.ET.SubElement(indent, 'cumulonimbusCloudLocation')
             self.airspaceVolume(indent1, cb)
 
-        indent1 = ET.SubElement(indent, 'movement')
+        indent1 = self.ET.SubElement(indent, 'movement')
         if 'movement' not in token:
             indent1.text = 'STATIONARY'
         else:
             indent1.text = 'MOVING'
-            indent1 = ET.SubElement(indent, 'movementDirection')
+            indent1 = self.ET.SubElement(indent, 'movementDirection')
             indent1.text = token['movement']['dir']
             indent1.set('uom', 'deg')
 
-            indent1 = ET.SubElement(indent, 'movementSpeed')
+            indent1 = self.ET.SubElement(indent, 'movementSpeed')
             indent1.text = token['movement']['spd']
             indent1.set('uom', token['movement']['uom'])
 
-        indent1 = ET.SubElement(indent, 'intensityChange')
+        indent1 = self.ET.SubElement(indent, 'intensityChange')
         indent1.text = {'INTSF': 'INTENSIFY', 'WKN': 'WEAKEN'}.get(self.decodedTAC['intstChange'], 'NO_CHANGE')
 
-        indent1 = ET.SubElement(indent, 'centralPressure')
+        indent1 = self.ET.SubElement(indent, 'centralPressure')
         indent1.text = self.decodedTAC['minimumPressure']['value']
         indent1.set('uom', self.decodedTAC['minimumPressure']['uom'])
 
-        indent1 = ET.SubElement(indent, 'maximumSurfaceWindSpeed')
+        indent1 = self.ET.SubElement(indent, 'maximumSurfaceWindSpeed')
         indent1.text = token['windSpeed']['value']
         indent1.set('uom', token['windSpeed']['uom'])
 
     def airspaceVolume(self, parent, token):
 
-        indent1 = ET.SubElement(parent, 'aixm:AirspaceVolume')
+        indent1 = self.ET.SubElement(parent, 'aixm:AirspaceVolume')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'aixm:upperLimit')
+        indent2 = self.ET.SubElement(indent1, 'aixm:upperLimit')
         if token['top']['cnd'] == 'BLW':
             indent2.set('nilReason', 'unknown')
             indent2.set('xsi:nil', 'true')
@@ -266,54 +266,54 @@ class Encoder:
             indent2.set('uom', 'FL')
             indent2.text = token['top']['lvl']
 
-        indent2 = ET.SubElement(indent1, 'aixm:upperLimitReference')
+        indent2 = self.ET.SubElement(indent1, 'aixm:upperLimitReference')
         indent2.text = 'STD'
 
         if token['top']['cnd'] == 'BLW':
-            indent2 = ET.SubElement(indent1, 'aixm:maximumLimit')
+            indent2 = self.ET.SubElement(indent1, 'aixm:maximumLimit')
             indent2.set('uom', 'FL')
             indent2.text = token['top']['lvl']
         elif token['top']['cnd'] == 'ABV':
-            indent2 = ET.SubElement(indent1, 'aixm:maximumLimit')
+            indent2 = self.ET.SubElement(indent1, 'aixm:maximumLimit')
             indent2.set('nilReason', 'unknown')
             indent2.set('xsi:nil', 'true')
         else:
-            indent2 = ET.SubElement(indent1, 'aixm:lowerLimit')
+            indent2 = self.ET.SubElement(indent1, 'aixm:lowerLimit')
             indent2.set('uom', 'FL')
             indent2.text = token['top']['lvl']
-            indent2 = ET.SubElement(indent1, 'aixm:lowerLimitReference')
+            indent2 = self.ET.SubElement(indent1, 'aixm:lowerLimitReference')
             indent2.text = 'STD'
 
-        indent2 = ET.SubElement(indent1, 'aixm:horizontalProjection')
-        indent3 = ET.SubElement(indent2, 'aixm:Surface')
+        indent2 = self.ET.SubElement(indent1, 'aixm:horizontalProjection')
+        indent3 = self.ET.SubElement(indent2, 'aixm:Surface')
         indent3.set('gml:id', deu.getUUID())
         indent3.set('axisLabels', des.axisLabels)
         indent3.set('srsName', des.srsName)
         indent3.set('srsDimension', des.srsDimension)
 
         if token['type'] == 'polygon':
-            indent4 = ET.SubElement(indent3, 'gml:patches')
-            indent5 = ET.SubElement(indent4, 'gml:PolygonPatch')
-            indent6 = ET.SubElement(indent5, 'gml:exterior')
-            indent7 = ET.SubElement(indent6, 'gml:LinearRing')
-            indent8 = ET.SubElement(indent7, 'gml:posList')
+            indent4 = self.ET.SubElement(indent3, 'gml:patches')
+            indent5 = self.ET.SubElement(indent4, 'gml:PolygonPatch')
+            indent6 = self.ET.SubElement(indent5, 'gml:exterior')
+            indent7 = self.ET.SubElement(indent6, 'gml:LinearRing')
+            indent8 = self.ET.SubElement(indent7, 'gml:posList')
             indent8.set('count', str(len(token['pnts'])))
             indent8.text = ' '.join(token['pnts'])
         else:
-            indent4 = ET.SubElement(indent3, 'patches')
+            indent4 = self.ET.SubElement(indent3, 'patches')
             indent4.set('xmlns', self.NameSpaces['gml'])
-            indent5 = ET.SubElement(indent4, 'PolygonPatch')
-            indent6 = ET.SubElement(indent5, 'exterior')
-            indent7 = ET.SubElement(indent6, 'Ring')
-            indent8 = ET.SubElement(indent7, 'curveMember')
-            indent9 = ET.SubElement(indent8, 'Curve')
+            indent5 = self.ET.SubElement(indent4, 'PolygonPatch')
+            indent6 = self.ET.SubElement(indent5, 'exterior')
+            indent7 = self.ET.SubElement(indent6, 'Ring')
+            indent8 = self.ET.SubElement(indent7, 'curveMember')
+            indent9 = self.ET.SubElement(indent8, 'Curve')
             indent9.set('gml:id', deu.getUUID())
-            indent10 = ET.SubElement(indent9, 'segments')
-            indent11 = ET.SubElement(indent10, 'CircleByCenterPoint')
+            indent10 = self.ET.SubElement(indent9, 'segments')
+            indent11 = self.ET.SubElement(indent10, 'CircleByCenterPoint')
             indent11.set('numArc', '1')
-            indent12 = ET.SubElement(indent11, 'pos')
+            indent12 = self.ET.SubElement(indent11, 'pos')
             indent12.text = self.decodedTAC['fcst']['0']['position']
-            indent12 = ET.SubElement(indent11, 'radius')
+            indent12 = self.ET.SubElement(indent11, 'radius')
             indent12.text = token['radius']
             indent12.set('uom', token['uom'])
 
@@ -322,7 +322,7 @@ class Encoder:
         if self.nilPresent:
             return
 
-        indent = ET.SubElement(self.XMLDocument, 'remarks')
+        indent = self.ET.SubElement(self.XMLDocument, 'remarks')
         if self.decodedTAC['remarks'] == 'NIL':
             indent.set('nilReason', self.codes[des.NIL][des.NA][0])
             indent.set('xsi:nil', 'true')
@@ -330,11 +330,11 @@ class Encoder:
         else:
             indent.text = self.decodedTAC['remarks']
 
-        indent = ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
+        indent = self.ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
         try:
-            indent1 = ET.Element('gml:TimeInstant')
+            indent1 = self.ET.Element('gml:TimeInstant')
             indent1.set('gml:id', deu.getUUID())
-            indent2 = ET.SubElement(indent1, 'gml:timePosition')
+            indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
             indent2.text = self.decodedTAC['nextdtg']['str']
             if self.decodedTAC['nextdtg']['before']:
                 indent2.set('indeterminatePosition', 'before')
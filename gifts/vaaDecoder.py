@@ -28,6 +28,7 @@ import math
 import time
 import re
 
+from .common import Common
 from .common import xmlUtilities as deu
 from .common import tpg
 
@@ -38,7 +39,7 @@ class MissingAirSpaceWinds(tpg.Error):
     pass
 
 
-class Decoder(tpg.Parser):
+class Decoder(Common.ReentrantDecoder, tpg.Parser):
     r"""
     set lexer = ContextSensitiveLexer
     set lexer_dotall = False
@@ -134,7 +135,7 @@ class Decoder(tpg.Parser):
         self._Logger = logging.getLogger(__name__)
         return super(Decoder, self).__init__()
 
-    def __call__(self, tac):
+    def _decode(self, tac):
 
         self.vaa = {'bbb': '',
                     'translationTime': time.strftime('%Y-%m-%dT%H:%M:%SZ'),
@@ -164,7 +165,7 @@ class Decoder(tpg.Parser):
 
         try:
             self._expected = []
-            return super(Decoder, self).__call__(vaa)
+            return self.parse('START', vaa)
 
         except tpg.SyntacticError:
 
@@ -20,13 +20,13 @@
 # Contact Info: Mark.Oberfield@gmail.com
 #
 import logging
-import xml.etree.ElementTree as ET
 
+from .common import Common
 from .common import xmlConfig as des
 from .common import xmlUtilities as deu
 
 
-class Encoder:
+class Encoder(Common.Reentrant):
     def __init__(self):
         #
         self._Logger = logging.getLogger(__name__)
@@ -40,7 +40,7 @@ class Encoder:
         except AssertionError as msg:
             self._Logger.warning(msg)
 
-    def __call__(self, decodedVAA, tac):
+    def _encode(self, decodedVAA, tac):
         #
         self.decodedTAC = decodedVAA
         self.tacString = tac
@@ -61,7 +61,7 @@ class Encoder:
     def preamble(self):
         #
         # The root element created here
-        self.XMLDocument = ET.Element('VolcanicAshAdvisory')
+        self.XMLDocument = self.ET.Element('VolcanicAshAdvisory')
         #
         for prefix, uri in self.NameSpaces.items():
             if prefix == '':
@@ -123,14 +123,14 @@ class Encoder:
         # Details about the volcano is set
         self.volcano(self.XMLDocument)
         #
-        child = ET.SubElement(self.XMLDocument, 'stateOrRegion')
+        child = self.ET.SubElement(self.XMLDocument, 'stateOrRegion')
         if 'UNKNOWN' not in self.decodedTAC['region']:
             child.text = self.decodedTAC['region']
         else:
             child.set('nilReason', self.codes[des.NIL][des.UNKNWN][0])
             child.set('xsi:nil', 'true')
 
-        child = ET.SubElement(self.XMLDocument, 'sourceElevationAMSL')
+        child = self.ET.SubElement(self.XMLDocument, 'sourceElevationAMSL')
         if self.decodedTAC['source'] is None:
             child.set('xsi:nil', 'true')
             child.set('nilReason', self.codes[des.NIL][des.UNKNWN][0])
@@ -138,13 +138,13 @@ class Encoder:
             child.text = self.decodedTAC['source']['elevation']
             child.set('uom', {'FT': '[ft_i]'}.get(self.decodedTAC['source']['uom'], 'm'))
 
-        child = ET.SubElement(self.XMLDocument, 'advisoryNumber')
+        child = self.ET.SubElement(self.XMLDocument, 'advisoryNumber')
         child.text = self.decodedTAC['advisoryNumber']
 
-        child = ET.SubElement(self.XMLDocument, 'informationSource')
+        child = self.ET.SubElement(self.XMLDocument, 'informationSource')
         child.text = self.decodedTAC['sources']
         #
-        child = ET.SubElement(self.XMLDocument, 'eruptionDetails')
+        child = self.ET.SubElement(self.XMLDocument, 'eruptionDetails')
         if 'UNKNOWN' in self.decodedTAC['details']:
             child.set('nilReason', self.codes[des.NIL][des.UNKNWN][0])
             child.set('xsi:nil', 'true')
@@ -154,64 +154,64 @@ class Encoder:
 
     def issueTime(self, parent, timeStamp):
 
-        indent = ET.SubElement(parent, 'issueTime')
+        indent = self.ET.SubElement(parent, 'issueTime')
         if timeStamp is None:
             return
 
-        indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+        indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'gml:timePosition')
+        indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
         indent2.text = timeStamp['str']
 
     def vaac(self, parent, centre):
 
-        indent = ET.SubElement(parent, 'issuingVolcanicAshAdvisoryCentre')
+        indent = self.ET.SubElement(parent, 'issuingVolcanicAshAdvisoryCentre')
         if centre is None:
             return
 
-        indent1 = ET.SubElement(indent, 'Unit')
+        indent1 = self.ET.SubElement(indent, 'Unit')
         indent1.set('gml:id', deu.getUUID())
         indent1.set('xmlns', self.NameSpaces['aixm'])
         self._vaacUUID = '#%s' % indent1.get('gml:id')
 
-        indent2 = ET.SubElement(indent1, 'timeSlice')
-        indent3 = ET.SubElement(indent2, 'UnitTimeSlice')
+        indent2 = self.ET.SubElement(indent1, 'timeSlice')
+        indent3 = self.ET.SubElement(indent2, 'UnitTimeSlice')
         indent3.set('gml:id', deu.getUUID())
-        indent4 = ET.SubElement(indent3, 'gml:validTime')
-        indent4 = ET.SubElement(indent3, 'interpretation')
+        indent4 = self.ET.SubElement(indent3, 'gml:validTime')
+        indent4 = self.ET.SubElement(indent3, 'interpretation')
         indent4.text = 'SNAPSHOT'
-        indent4 = ET.SubElement(indent3, 'name')
+        indent4 = self.ET.SubElement(indent3, 'name')
         indent4.text = centre
-        indent4 = ET.SubElement(indent3, 'type')
+        indent4 = self.ET.SubElement(indent3, 'type')
         indent4.text = 'OTHER:VAAC'
 
     def volcano(self, parent):
 
-        indent = ET.SubElement(parent, 'volcano')
-        indent1 = ET.SubElement(indent, 'EruptingVolcano')
+        indent = self.ET.SubElement(parent, 'volcano')
+        indent1 = self.ET.SubElement(indent, 'EruptingVolcano')
         indent1.set('xmlns', 'http://def.wmo.int/metce/2013')
         indent1.set('gml:id', deu.getUUID())
 
-        indent2 = ET.SubElement(indent1, 'name')
+        indent2 = self.ET.SubElement(indent1, 'name')
         indent2.text = self.decodedTAC['volcanoName']
 
-        indent2 = ET.SubElement(indent1, 'position')
+        indent2 = self.ET.SubElement(indent1, 'position')
         if 'UNKNOWN' in self.decodedTAC['volcanoLocation']:
             indent2.set('nilReason', self.codes[des.NIL][des.UNKNWN][0])
             indent2.set('xsi:nil', 'true')
 
         else:
-            indent3 = ET.SubElement(indent2, 'gml:Point')
+            indent3 = self.ET.SubElement(indent2, 'gml:Point')
             indent3.set('axisLabels', des.axisLabels)
             indent3.set('srsName', des.srsName)
             indent3.set('srsDimension', des.srsDimension)
             indent3.set('gml:id', deu.getUUID())
-            indent4 = ET.SubElement(indent3, 'gml:pos')
+            indent4 = self.ET.SubElement(indent3, 'gml:pos')
             indent4.text = self.decodedTAC['volcanoLocation']
         #
         # If an eruption datetime is provided
         try:
-            indent2 = ET.Element('eruptionDate')
+            indent2 = self.ET.Element('eruptionDate')
             indent2.text = self.decodedTAC['eruptionDate']
             indent1.append(indent2)
 
@@ -231,8 +231,8 @@ class Encoder:
 
     def observed(self, parent, layers):
 
-        indent = ET.SubElement(parent, 'observation')
-        indent1 = ET.SubElement(indent, 'VolcanicAshObservedOrEstimatedConditions')
+        indent = self.ET.SubElement(parent, 'observation')
+        indent1 = self.ET.SubElement(indent, 'VolcanicAshObservedOrEstimatedConditions')
         try:
             niltype = layers[0]['nil']
             if niltype == 'vanotid':
@@ -266,8 +266,8 @@ class Encoder:
             self.observed(parent, layers)
             return
 
-        indent = ET.SubElement(parent, 'forecast')
-        indent1 = ET.SubElement(indent, 'VolcanicAshForecastConditions')
+        indent = self.ET.SubElement(parent, 'forecast')
+        indent1 = self.ET.SubElement(indent, 'VolcanicAshForecastConditions')
         indent1.set('gml:id', deu.getUUID())
         try:
             nilType = layers[0]['nil']
@@ -298,36 +298,36 @@ class Encoder:
 
         for lyr in layers:
             try:
-                indent1 = ET.Element('wind')
-                indent2 = ET.SubElement(indent1, 'WindObservedOrEstimated')
+                indent1 = self.ET.Element('wind')
+                indent2 = self.ET.SubElement(indent1, 'WindObservedOrEstimated')
                 indent2.set('gml:id', deu.getUUID())
                 #
                 # Upper and lower bounds with AIXM
-                indent3 = ET.SubElement(indent2, 'verticalLayer')
-                indent4 = ET.SubElement(indent3, 'aixm:AirspaceLayer')
+                indent3 = self.ET.SubElement(indent2, 'verticalLayer')
+                indent4 = self.ET.SubElement(indent3, 'aixm:AirspaceLayer')
                 indent4.set('gml:id', deu.getUUID())
-                indent5 = ET.SubElement(indent4, 'aixm:upperLimit')
+                indent5 = self.ET.SubElement(indent4, 'aixm:upperLimit')
                 indent5.set('uom', 'FL')
                 if lyr['top'] is not None:
                     indent5.text = lyr['top']
                 else:
                     indent5.text = lyr['bottom']
 
-                indent5 = ET.SubElement(indent4, 'aixm:upperLimitReference')
+                indent5 = self.ET.SubElement(indent4, 'aixm:upperLimitReference')
                 indent5.text = 'STD'
 
-                indent5 = ET.SubElement(indent4, 'aixm:lowerLimit')
+                indent5 = self.ET.SubElement(indent4, 'aixm:lowerLimit')
                 #
                 # Flight level or SFC
                 if lyr['bottom'].isdigit():
                     indent5.text = lyr['bottom']
                     indent5.set('uom', 'FL')
-                    indent5 = ET.SubElement(indent4, 'aixm:lowerLimitReference')
+                    indent5 = self.ET.SubElement(indent4, 'aixm:lowerLimitReference')
                     indent5.text = 'STD'
 
                 else:
                     indent5.text = 'GND'
-                    indent5 = ET.SubElement(indent4, 'aixm:lowerLimitReference')
+                    indent5 = self.ET.SubElement(indent4, 'aixm:lowerLimitReference')
                     indent5.text = 'SFC'
 
             except KeyError:
@@ -339,13 +339,13 @@ class Encoder:
                     indent2.set('variableWindDirection', 'true')
                 else:
                     indent2.set('variableWindDirection', 'false')
-                    indent3 = ET.Element('windDirection')
+                    indent3 = self.ET.Element('windDirection')
                     indent3.text = lyr['dir']
                     indent3.set('uom', 'deg')
                     indent2.append(indent3)
                 #
                 # Mean wind speed
-                indent3 = ET.SubElement(indent2, 'windSpeed')
+                indent3 = self.ET.SubElement(indent2, 'windSpeed')
                 indent3.text = lyr['spd']
                 indent3.set('uom', lyr['uom'])
                 #
@@ -359,20 +359,20 @@ class Encoder:
 
         for lyr in layers:
 
-            indent1 = ET.SubElement(parent, 'ashCloud')
-            indent2 = ET.SubElement(indent1, elementName)
+            indent1 = self.ET.SubElement(parent, 'ashCloud')
+            indent2 = self.ET.SubElement(indent1, elementName)
             indent2.set('gml:id', deu.getUUID())
-            indent3 = ET.SubElement(indent2, 'ashCloudExtent')
+            indent3 = self.ET.SubElement(indent2, 'ashCloudExtent')
             self.airspaceVolume(indent3, lyr)
             #
             # Optional. Motion of the observed ash clouds
             try:
-                indent3 = ET.Element('directionOfMotion')
+                indent3 = self.ET.Element('directionOfMotion')
                 indent3.text = lyr['movement']['dir']
                 indent3.set('uom', 'deg')
                 indent2.append(indent3)
 
-                indent3 = ET.Element('speedOfMotion')
+                indent3 = self.ET.Element('speedOfMotion')
                 indent3.text = lyr['movement']['spd']
                 indent3.set('uom', lyr['movement']['uom'])
                 indent2.append(indent3)
@@ -382,44 +382,44 @@ class Encoder:
 
     def itime(self, parent, dtg):
 
-        indent = ET.SubElement(parent, 'phenomenonTime')
+        indent = self.ET.SubElement(parent, 'phenomenonTime')
 
         if dtg is None:
             indent.set('nilReason', self.codes[des.NIL][des.MSSG][0])
 
         else:
-            indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+            indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
             indent1.set('gml:id', deu.getUUID())
-            indent2 = ET.SubElement(indent1, 'gml:timePosition')
+            indent2 = self.ET.SubElement(indent1, 'gml:timePosition')
             indent2.text = dtg
 
     def airspaceVolume(self, parent, lyr):
         "Construct AIXM Airspace Volume"
 
-        indent1 = ET.SubElement(parent, 'aixm:AirspaceVolume')
+        indent1 = self.ET.SubElement(parent, 'aixm:AirspaceVolume')
         indent1.set('gml:id', deu.getUUID())
-        indent2 = ET.SubElement(indent1, 'aixm:upperLimit')
+        indent2 = self.ET.SubElement(indent1, 'aixm:upperLimit')
         try:
             indent2.text = lyr['top']
             indent2.set('uom', 'FL')
-            indent2 = ET.SubElement(indent1, 'aixm:upperLimitReference')
+            indent2 = self.ET.SubElement(indent1, 'aixm:upperLimitReference')
             indent2.text = 'STD'
 
         except KeyError:
             indent2.set('nilReason', des.MSSG)
             indent2.set('xsi:nil', 'true')
 
-        indent2 = ET.SubElement(indent1, 'aixm:lowerLimit')
+        indent2 = self.ET.SubElement(indent1, 'aixm:lowerLimit')
         try:
             if lyr['bottom'].isdigit():
                 indent2.text = lyr['bottom']
                 indent2.set('uom', 'FL')
-                indent2 = ET.SubElement(indent1, 'aixm:lowerLimitReference')
+                indent2 = self.ET.SubElement(indent1, 'aixm:lowerLimitReference')
                 indent2.text = 'STD'
 
             else:
                 indent2.text = 'GND'
-                indent2 = ET.SubElement(indent1, 'aixm:lowerLimitReference')
+                indent2 = self.ET.SubElement(indent1, 'aixm:lowerLimitReference')
                 indent2.text = 'SFC'
 
         except (AttributeError, KeyError):
@@ -428,18 +428,18 @@ class Encoder:
 
         if 'pnts' in lyr:
 
-            indent2 = ET.SubElement(indent1, 'aixm:horizontalProjection')
-            indent3 = ET.SubElement(indent2, 'aixm:Surface')
+            indent2 = self.ET.SubElement(indent1, 'aixm:horizontalProjection')
+            indent3 = self.ET.SubElement(indent2, 'aixm:Surface')
             indent3.set('gml:id', deu.getUUID())
             indent3.set('axisLabels', des.axisLabels)
             indent3.set('srsName', des.srsName)
             indent3.set('srsDimension', des.srsDimension)
 
-            indent4 = ET.SubElement(indent3, 'gml:patches')
-            indent5 = ET.SubElement(indent4, 'gml:PolygonPatch')
-            indent6 = ET.SubElement(indent5, 'gml:exterior')
-            indent7 = ET.SubElement(indent6, 'gml:LinearRing')
-            indent8 = ET.SubElement(indent7, 'gml:posList')
+            indent4 = self.ET.SubElement(indent3, 'gml:patches')
+            indent5 = self.ET.SubElement(indent4, 'gml:PolygonPatch')
+            indent6 = self.ET.SubElement(indent5, 'gml:exterior')
+            indent7 = self.ET.SubElement(indent6, 'gml:LinearRing')
+            indent8 = self.ET.SubElement(indent7, 'gml:posList')
             indent8.set('count', str(len(lyr['pnts'])))
             indent8.text = ' '.join(lyr['pnts'])
 
@@ -447,19 +447,19 @@ class Encoder:
         "Final bits of the advisory"
         #
         # Remarks
-        indent = ET.SubElement(self.XMLDocument, 'remarks')
+        indent = self.ET.SubElement(self.XMLDocument, 'remarks')
         if 'NIL' in self.decodedTAC['remarks']:
             indent.set('nilReason', self.codes[des.NIL][des.MSSG][0])
         else:
             indent.text = self.decodedTAC['remarks']
         #
         # Next advisory time, if there is one
-        indent = ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
+        indent = self.ET.SubElement(self.XMLDocument, 'nextAdvisoryTime')
         try:
-            indent2 = ET.Element('gml:timePosition')
+            indent2 = self.ET.Element('gml:timePosition')
             indent2.text = self.decodedTAC['nextdtg']['str']
 
-            indent1 = ET.SubElement(indent, 'gml:TimeInstant')
+            indent1 = self.ET.SubElement(indent, 'gml:TimeInstant')
             indent1.set('gml:id', deu.getUUID())
             indent1.append(indent2)
 
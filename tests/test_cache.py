@@ -0,0 +1,86 @@
+import re
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import gifts.METAR as ME
+from gifts.common import cache
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27'}
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_lruCache():
+
+    clock = Clock()
+    lru = cache.LRUCache(2, ttl=10., clock=clock)
+    lru['a'] = 1
+    lru['b'] = 2
+    assert lru['a'] == 1
+    lru['c'] = 3
+    assert 'b' not in lru and 'a' in lru and len(lru) == 2
+    assert lru.get('b') is None
+
+    clock.now = 10.
+    with pytest.raises(KeyError):
+        lru['a']
+
+    assert lru.stats() == {'hits': 1, 'misses': 2, 'evictions': 2, 'size': 1, 'maxsize': 2}
+    lru.clear()
+    assert lru.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2}
+
+    with pytest.raises(ValueError):
+        cache.LRUCache(0)
+
+
+def test_decodeCache():
+
+    text = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290000Z 33008KT 9999 FEW030
+      SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290000Z 33008KT 9999 FEW030 XXX 02/M03 Q1018="""
+
+    volatile = re.compile(r'uuid\.[-0-9a-f]{36}|(?<=Time=")[-0-9T:Z]+')
+    encoder = ME.Encoder(database)
+    expected = [volatile.sub('', ET.tostring(document, encoding='unicode')) for document in encoder.encode(text)]
+
+    decodeCache = encoder.cache_decodes(maxsize=16, ttl=60.)
+    for n in range(2):
+        documents = [volatile.sub('', ET.tostring(document, encoding='unicode'))
+                     for document in encoder.encode(text)]
+        assert documents == expected
+
+    assert decodeCache.stats() == {'hits': 4, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': 16}
+    assert encoder.cache_decodes(None) is None
+    assert encoder.decodeCache is None
+
+
+def test_decodeCacheDay(monkeypatch):
+    #
+    # A report of the 1st is of the next month once more than 25 days old
+    gmtime, strftime = time.gmtime, time.strftime
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    monkeypatch.setattr(time, 'gmtime', lambda seconds=None: gmtime(clock() if seconds is None else seconds))
+    monkeypatch.setattr(time, 'strftime', lambda fmt, tms=None: strftime(fmt, tms or time.gmtime()))
+
+    tac = 'METAR BIAR 011200Z 33008KT 9999 FEW030 02/M03 Q1018='
+    encoder = ME.Encoder(database)
+    encoder.cache_decodes(maxsize=16, ttl=None)
+    values = []
+    for day in (25, 27):
+        clock.now = time.mktime((2026, 10, day, 12, 0, 0, 0, 0, 0))
+        values.append(encoder._decode(tac)['itime']['value'])
+
+    assert values == ['2026-10-01T12:00:00Z', '2026-11-01T12:00:00Z']
+    assert encoder.decodeCache.stats()['misses'] == 2
@@ -0,0 +1,103 @@
+import os
+import shutil
+
+import pytest
+
+import gifts.metarEncoder as MetarEncoder
+from gifts.common import codeRegistry
+from gifts.common import xmlConfig as des
+
+NIL = 'codes.wmo.int-common-nil.rdf'
+
+
+@pytest.fixture
+def data(tmp_path):
+
+    src = tmp_path / 'data'
+    src.mkdir()
+    shutil.copy(os.path.join(des.CodesFilePath, NIL), str(src))
+    return src
+
+
+def test_snapshots(data, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(codeRegistry.sys, 'dont_write_bytecode', False)
+    fname = str(data / NIL)
+    snapshots = str(tmp_path / 'snapshots')
+    expected = codeRegistry.parseCodeList(fname)
+
+    registry = codeRegistry.CodeRegistry(str(data), snapshots)
+    codeList = registry.codeList(fname)
+    assert codeList == expected and codeList[des.UNKNWN][0] == 'http://codes.wmo.int/common/nil/unknown'
+    assert registry.codeList(fname) is codeList
+    with pytest.raises(TypeError):
+        codeList['new'] = ('', '')
+    #
+    # Another process loads the snapshot
+    registry = codeRegistry.CodeRegistry(str(data), snapshots)
+    assert registry.codeList(fname) == expected
+    assert registry.stats() == {'parsed': 0, 'snapshots': 1}
+    #
+    # ... still, once the RDF file is touched, as its contents are the same
+    st = os.stat(fname)
+    os.utime(fname, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    registry = codeRegistry.CodeRegistry(str(data), snapshots)
+    assert registry.codeList(fname) == expected
+    assert registry.stats() == {'parsed': 0, 'snapshots': 1}
+    #
+    # Changed, the RDF file is parsed again, in the running process too
+    with open(fname) as fh:
+        text = fh.read()
+    with open(fname, 'w') as fh:
+        fh.write(text.replace('>Unknown<', '>Not known<'))
+    os.utime(fname, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+
+    assert registry.codeList(fname)[des.UNKNWN][1] == 'Not known'
+    assert registry.stats() == {'parsed': 1, 'snapshots': 1}
+    assert codeRegistry.CodeRegistry(str(data), snapshots).codeList(fname)[des.UNKNWN][1] == 'Not known'
+
+
+def test_codeLists(data, monkeypatch):
+
+    monkeypatch.setattr(des, 'CodesSnapshotPath', None)
+    monkeypatch.setattr(codeRegistry, '_registries', {})
+
+    needed = [des.CLDAMTS]
+    codeLists = codeRegistry.codeLists(str(data), needed)
+    registry = codeRegistry.registry(str(data))
+    assert needed == [des.CLDAMTS, des.NIL] and list(codeLists) == [des.NIL]
+    assert registry.stats() == {'parsed': 0, 'snapshots': 0}
+    #
+    # Read when first requested, once per process
+    assert codeLists[des.NIL][des.NA][0] == 'http://codes.wmo.int/common/nil/inapplicable'
+    assert codeRegistry.codeLists(str(data), [])[des.NIL] is codeLists[des.NIL]
+    assert registry.stats() == {'parsed': 1, 'snapshots': 0}
+    with pytest.raises(KeyError):
+        codeLists[des.CLDAMTS]
+
+
+def test_loadAll(data, monkeypatch):
+
+    monkeypatch.setattr(des, 'CodesSnapshotPath', None)
+    monkeypatch.setattr(codeRegistry, '_registries', {})
+
+    codeLists = codeRegistry.codeLists(str(data), [])
+    assert codeLists.load_all() is codeLists
+    assert codeRegistry.registry(str(data)).stats() == {'parsed': 1, 'snapshots': 0}
+    assert des.NIL in codeLists._codeLists
+
+
+def test_dontWriteBytecode(data, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(codeRegistry.sys, 'dont_write_bytecode', True)
+    snapshots = tmp_path / 'snapshots'
+    registry = codeRegistry.CodeRegistry(str(data), str(snapshots))
+    assert registry.codeList(str(data / NIL))[des.NA][0] == 'http://codes.wmo.int/common/nil/inapplicable'
+    assert not snapshots.exists()
+
+
+def test_encoders():
+
+    first, second = MetarEncoder.Annex3(), MetarEncoder.Annex3()
+    assert first.codes[des.WEATHER] is second.codes[des.WEATHER]
+    assert 'TSRA' in first.codes[des.WEATHER]
@@ -0,0 +1,227 @@
+import asyncio
+import concurrent.futures
+import gzip
+import re
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import gifts.aio as aio
+import gifts.METAR as ME
+import gifts.SWA as SE
+import gifts.TAF as TE
+import gifts.metarDecoder as mD
+import gifts.tafDecoder as tD
+from gifts.common import codeRegistry
+from gifts.common import prefork
+from gifts.common import solarPosition
+from gifts.common import xmlConfig as des
+
+metars = ["""METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=""",
+          """SPECI USRR 290030Z 24005MPS 2000 0800NE R07/1200U -SN BR OVC004 M04/M05 Q1002 TEMPO 0600=""",
+          """METAR COR USTR 290000Z VRB02KT CAVOK 17/16 Q1012 RE// BECMG FM0100 TL0200 24010G20KT=""",
+          """METAR BIAR 290000Z 33008KT 9999 FEW030 02/M03 Q1018 RMK AO2=""",
+          """METAR BIAR 290000Z 33008KT 9999 FEW030 02/M03 1018=""",
+          """METAR BIAR 290000Z NIL=""",
+          """METAR BIAR 29000Z 33008KT CAVOK=""",
+          """METAR BIAR 290000Z 33008KT 9999
+          FEW030 XXX 02/M03 Q1018="""]
+
+tafs = ["""TAF SBAF 302130Z 3100/3124 15003KT 9000 SHRA FEW015CB SCT018 FM311200 VRB02KT 9999 VCSH SCT022=""",
+        """TAF AMD SBAF 072001Z 0715/0815 CNL=""",
+        """TAF SBAF 071500Z 0718/0806 01006G20KT CAVOK TEMPO 0718/0722 4000 TSRA BKN020CB=""",
+        """TAF SBAF 071500Z 0718/0806 00000KT 9999 FEW025 PROB30 0800/0806 0800 FG=""",
+        """TAF SBAF 071500Z 0718/0806 00000KT 9999 FEW025 BECMG 0720/07 NSC=""",
+        """TAF SBAF 072000Z NIL=""",
+        """TAF VHHH 311338Z COR=""",
+        """TAF SBAF 071500Z 0718/0806 00000KT FEW025="""]
+
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27',
+            'USRR': 'SURGUT|SGC|SURGUT|61.33 73.42  44',
+            'SBAF': 'AFONSOS|||-22.87 -43.38 33'}
+
+volatile = re.compile(r'uuid\.[-0-9a-f]{36}|(?<=Time=")[-0-9T:Z]+')
+
+
+def decodeAll(decoder, reports):
+
+    results = [decoder(tac) for tac in reports]
+    for result in results:
+        result.pop('translationTime')
+    return results
+
+
+def test_sharedDecoders():
+
+    switchInterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for decoder, reports in ((mD.Annex3(), metars), (tD.Decoder(), tafs)):
+
+            expected = decodeAll(decoder, reports)
+            assert any('err_msg' in result for result in expected)
+            assert any('err_msg' not in result for result in expected)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                shifts = [n % len(reports) for n in range(64)]
+                futures = [executor.submit(decodeAll, decoder, reports[n:] + reports[:n]) for n in shifts]
+                for n, future in zip(shifts, futures):
+                    assert future.result() == expected[n:] + expected[:n]
+    finally:
+        sys.setswitchinterval(switchInterval)
+
+
+def encodeAll(encoder, bulletins):
+
+    results = []
+    for text in bulletins:
+        for document in encoder.encode(text):
+            results.append(volatile.sub('', ET.tostring(document, encoding='unicode')))
+    return results
+
+
+def test_sharedEncoders():
+
+    switchInterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for encoder, ahl, reports in ((ME.Encoder(database), 'SAXX99 XXXX 290000\n', metars),
+                                      (TE.Encoder(database), 'FTXX99 XXXX 290000\n', tafs)):
+
+            bulletins = [ahl + tac for tac in reports]
+            expected = encodeAll(encoder, bulletins)
+            assert expected
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(encodeAll, encoder, bulletins) for n in range(32)]
+                for future in futures:
+                    assert future.result() == expected
+    finally:
+        sys.setswitchinterval(switchInterval)
+
+
+def test_encodeMany():
+
+    encoder = ME.Encoder(database)
+    bulletins = ['SAXX99 XXXX 290000\n' + tac for tac in metars]
+    messages = bulletins[:4] + [(text, '2026-09-29T00:01:00Z') for text in bulletins[4:]]
+
+    expected = [encoder.encode(text, receiptTime) for text, receiptTime in
+                [(text, None) for text in bulletins[:4]] + messages[4:]]
+    expected = [[volatile.sub('', ET.tostring(document, encoding='unicode')) for document in bulletin]
+                for bulletin in expected]
+
+    for executor in ('thread', 'process'):
+        for chunksize in (1, 3):
+            results = [[volatile.sub('', ET.tostring(document, encoding='unicode')) for document in bulletin]
+                       for bulletin in encoder.encode_many(iter(messages), workers=2, executor=executor,
+                                                           chunksize=chunksize)]
+            assert results == expected
+
+            results = [[volatile.sub('', ET.tostring(document, encoding='unicode')) for document in bulletin]
+                       for bulletin in encoder.encode_many(messages, workers=2, executor=executor, ordered=False,
+                                                           chunksize=chunksize)]
+            assert sorted(results) == sorted(expected)
+
+    with pytest.raises(ValueError):
+        next(encoder.encode_many(messages, executor='fork'))
+
+
+def test_preforkPool():
+
+    encoders = {'METAR': ME.Encoder(database), 'TAF': TE.Encoder(database)}
+    with prefork.PreforkPool(encoders, workers=2) as pool:
+
+        for name, ahl, reports in (('METAR', 'SAXX99 XXXX 290000\n', metars), ('TAF', 'FTXX99 XXXX 290000\n', tafs)):
+            bulletins = [ahl + tac for tac in reports]
+            futures = [pool.submit(name, text) for text in bulletins]
+            for text, future in zip(bulletins, futures):
+                result = [volatile.sub('', ET.tostring(document, encoding='unicode')) for document in future.result()]
+                expected = [volatile.sub('', ET.tostring(document, encoding='unicode'))
+                            for document in encoders[name].encode(text)]
+                assert result == expected
+
+        assert len(pool.encode('METAR', 'SAXX99 XXXX 290000\n' + metars[0])) == 1
+        with pytest.raises(KeyError):
+            pool.submit('VAA', metars[0])
+
+
+def test_preforkPreload(monkeypatch):
+    #
+    # The code lists are read in the parent, before its objects are frozen and its workers forked
+    monkeypatch.setattr(codeRegistry, '_registries', {})
+    encoder = ME.Encoder(database)
+    codes = encoder.encoder.codes
+    assert codes._codeLists == {}
+
+    with prefork.PreforkPool({'METAR': encoder}, workers=1):
+        assert sorted(codes._codeLists) == sorted(codes)
+
+
+def test_preforkEphemeris(monkeypatch):
+    #
+    # ... and the Skyfield ephemeris, for the DAYLIGHT SIDE of the SWA encoders
+    monkeypatch.setattr(solarPosition, '_ephemeris', None)
+    encoder = SE.Encoder()
+    assert not solarPosition.stats()['loaded']
+
+    monkeypatch.setattr(des, 'SOLAR_ENGINE', 'analytic')
+    with prefork.PreforkPool({'SWA': encoder}, workers=1):
+        assert not solarPosition.stats()['loaded']
+
+    monkeypatch.setattr(des, 'SOLAR_ENGINE', 'skyfield')
+    with prefork.PreforkPool({'SWA': encoder}, workers=1):
+        assert solarPosition.stats()['loaded']
+
+
+class Counting(object):
+    """Encoder wrapper recording the largest number of encode() calls at once"""
+
+    def __init__(self, encoder):
+
+        self.encoder = encoder
+        self.lock = threading.Lock()
+        self.running = self.most = 0
+
+    def encode(self, text, receiptTime=None):
+
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+        try:
+            time.sleep(0.01)
+            return self.encoder.encode(text, receiptTime)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_aio(tmp_path):
+
+    counting = Counting(ME.Encoder(database))
+    executor = concurrent.futures.ThreadPoolExecutor(8)
+    encoder = aio.Encoder(counting, limit=3, executor=executor)
+    bulletins = ['SAXX99 XXXX 290000\n' + tac for tac in metars]
+
+    async def main():
+        results = await asyncio.gather(*[encoder.encode_and_write(text, obj=str(tmp_path)) for text in bulletins])
+        bulletin = await encoder.encode(bulletins[0])
+        fullpath = await encoder.write(bulletin, str(tmp_path), compress=True)
+        return results, fullpath
+
+    results, fullpath = asyncio.run(main())
+    encoder.close()
+    executor.shutdown()
+
+    assert counting.most == 3
+    written = [path for bulletin, path in results if path is not None]
+    assert len(written) == len([bulletin for bulletin, path in results if len(bulletin)]) > 0
+    for path in written:
+        with open(path, 'rb') as fh:
+            assert path.startswith(str(tmp_path)) and fh.read(5) == b'<?xml'
+    with gzip.open(fullpath) as fh:
+        assert fh.read(5) == b'<?xml'
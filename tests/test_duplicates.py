@@ -0,0 +1,73 @@
+import pytest
+
+import gifts.METAR as ME
+from gifts.common import duplicates
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27'}
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint():
+
+    tac = 'METAR BIAR 290000Z 33008KT 9999 FEW030 02/M03 Q1018='
+    assert duplicates.fingerprint(tac) == duplicates.fingerprint(tac.replace(' 290000Z ', '\n  290000Z  '))
+    assert duplicates.fingerprint(tac) != duplicates.fingerprint(tac, 'CCA')
+    assert duplicates.fingerprint(tac) != duplicates.fingerprint(tac.replace('290000Z', '290030Z'))
+    assert len(duplicates.fingerprint('VA ADVISORY\nDTG: 20080923/0130Z')) == 16
+
+
+def test_duplicateWindow():
+
+    clock = Clock()
+    window = duplicates.DuplicateWindow(60., maxsize=2, clock=clock)
+    assert not window.seen('a')
+    assert window.seen('a')
+    clock.now = 30.
+    assert not window.seen('b')
+    clock.now = 60.
+    assert not window.seen('a')
+    assert window.seen('b')
+    assert not window.seen('c')
+    assert not window.seen('b')
+    assert window.stats() == {'checked': 7, 'suppressed': 2, 'expired': 1, 'evictions': 2, 'size': 2, 'maxsize': 2}
+    window.clear()
+    assert len(window) == 0 and window.stats()['checked'] == 0
+
+
+def test_suppressDuplicates():
+
+    text = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290030Z 33008KT 9999 FEW030 02/M03 Q1018="""
+
+    encoder = ME.Encoder(database)
+    window = encoder.suppress_duplicates(600.)
+    assert len(encoder.encode(text)) == 2
+    assert len(encoder.encode(text.replace('FEW030 ', 'FEW030\n    '))) == 0
+    assert len(encoder.encode(text.replace('151200', '151200 CCA'))) == 2
+    assert window.stats()['suppressed'] == 2
+
+    assert encoder.suppress_duplicates(None) is None
+    assert len(encoder.encode(text)) == 2
+
+
+def test_encodeMany():
+
+    text = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG="""
+
+    encoder = ME.Encoder(database)
+    encoder.suppress_duplicates(600.)
+    assert [len(bulletin) for bulletin in encoder.encode_many([text, text], workers=2, executor='thread')] == [1, 0]
+    #
+    # Worker processes would encode the duplicates
+    with pytest.raises(ValueError):
+        next(encoder.encode_many([text, text], workers=2, executor='process'))
@@ -0,0 +1,75 @@
+import io
+
+import gifts.METAR as ME
+import gifts.TAF as TE
+from gifts.common import feed
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27',
+            'SBAF': 'AFONSOS|||-22.87 -43.38 33'}
+
+encoders = {'METAR': ME.Encoder(database), 'TAF': TE.Encoder(database)}
+
+metar = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290030Z 33008KT 9999 FEW030 02/M03 Q1018="""
+
+taf = """FTXX99 XXXX 151200 AAA
+TAF AMD SBAF 072001Z 0715/0815 CNL="""
+
+temp = """USXX99 XXXX 151200
+TTAA 65001 12345="""
+
+
+def framed(text, number):
+
+    return b'\x01\r\r\n%03d\r\r\n%s\r\r\n\x03' % (number, text.replace('\n', '\r\r\n').encode())
+
+
+def test_frames():
+
+    texts = [metar, temp, taf]
+    #
+    # SOH/ETX, with line padding between the bulletins
+    buffer = b'\r\n'.join(framed(text, n) for n, text in enumerate(texts))
+    assert [buffer[start:stop] for start, stop in feed.frames(buffer)] == [framed(text, n)
+                                                                           for n, text in enumerate(texts)]
+    #
+    # WMO file formats 00 and 01
+    messages = [framed(text, n) for n, text in enumerate(texts)]
+    buffer = b''.join(b'%08d00%s' % (len(message), message) for message in messages)
+    assert [buffer[start:stop] for start, stop in feed.frames(buffer)] == messages
+
+    messages = [text.encode() for text in texts]
+    buffer = b''.join(b'%08d01%s' % (len(message), message) for message in messages)
+    assert [buffer[start:stop] for start, stop in feed.frames(buffer)] == messages
+    #
+    # Missing ETX, unframed text and truncated messages
+    buffer = framed(metar, 1)[:-1] + framed(taf, 2)
+    assert [stop for start, stop in feed.frames(buffer)] == [len(framed(metar, 1)) - 1, len(buffer)]
+    assert list(feed.frames(metar.encode())) == [(0, len(metar))]
+    assert list(feed.frames(b'%08d01%s' % (1000, metar.encode()))) == [(10, len(metar) + 10)]
+    assert list(feed.frames(b'')) == []
+
+
+def test_feedReader(tmp_path):
+
+    reader = feed.FeedReader(encoders)
+    path = tmp_path / 'feed.bin'
+    path.write_bytes(b''.join(b'%08d00%s' % (len(m), m) for m in (framed(metar, 1), framed(temp, 2),
+                                                                  framed(taf, 3))))
+
+    assert list(reader.bulletins(str(path))) == [('SA', metar), ('US', temp), ('FT', taf)]
+    with open(path, 'rb') as fh:
+        assert [t1t2 for t1t2, text in reader.bulletins(fh)] == ['SA', 'US', 'FT']
+        assert not fh.closed
+
+    assert list(reader.bulletins(io.BytesIO(path.read_bytes()))) == [('SA', metar), ('US', temp), ('FT', taf)]
+    assert list(reader.bulletins(io.BytesIO())) == []
+
+    bulletins = list(reader.encode(str(path)))
+    assert [len(bulletin) for bulletin in bulletins] == [2, 1]
+    assert bulletins[0][0].get('translatedBulletinID') == 'SAXX99XXXX151200'
+    assert bulletins[1][0].get('translatedBulletinID') == 'FTXX99XXXX151200AAA'
+
+    path.write_bytes(b'')
+    assert list(reader.encode(str(path))) == []
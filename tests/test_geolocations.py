@@ -0,0 +1,101 @@
+import concurrent.futures
+import pickle
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import gifts.METAR as ME
+from gifts.common import geoLocations
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27',
+            'SBAF': 'AFONSOS|||-22.87 -43.38 33'}
+
+text = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 02/M03 Q1018=
+METAR KXXX 290000Z 33008KT 9999 FEW030 02/M03 Q1018="""
+
+
+def lookups(geoLocationsDB):
+
+    return [geoLocationsDB.lookup(ident) for ident in ('BIAR', 'SBAF', 'KXXX')]
+
+
+def documents(geoLocationsDB):
+
+    volatile = re.compile(r'uuid\.[-0-9a-f]{36}|(?<=Time=")[-0-9T:Z]+')
+    return [volatile.sub('', ET.tostring(document, encoding='unicode'))
+            for document in ME.Encoder(geoLocationsDB).encode(text)]
+
+
+def test_backends(tmp_path):
+
+    expected = [geoLocations.Record('AKUREYRI', 'AEY', 'AKI', '65.67 -18.07 27'),
+                geoLocations.Record('AFONSOS', '', '', '-22.87 -43.38 33'),
+                geoLocations.MISSING]
+
+    assert [geoLocations.lookup(database, ident) for ident in ('BIAR', 'SBAF', 'KXXX')] == expected
+
+    inMemory = geoLocations.DictGeoLocations(database)
+    assert lookups(inMemory) == expected
+    assert inMemory.get('BIAR') == database['BIAR'] and inMemory.get('KXXX') is None
+    assert 'SBAF' in inMemory and 'KXXX' not in inMemory
+
+    path = str(tmp_path / 'aerodromes.sqlite')
+    geoLocations.createSQLiteDB(path, database)
+    sqlite = geoLocations.SQLiteGeoLocations(path, maxsize=2)
+    assert lookups(sqlite) == expected
+    assert lookups(sqlite) == expected
+    assert sqlite.stats()['evictions'] == 4
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        assert list(executor.map(lookups, [sqlite] * 4)) == [expected] * 4
+
+    copy = pickle.loads(pickle.dumps(sqlite))
+    assert copy.stats()['hits'] == 0
+    assert lookups(copy) == expected
+
+    pickled = str(tmp_path / 'aerodromes.db')
+    with open(pickled, 'wb') as fh:
+        pickle.dump(database, fh)
+
+    lazy = geoLocations.LazyGeoLocations(geoLocations.loadPickle, pickled)
+    assert lazy._backend is None
+    assert lookups(lazy) == expected
+    assert pickle.loads(pickle.dumps(lazy))._backend is None
+    assert lookups(geoLocations.LazyGeoLocations(dict, database)) == expected
+
+    reference = documents(database)
+    for geoLocationsDB in (inMemory, sqlite, lazy):
+        assert documents(geoLocationsDB) == reference
+
+
+def test_mapped(tmp_path, monkeypatch):
+
+    path = str(tmp_path / 'aerodromes.map')
+    many = dict(database)
+    many.update(('K%03d' % n, 'AERODROME %d|||%d.0 0.0 0' % (n, n % 90)) for n in range(1000))
+    many['KÉÉÉ'] = 'NOT ASCII|||0.0 0.0 0'
+    geoLocations.createMappedDB(path, many)
+
+    mapped = geoLocations.MappedGeoLocations(path)
+    assert len(mapped) == len(many) - 1
+    assert lookups(mapped) == [geoLocations.DictGeoLocations(database).lookup(ident)
+                               for ident in ('BIAR', 'SBAF', 'KXXX')]
+    assert all(mapped.lookup(ident) == geoLocations.toRecord(value) for ident, value in many.items()
+               if ident != 'KÉÉÉ')
+    assert mapped.lookup('KÉÉÉ') == mapped.lookup('AAAA') == mapped.lookup('ZZZZ') == geoLocations.MISSING
+    assert lookups(pickle.loads(pickle.dumps(mapped))) == lookups(mapped)
+    monkeypatch.setattr(geoLocations.sys, 'byteorder', 'big')
+    assert lookups(geoLocations.MappedGeoLocations(path)) == lookups(mapped)
+    monkeypatch.undo()
+    assert documents(mapped) == documents(database)
+    #
+    # Replacing the file does not disturb the mapping in use
+    geoLocations.createMappedDB(path, {})
+    assert mapped.lookup('BIAR').name == 'AKUREYRI'
+    assert len(geoLocations.MappedGeoLocations(path)) == 0
+
+    with open(path, 'wb') as fh:
+        fh.write(b'not a database')
+    with pytest.raises(ValueError):
+        len(geoLocations.MappedGeoLocations(path))
@@ -0,0 +1,143 @@
+import os
+import re
+import signal
+import threading
+import time
+import uuid
+
+import pytest
+
+import gifts.METAR as ME
+from gifts.common import gmlIDs
+from gifts.common import xmlConfig as des
+from gifts.common import xmlUtilities as deu
+
+canonical = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$')
+
+
+def check(ids):
+
+    assert len(set(ids)) == len(ids)
+    for value in ids:
+        assert canonical.match(value) is not None
+        assert str(uuid.UUID(value)) == value
+
+
+@pytest.mark.parametrize('strategy', sorted(gmlIDs.STRATEGIES))
+def test_strategies(strategy):
+
+    generator = gmlIDs.STRATEGIES[strategy]()
+    check([generator() for n in range(3000)])
+
+
+def test_pool():
+
+    generator = gmlIDs.PooledIDs(batch=7)
+    ids = [generator() for n in range(50)]
+    check(ids)
+    #
+    # Threads share the pool, not its UUIDs
+    results = []
+
+    def draw():
+        results.extend(generator() for n in range(500))
+
+    threads = [threading.Thread(target=draw) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    check(ids + results)
+
+
+def test_counter():
+
+    generator = gmlIDs.CounterIDs()
+    first, second = generator(), generator()
+    assert first[:24] == second[:24] and int(second[24:], 16) == int(first[24:], 16) + 1
+    #
+    # Forked processes start afresh
+    gmlIDs._afterFork()
+    assert generator()[:24] != first[:24]
+
+
+def test_wrap():
+
+    generator = gmlIDs.CounterIDs()
+    prefix = generator()[:24]
+    generator._count = iter([0xffffffffffff, 0x1000000000000])
+    assert generator() == prefix + 'ffffffffffff'
+    last = generator()
+    assert last[:24] != prefix and last[24:] == '000000000000'
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork() not available')
+def test_fork():
+
+    gmlIDs.use('pool')
+    parent = gmlIDs.newID()
+    reader, writer = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(writer, gmlIDs.newID().encode())
+        os._exit(0)
+
+    os.waitpid(pid, 0)
+    child = os.read(reader, 64).decode()
+    os.close(reader)
+    os.close(writer)
+    check([parent, child, gmlIDs.newID()])
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork() not available')
+def test_forkLocked():
+    #
+    # A thread holds the locks of the generators while the process forks
+    pool, counter = gmlIDs.PooledIDs(batch=4), gmlIDs.CounterIDs()
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with pool._lock, counter._lock:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    reader, writer = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        counter._count = iter([0x1000000000000])
+        os.write(writer, ' '.join([pool(), counter()]).encode())
+        os._exit(0)
+
+    release.set()
+    thread.join()
+    for n in range(100):
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            break
+        time.sleep(0.05)
+    else:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        raise AssertionError('forked process blocked on a lock')
+
+    child = os.read(reader, 128).decode().split()
+    os.close(reader)
+    os.close(writer)
+    check(child + [pool(), counter()])
+
+
+def test_config(monkeypatch):
+
+    monkeypatch.setattr(des, 'GML_ID_STRATEGY', 'counter')
+    first, second = deu.getUUID(), deu.getUUID()
+    assert first.startswith('uuid.') and first[:29] == second[:29]
+
+    gmlIDs.use(lambda: '00000000-0000-4000-8000-000000000000')
+    try:
+        document = ME.Encoder({}).encode('SAXX99 XXXX 151200\nMETAR BIAR 290000Z 33008KT 9999 FEW030 02/M03 Q1018=')
+        assert document[0].get('gml:id') == 'uuid.00000000-0000-4000-8000-000000000000'
+    finally:
+        gmlIDs.use('pool')
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+import gifts
+
+SNIPPET = """
+import sys
+import gifts
+assert 'skyfield' not in sys.modules
+assert not [name for name in sys.modules if name.endswith('Decoder')]
+%s
+print(sorted(name for name in sys.modules if name.partition('.')[0] in ('gifts', 'skyfield')))
+"""
+
+
+def run(statements):
+
+    result = subprocess.run([sys.executable, '-c', SNIPPET % statements], check=True, capture_output=True, text=True)
+    return result.stdout
+
+
+def test_lazy():
+
+    assert 'skyfield' not in run('')
+
+    loaded = run('gifts.METAR.Encoder')
+    assert "'gifts.metarDecoder'" in loaded
+    assert "'gifts.tafDecoder'" not in loaded
+    assert 'skyfield' not in loaded
+
+    loaded = run('from gifts import SWA; SWA.Encoder()')
+    assert "'gifts.swaDecoder'" in loaded
+    assert 'skyfield' not in loaded
+
+
+def test_attributes():
+
+    for product in gifts.PRODUCTS:
+        assert product in dir(gifts)
+        assert getattr(gifts, product).Encoder.__module__ == 'gifts.%s' % product
+
+    import gifts.TAF as TF
+    from gifts import TAF
+    assert TF is TAF is gifts.TAF
+    assert gifts.bulletin.Bulletin is not None
+
+    with pytest.raises(AttributeError):
+        gifts.SIGMET
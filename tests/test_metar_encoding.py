@@ -1,3 +1,5 @@
+import io
+import re
 import time
 import xml.etree.ElementTree as ET
 
@@ -130,6 +132,35 @@ METAR BIAR 290000Z AUTO 33003KT 280V010 3000 VCSH BKN080 04/M00 Q1023="""
     assert result.get('automatedStation') == 'true'
 
 
+def test_iterEncode():
+
+    class Trickle(io.StringIO):
+        def read(self, size=-1):
+            return super(Trickle, self).read(7)
+
+    text = """SAXX99 XXXX 151200 CCA
+METAR BIAR 290000Z 33003KT 280V010 3000 VCSH BKN080 OVC120 04/M00 Q1023=
+METAR USRR 290000Z 33003KT 3000 VCSH BKN080 04/M00 Q1023 GARBLED=
+METAR
+ USTR 290000Z AUTO 33003KT 280V010 3000 VCSH BKN080 04/M00 Q1023="""
+
+    receiptTime = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+    volatile = re.compile(r'uuid\.[-0-9a-f]{36}|(?<=translationTime=")[-0-9T:Z]+')
+    expected = [volatile.sub('', ET.tostring(document, encoding='unicode'))
+                for document in encoder.encode(text, receiptTime)]
+    assert len(expected) == 3
+
+    for source in (text, io.StringIO(text), Trickle(text)):
+        documents = encoder.iter_encode(source, receiptTime)
+        assert [volatile.sub('', ET.tostring(document, encoding='unicode')) for document in documents] == expected
+
+    documents = list(encoder.iter_encode(Trickle(text), receiptTime, serialize=True))
+    assert len(documents) == 3
+    assert documents[0].startswith(b"<?xml version='1.0' encoding='UTF-8'?>")
+    assert ET.fromstring(documents[2]).get('translatedBulletinID') == 'SAXX99XXXX151200CCA'
+    assert list(encoder.iter_encode(text.split('\n', 1)[1])) == []
+
+
 def test_cor():
 
     test = """SAXX99 KXXX 151200
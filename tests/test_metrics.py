@@ -0,0 +1,42 @@
+import gifts.METAR as ME
+from gifts.common import metrics
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27'}
+
+text = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290030Z 33008KT 9999 FEW030 02/M03 Q1018="""
+
+
+def test_metrics(tmp_path):
+
+    encoder = ME.Encoder(database)
+    assert metrics.stopwatch() is None
+    assert metrics.snapshot() == {} and metrics.prometheus() == ''
+
+    registry = metrics.enable(buckets=(0.5, 0.001))
+    try:
+        assert metrics.enable() is registry
+        encoder.encode(text).write(str(tmp_path))
+        encoder.encode(text).write(str(tmp_path), compress=True)
+        snapshot = metrics.snapshot()
+        prometheus = metrics.prometheus()
+    finally:
+        assert metrics.disable() is registry
+
+    counts = {stage: histogram['count'] for stage, histogram in snapshot['METAR'].items()}
+    assert counts == {'ahl': 2, 'split': 2, 'decode': 4, 'geolocation': 4, 'encode': 4, 'export': 2, 'write': 2}
+    assert list(snapshot['METAR']['decode']['buckets']) == [0.001, 0.5, float('inf')]
+    assert snapshot['METAR']['decode']['buckets'][float('inf')] == 4
+    assert 0. < snapshot['METAR']['decode']['sum'] < 4.
+
+    assert prometheus.startswith('# HELP gifts_stage_seconds ')
+    assert 'gifts_stage_seconds_bucket{product="METAR",stage="write",le="+Inf"} 2\n' in prometheus
+    assert 'gifts_stage_seconds_count{product="METAR",stage="encode"} 4\n' in prometheus
+    #
+    # Nothing is measured once disabled
+    encoder.encode(text)
+    assert metrics.snapshot() == {}
+    assert registry.snapshot() == snapshot
+    registry.reset()
+    assert registry.snapshot() == {}
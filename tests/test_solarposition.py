@@ -0,0 +1,111 @@
+import subprocess
+import sys
+import time
+
+import numpy
+import pytest
+
+import gifts.SWA as SWAE
+from gifts.common import solarPosition
+from gifts.common import xmlConfig as des
+
+SNIPPET = """
+import sys
+import gifts.SWA as SWAE
+SWAE.swaDecoder.des.SOLAR_ENGINE = '%s'
+decoder = SWAE.Encoder().decoder
+result = decoder('''%s''')
+assert 'err_msg' not in result, result['err_msg']
+print('skyfield' in sys.modules, SWAE.swaDecoder.solarPosition.stats()['loaded'])
+"""
+
+ADVISORY = """FNXX01 KWNP 080100
+SWX ADVISORY
+DTG: 20200308/0100Z
+SWXC: DONLON
+ADVISORY NR: 2020/1
+SWX EFFECT: HF COM MOD
+%s
+FCST SWX +6 HR: 08/0700Z NO SWX EXP
+FCST SWX +12 HR: 08/1300Z NO SWX EXP
+FCST SWX +18 HR: 08/1900Z NO SWX EXP
+FCST SWX +24 HR: 09/0100Z NO SWX EXP
+RMK: NIL
+NXT ADVISORY: NO FURTHER ADVISORIES="""
+
+
+@pytest.mark.parametrize('minute, expected', [((2020, 3, 8, 1, 0), (-4.77, 167.70)),
+                                              ((2020, 6, 21, 12, 0), (23.44, 0.48)),
+                                              ((2024, 12, 21, 18, 30), (-23.44, -97.89))])
+def test_subpoint(minute, expected):
+
+    latitude, longitude = solarPosition.subpoint(*minute)
+    assert (round(latitude, 2), round(longitude, 2)) == expected
+    #
+    # Kept by minute
+    hits = solarPosition.stats()['hits']
+    assert solarPosition.subpoint(*minute) == (latitude, longitude)
+    assert solarPosition.stats()['hits'] == hits + 1
+    assert solarPosition.stats()['loaded']
+
+
+def test_lazy():
+
+    def run(observed, engine='skyfield'):
+        result = subprocess.run([sys.executable, '-c', SNIPPET % (engine, ADVISORY % observed)], check=True,
+                                capture_output=True, text=True)
+        return result.stdout.split()
+
+    assert run('OBS SWX: 08/0100Z HNH HSH E180-W180') == ['False', 'False']
+    assert run('OBS SWX: 08/0100Z DAYLIGHT SIDE') == ['True', 'True']
+    assert run('OBS SWX: 08/0100Z DAYLIGHT SIDE', 'analytic') == ['False', 'False']
+
+
+def test_analytic():
+    #
+    # Within half the resolution of the advisories
+    times = numpy.array([(year, 1 + n % 12, 1 + n % 28, n % 24, (7 * n) % 60)
+                         for year in range(1990, 2026) for n in range(0, 480, 7)]).T
+    expected = numpy.array(solarPosition._skyfield(*times))
+    found = numpy.array(solarPosition.analytic(*times))
+    assert found.shape == expected.shape == (2, times.shape[1])
+    assert abs(found[0] - expected[0]).max() < 0.005
+    assert abs((found[1] - expected[1] + 180.) % 360. - 180.).max() < 0.005
+
+
+def test_subpoints():
+
+    times = [(2020, 3, 8, hour, 0) for hour in (1, 7, 13, 19, 1)]
+    for engine in solarPosition.ENGINES:
+        found = solarPosition.subpoints(times, engine)
+        assert len(found) == 5 and found[0] == found[4]
+        assert found[1:4] == [solarPosition.subpoint(*time, engine=engine) for time in times[1:4]]
+
+    analytic = solarPosition.subpoints(times, 'analytic')
+    for (latitude, longitude), expected in zip(analytic, solarPosition.subpoints(times, 'skyfield')):
+        assert abs(latitude - expected[0]) < 0.005 and abs(longitude - expected[1]) < 0.005
+
+
+def test_daylight():
+
+    decoder = SWAE.Encoder().decoder
+    advisory = ADVISORY.replace('08/0700Z NO SWX EXP', '08/0700Z DAYLIGHT SIDE') % 'OBS SWX: 08/0100Z DAYLIGHT SIDE'
+    decoded = {}
+    for engine in solarPosition.ENGINES:
+        des.SOLAR_ENGINE = engine
+        try:
+            result = decoder(advisory)
+        finally:
+            des.SOLAR_ENGINE = 'skyfield'
+
+        assert 'err_msg' not in result
+        decoded[engine] = [result['fcsts'][key]['daylight'] for key in ('0', '6')]
+        assert 'daylight' not in result['fcsts']['12']
+
+        phenomenonTime = result['fcsts']['6']['phenomenonTime']
+        latitude, longitude = solarPosition.subpoint(*time.strptime(phenomenonTime, '%Y-%m-%dT%H:%M:%SZ')[:5],
+                                                     engine=engine)
+        assert decoded[engine][1] == '%s %s' % (round(latitude, 2), round(longitude, 2))
+    for skyfield, analytic in zip(decoded['skyfield'], decoded['analytic']):
+        for expected, found in zip(skyfield.split(), analytic.split()):
+            assert abs(float(expected) - float(found)) <= 0.0100001
@@ -0,0 +1,264 @@
+import os
+
+import pytest
+
+from gifts.common import tpg
+
+grammar = r"""
+    set lexer = ContextSensitiveLexer
+
+    separator spaces: '\s+' ;
+    token number: '\d+' ;
+
+    START/n -> number/n ;
+    """
+
+
+def makeParser(text):
+
+    return tpg.ParserMetaClass('Toy', (tpg.Parser,), {'__doc__': text})
+
+
+def test_grammarCache(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(tpg.sys, 'dont_write_bytecode', False)
+
+    assert makeParser(grammar)()('42') == '42'
+    cached = os.listdir(tmp_path)
+    assert len(cached) == 1
+    #
+    # Second class creation must not translate the grammar again
+
+    def fail(*args):
+        raise AssertionError('grammar translated')
+
+    monkeypatch.setattr(tpg.TPGParser, '__call__', fail)
+    assert makeParser(grammar)()(' 7 ') == '7'
+    #
+    # A changed grammar is translated again
+    monkeypatch.undo()
+    monkeypatch.setenv('TPG_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(tpg.sys, 'dont_write_bytecode', False)
+    assert makeParser(grammar.replace(r'\d+', r'\d{2}'))()('42') == '42'
+    assert os.listdir(tmp_path) == cached
+    #
+    # ... and so is a grammar translated by another code generator
+    key = tpg.grammar_key(grammar)
+    monkeypatch.setattr(tpg, '_generator_digest', '0' * 64)
+    assert tpg.grammar_key(grammar) != key
+    monkeypatch.setattr(tpg.TPGParser, '__call__', fail)
+    with pytest.raises(AssertionError):
+        makeParser(grammar)
+
+
+def test_grammarCacheDisabled(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', '')
+    assert tpg.GrammarCache().path('Toy', globals()) is None
+    assert makeParser(grammar)()('42') == '42'
+
+    monkeypatch.setenv('TPG_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(tpg.sys, 'dont_write_bytecode', True)
+    makeParser(grammar)
+    assert os.listdir(tmp_path) == []
+
+
+toyModule = '''
+from gifts.common import tpg
+
+
+class Toy(tpg.Parser):
+    r"""%s"""
+
+    def double(self, n):
+        return 2 * int(n)
+'''
+
+
+def test_compileModule(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', '')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    source = tmp_path / 'toyParser.py'
+    source.write_text(toyModule % grammar.replace('number/n ;', r"number/n $ n = self.double(n) $ ;"))
+
+    path = tpg.compile_module('toyParser')
+    assert path == str(tmp_path / 'toyParser_tpg.py')
+    #
+    # Parsers use the rules of the generated module
+    monkeypatch.delitem(tpg.sys.modules, 'toyParser')
+    import toyParser
+    assert toyParser.Toy.START.__code__.co_filename == path
+    assert toyParser.Toy.START.__globals__ is vars(toyParser)
+    assert toyParser.Toy()('21') == 42
+    #
+    # ...but not when the grammar has changed since
+    source.write_text(toyModule % grammar.replace(r'\d+', r'\d{2}'))
+    monkeypatch.delitem(tpg.sys.modules, 'toyParser')
+    monkeypatch.delitem(tpg.sys.modules, 'toyParser_tpg')
+    import toyParser
+    assert toyParser.Toy.START.__code__.co_filename == '<string>'
+    assert toyParser.Toy()('21') == '21'
+
+
+memoGrammar = r"""
+    set lexer = ContextSensitiveLexer
+    %s
+
+    separator spaces: '\s+' ;
+    token number: '\d+' ;
+    token word: '[a-z]+' ;
+
+    START/l -> $ l = [] $ (Item/i $ l.append(i) $)* ;
+    Item/i -> Pair/i | Single/i ;
+    Pair/p -> Word/w number/n ';' $ p = (w, n) $ ;
+    Single/w -> Word/w ;
+    Word/w -> word/w ;
+    """
+
+
+def test_memoize(monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', '')
+    text = 'a 1; b c'
+    expected = [('a', '1'), 'b', 'c']
+
+    parser = makeParser(memoGrammar % '')()
+    assert parser(text) == expected
+    plain = parser.stats()
+    assert plain['regex_saved'] == 0
+
+    parser = makeParser(memoGrammar % 'set lexer_memoize = True')()
+    assert parser(text) == expected
+    lexer = parser.stats()
+    assert lexer['regex_saved'] > 0
+    assert lexer['regex_calls'] + lexer['regex_saved'] == plain['regex_calls']
+    #
+    # Counters are per parse
+    assert parser(text) == expected
+    assert parser.stats() == lexer
+    #
+    # Rules are not memoized: their actions may make them fail or succeed at the same position
+    with pytest.raises(tpg.Error):
+        makeParser(memoGrammar % 'set memoize = True')
+
+
+predictGrammar = r"""
+    set lexer = ContextSensitiveLexer
+    %s
+
+    separator spaces: '\s+' ;
+    token number: '(?P<digits>\d+)' ;
+    token word: '[a-z]+' ;
+    token twice: '([A-Z])\1' ;
+
+    START/l -> $ l = [] $ (Item/i $ l.append(i) $)+ ;
+    Item/i -> Pair/i | Single/i | twice/i | '[A-Z]'/i;
+    Pair/p -> Word/w number/n ';' $ p = (w, n) $ ;
+    Single/w -> Word/w | number/w ;
+    Word/w -> word/w ;
+    """
+
+
+class Expecting(tpg.Parser):
+
+    def __call__(self, text):
+
+        self.expected = []
+        try:
+            return super(Expecting, self).__call__(text)
+        except tpg.SyntacticError:
+            return self.expected
+
+    def eatCSL(self, name):
+        try:
+            value = super(Expecting, self).eatCSL(name)
+            self.expected = []
+            return value
+        except tpg.WrongToken:
+            self.expected.append(name)
+            raise
+
+    def missCSL(self, names):
+        self.expected.extend(names)
+
+
+def test_predict(monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', '')
+    plain = tpg.ParserMetaClass('Toy', (Expecting,), {'__doc__': predictGrammar % ''})()
+    predict = tpg.ParserMetaClass('Toy', (Expecting,), {'__doc__': predictGrammar % 'set predict = True'})()
+    #
+    # Back references can not be combined with other tokens: twice is always tried
+    assert len(predict.lexer.predictors) == 3
+    assert not any('\\1' in predictor.pattern for predictor in predict.lexer.predictors)
+
+    for text in ['a 1; b 2 c', '12 x AA B', 'a 1; ;', '; a', 'a 1 ;b +']:
+        assert predict(text) == plain(text)
+
+    assert predict('a 1; b 2 c AA') == [('a', '1'), 'b', '2', 'c', 'AA']
+    assert predict('; a') == ['word', 'word', 'number', 'twice', '_tok_1']
+
+
+groupGrammar = r"""
+    set lexer = %s
+    set predict = True
+
+    separator spaces: '\s+' ;
+    token becmg: 'BECMG\s+\d{4}/\d{4}' ;
+    token vsby: '(\d\s+)?\d/\dSM|\d+SM' ;
+    token wind: '\d{5}KT' ;
+    token number: '\d+' ;
+    token word: '[A-Z]+' ;
+
+    START/l -> $ l = [] $ (Group/g $ l.append(g) $)* ;
+    Group/g -> becmg/g | vsby/g | wind/g | number/g | word/g ;
+    """
+
+
+def test_preTokenizedLexer(monkeypatch):
+
+    monkeypatch.setenv('TPG_CACHE_DIR', '')
+    csl = makeParser(groupGrammar % 'ContextSensitiveLexer')()
+    ptl = makeParser(groupGrammar % 'PreTokenizedLexer')()
+    assert isinstance(ptl.lexer, tpg.PreTokenizedLexer)
+    #
+    # The classifier is built once, with the lexer, and shared by the contexts
+    classifier = ptl.lexer.classifier
+    assert classifier is not None
+    assert ptl.context().lexer.classifier is classifier
+    #
+    # Tokens spanning several groups, ending inside a group, or classified otherwise
+    text = 'TAF  BECMG 1012/1014 1 1/2SM\n 3SM 24010KT 2401KT AB12 1234 12'
+    expected = ['TAF', 'BECMG 1012/1014', '1 1/2SM', '3SM', '24010KT', '2401', 'KT', 'AB', '12', '1234', '12']
+    assert csl(text) == expected
+    assert ptl(text) == expected
+    for lexer in (csl.lexer, ptl.lexer):
+        token = lexer.token()
+        assert (token.line, token.column, token.end_line, token.end_column) == (2, 31, 2, 33)
+
+    for text in ['', '  ', ' 12 ', 'BECMG 1012', '1 /2SM', '12 ?']:
+        try:
+            result = csl(text)
+        except tpg.SyntacticError as e:
+            result = e.line, e.column
+        try:
+            assert ptl(text) == result
+        except tpg.SyntacticError as e:
+            assert (e.line, e.column) == result
+
+
+def test_lines():
+
+    lines = tpg.Lines('AB\nCD\n\nE')
+    assert lines.newlines is None
+    assert [lines.line_column(pos) for pos in range(8)] == [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3),
+                                                            (3, 1), (4, 1)]
+    assert lines.newlines == [2, 5, 6]
+    assert tpg.Lines('ABC').line_column(3) == (1, 4)
+
+    token = tpg.Token('word', 'CD', 'CD', 3, 5, 2, lines)
+    assert (token.line, token.column, token.end_line, token.end_column) == (2, 1, 2, 3)
+    assert not hasattr(token, '__dict__')
+    assert (tpg.SOFToken().line, tpg.EOFToken(7, 7, lines).line) == (1, 4)
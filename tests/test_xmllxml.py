@@ -0,0 +1,133 @@
+import io
+import pickle
+import re
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import gifts.METAR as ME
+import gifts.TAF as TF
+
+etree = pytest.importorskip('lxml.etree')
+from gifts.common import xmlLxml  # noqa: E402
+from gifts.common import xmlStream  # noqa: E402
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27'}
+
+metar = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290030Z 33008KT 9999 -SHRA FEW030 02/M03 Q1018 RMK "A&B" <1>="""
+
+taf = """FTXX99 XXXX 151200
+TAF BIAR 290500Z 2906/3006 33008KT 9999 FEW030 TEMPO 2912/2916 4000 SHRA BKN020="""
+
+gmlID = '{http://www.opengis.net/gml/3.2}id'
+volatile = re.compile(r'#?uuid\.[-0-9a-f]+|\d{4}-\d\d-\d\dT[0-9:]+Z|\d{14}(?=\.xml)')
+
+
+def canonical(element):
+    #
+    # Names with their namespaces, identifiers and times masked
+    attributes = sorted((key, volatile.sub('', value)) for key, value in element.attrib.items())
+    return (element.tag, attributes, volatile.sub('', (element.text or '').strip()),
+            [canonical(child) for child in element])
+
+
+def encode(encoder, text, backend):
+
+    encoder.encoder.xmlBackend = backend
+    try:
+        return encoder.encode(text)
+    finally:
+        encoder.encoder.xmlBackend = None
+
+
+def test_names():
+
+    root = xmlLxml.Element('MeteorologicalBulletin')
+    root.set('xmlns', 'http://def.wmo.int/collect/2014')
+    root.set('xmlns:gml', 'http://www.opengis.net/gml/3.2')
+    root.set('gml:id', 'uuid.1')
+    child = xmlLxml.SubElement(root, 'meteorologicalInformation')
+    assert child.tag == '{http://def.wmo.int/collect/2014}meteorologicalInformation'
+    assert root.get('gml:id') == root.get(gmlID) == 'uuid.1'
+    #
+    # Outside the scope of a default namespace until added to a parent in one
+    volcano = xmlLxml.Element('EruptingVolcano')
+    volcano.set('xmlns', 'http://def.wmo.int/metce/2013')
+    position = xmlLxml.SubElement(volcano, 'position')
+    point = xmlLxml.SubElement(position, 'gml:Point')
+    date = xmlLxml.Element('eruptionDate')
+    assert date.tag == 'eruptionDate'
+    volcano.append(date)
+    volcano.tag = 'Volcano'
+    metce = '{http://def.wmo.int/metce/2013}'
+    assert [volcano.tag, position.tag, date.tag] == [metce + 'Volcano', metce + 'position', metce + 'eruptionDate']
+    assert point.tag == '{http://www.opengis.net/gml/3.2}Point'
+    child.append(volcano)
+    assert root.find('meteorologicalInformation') is None
+    assert root.find('collect:meteorologicalInformation').find('metce:Volcano') is volcano
+
+    xml = xmlLxml.tostring(root, encoding='UTF-8', xml_declaration=True)
+    assert xml.startswith(b"<?xml version='1.0' encoding='UTF-8'?>\n<collect:MeteorologicalBulletin")
+    assert b'urn:x-gifts' not in xml and b'xmlns:aixm' not in xml
+    assert xmlStream.backend(root) is xmlLxml
+
+
+def test_registerNamespace():
+    #
+    # Elements are created while a namespace is registered again, which drops the element declaring them
+    switchInterval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    errors = []
+    done = threading.Event()
+
+    def create():
+        try:
+            while not done.is_set():
+                xmlLxml.Element('iwxxm:METAR').set('gml:id', 'uuid.1')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=create) for n in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        stop = time.perf_counter() + 0.5
+        while time.perf_counter() < stop:
+            xmlLxml.register_namespace('gml', 'http://www.opengis.net/gml/3.2')
+    finally:
+        done.set()
+        for thread in threads:
+            thread.join()
+        sys.setswitchinterval(switchInterval)
+
+    assert errors == []
+
+
+def test_documents(tmp_path):
+
+    for encoder, text in ((ME.Encoder(database), metar), (TF.Encoder(database), taf)):
+
+        tree = encode(encoder, text, 'tree')
+        lxml = encode(encoder, text, 'lxml')
+        assert len(tree) == len(lxml) == len(text.splitlines()) - 1
+        #
+        # Same documents, in their namespaces
+        for document, other in zip(tree, lxml):
+            assert isinstance(other, xmlLxml.NamespacedElement)
+            assert canonical(ET.fromstring(ET.tostring(document))) == canonical(ET.fromstring(
+                xmlLxml.tostring(other)))
+        #
+        # Handed back by worker processes
+        copy = pickle.loads(pickle.dumps(lxml[0]))
+        assert canonical(ET.fromstring(xmlLxml.tostring(copy))) == canonical(ET.fromstring(
+            xmlLxml.tostring(lxml[0])))
+
+        stream = io.BytesIO()
+        stream.mode = 'wb'
+        lxml.write(stream)
+        assert canonical(ET.fromstring(stream.getvalue())) == canonical(ET.fromstring(ET.tostring(tree.export())))
@@ -0,0 +1,107 @@
+import re
+import xml.etree.ElementTree as ET
+
+import gifts.METAR as ME
+import gifts.TAF as TF
+from gifts.common import xmlConfig as des
+from gifts.common import xmlStream
+
+database = {'BIAR': 'AKUREYRI|AEY|AKI|65.67 -18.07 27'}
+
+metar = """SAXX99 XXXX 151200
+METAR BIAR 290000Z 33008KT 9999 FEW030 SCT045 BKN060 02/M03 Q1018 NOSIG=
+METAR BIAR 290030Z 33008KT 9999 -SHRA FEW030 02/M03 Q1018 RMK "A&B" <1>="""
+
+taf = """FTXX99 XXXX 151200
+TAF BIAR 290500Z 2906/3006 33008KT 9999 FEW030 TEMPO 2912/2916 4000 SHRA BKN020="""
+#
+# Identifiers and times that differ between two encodings
+volatile = re.compile(r'(?<=gml:id=")[^"]+|(?<=xlink:href="#)[^"]+|(?<=Time=")[-0-9T:Z]+|\d{14}(?=\.xml)')
+
+
+def mask(xml):
+
+    return volatile.sub('', xml.decode())
+
+
+def encode(encoder, text, backend):
+
+    encoder.encoder.xmlBackend = backend
+    try:
+        return encoder.encode(text)
+    finally:
+        encoder.encoder.xmlBackend = None
+
+
+def test_element():
+
+    root = xmlStream.Element('a', {'x': '1'}, y='"2"\n')
+    b = xmlStream.SubElement(root, 'b')
+    b.text = 'T&C <ok>'
+    b.tail = '\n'
+    c = xmlStream.SubElement(root, 'c')
+    root.remove(c)
+    root.insert(0, c)
+    root.append(xmlStream.Element('b'))
+
+    assert len(root) == 3 and root[0] is c and root.find('b') is b
+    assert root.findall('b')[1].tag == 'b' and root.get('y') == '"2"\n'
+    assert [element.tag for element in root.iter()] == ['a', 'c', 'b', 'b']
+
+    tree = ET.Element('a', {'x': '1'}, y='"2"\n')
+    ET.SubElement(tree, 'c')
+    other = ET.SubElement(tree, 'b')
+    other.text = 'T&C <ok>'
+    other.tail = '\n'
+    ET.SubElement(tree, 'b')
+
+    for encoding in ('unicode', 'UTF-8', 'us-ascii', 'ISO-8859-1'):
+        assert xmlStream.tostring(root, encoding) == ET.tostring(tree, encoding)
+
+    assert xmlStream.tostring(root, 'UTF-8', xml_declaration=True) == ET.tostring(tree, 'UTF-8', xml_declaration=True)
+    assert xmlStream.tostring(root, short_empty_elements=False) == ET.tostring(tree, short_empty_elements=False)
+    assert xmlStream.backend(root) is xmlStream and xmlStream.backend(tree) is ET
+
+
+def test_backends(tmp_path):
+
+    for encoder, text in ((ME.Encoder(database), metar), (TF.Encoder(database), taf)):
+
+        tree = encode(encoder, text, 'tree')
+        stream = encode(encoder, text, 'stream')
+        assert isinstance(tree[0], ET.Element) and isinstance(stream[0], xmlStream.Element)
+        #
+        # Same documents, same bulletins
+        encoder.encoder.xmlBackend = 'stream'
+        documents = list(encoder.iter_encode(text, serialize=True))
+        encoder.encoder.xmlBackend = None
+        assert len(documents) == len(tree)
+        for document, other in zip(documents, tree):
+            assert mask(document) == mask(ET.tostring(other, encoding='UTF-8', xml_declaration=True))
+
+        assert mask(ET.tostring(tree.export())) == mask(xmlStream.tostring(stream.export()))
+
+        (tmp_path / 'tree').mkdir(exist_ok=True)
+        (tmp_path / 'stream').mkdir(exist_ok=True)
+        paths = [tree.write(str(tmp_path / 'tree')), stream.write(str(tmp_path / 'stream'))]
+        with open(paths[0], 'rb') as fh1, open(paths[1], 'rb') as fh2:
+            assert mask(fh1.read()) == mask(fh2.read())
+
+
+def test_default(monkeypatch):
+
+    encoder = ME.Encoder(database)
+    monkeypatch.setattr(des, 'XML_BACKEND', 'stream')
+    assert isinstance(encoder.encode(metar).pop(), xmlStream.Element)
+    #
+    # The encoder's choice comes first
+    assert isinstance(encode(encoder, metar, 'tree').pop(), ET.Element)
+
+
+def test_workers():
+    #
+    # Worker processes of encode_many() build their documents with the encoder's backend
+    encoder = ME.Encoder(database)
+    encoder.encoder.xmlBackend = 'stream'
+    bulletins = list(encoder.encode_many([metar, metar], workers=2, executor='process'))
+    assert [isinstance(bulletin.pop(), xmlStream.Element) for bulletin in bulletins] == [True, True]